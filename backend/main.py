@@ -11,32 +11,109 @@ Simple Flow:
 5. Wait for next request
 """
 
+import time
+
+# Captured before the heavy engine imports so cold start includes them
+_PROCESS_START = time.perf_counter()
+
 import os
 import sys
 import json
+import asyncio
+import argparse
 import tempfile
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime
 from pathlib import Path
+from typing import Iterable, Optional
 
 # Add modules to path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'modules'))
 sys.path.append(os.path.join(os.path.dirname(__file__), 'modules', 'brain'))
 
-from modules.tts_engine import TTSEngine
-from modules.stt_engine import STTEngine
-from modules.app_scanner import ApplicationScanner
-from modules.automation_engine import AutomationEngine
-from modules.brain.chat_brain import ChatBrain
-from modules.brain.data_engine import DataEngine
-from modules.memory_manager import MemoryManager
-from modules.voice_recognition import VoiceRecognition
+from modules.startup_profiler import StartupProfiler
+
+# Import time is charged to the engine that pulls each dependency in first
+STARTUP_PROFILER = StartupProfiler(start=_PROCESS_START)
+
+with STARTUP_PROFILER.importing("TTS"):
+    from modules.tts_engine import TTSEngine
+with STARTUP_PROFILER.importing("STT"):
+    from modules.stt_engine import STTEngine
+with STARTUP_PROFILER.importing("App Scanner"):
+    from modules.app_scanner import ApplicationScanner
+with STARTUP_PROFILER.importing("Automation Engine"):
+    from modules.automation_engine import AutomationEngine
+with STARTUP_PROFILER.importing("Chat Brain"):
+    from modules.brain.chat_brain import ChatBrain
+with STARTUP_PROFILER.importing("Data Engine"):
+    from modules.brain.data_engine import DataEngine
+with STARTUP_PROFILER.importing("Memory Manager"):
+    from modules.memory_manager import MemoryManager
+with STARTUP_PROFILER.importing("Voice Recognition"):
+    from modules.voice_recognition import USERS_FILE, VoiceRecognition, audio_data_to_array
+
+from modules.intent_router import EXIT_ROUTER, REQUEST_ROUTER, WAKE_ROUTER
+from modules.intent_classifier import IntentClassifier
+from modules.context_builder import ContextBuilder
+
+# Voice enrollment: several short samples average into a steadier voiceprint
+ENROLLMENT_SAMPLES = 3
+ENROLLMENT_SECONDS = 4
+
+# Engines needing another engine at construction time; everything else starts in parallel
+ENGINE_DEPENDENCIES = {'data': ('memory',)}
+
+# Without these A.R.I.S.E. cannot hold a conversation; any other engine may fail and degrade
+REQUIRED_ENGINES = ('stt', 'memory')
+
+# Engine each request type needs
+REQUEST_ENGINES = {
+    'voice_enroll': 'voice_recognition',
+    'data': 'data',
+    'automation': 'automation',
+    'chat': 'chat',
+}
+
+# Past messages read back for "what did I say about ..." and words spoken per message
+RECALL_RESULTS = 3
+RECALL_WORDS = 25
+
+# Estimated tokens of memory context sent with each chat request
+CONTEXT_TOKEN_BUDGET = 600
+
+# Request types each enrolled role may run (None = everything)
+ROLE_PERMISSIONS = {
+    'master': None,
+    'member': {'chat', 'data', 'automation', 'standby'},
+    'guest': {'chat', 'data'},
+}
 
 
 class ARISEMain:
     """Main A.R.I.S.E. orchestrator with centralized TTS."""
     
-    def __init__(self):
-        """Initialize all engines."""
+    def __init__(self, lazy_models: bool = False, profile_path: Optional[str] = None,
+                 parallel_init: bool = True, intent_model: bool = False):
+        """
+        Initialize all engines.
+        
+        Args:
+            lazy_models: Load SpeechBrain/torch/librosa in the background while the
+                greeting plays and STT calibrates; verification waits only if needed
+            profile_path: Write the startup profile as JSON to this file
+            parallel_init: Build independent engines concurrently
+            intent_model: Route with the local intent classifier, falling back to
+                keywords when it is not confident
+        """
         print("🚀 Initializing A.R.I.S.E...")
+        self.lazy_models = lazy_models
+        self.profiler = STARTUP_PROFILER
+        self.profile_path = profile_path
+        self.parallel_init = parallel_init
+        self.intent_model = intent_model
+        self.engine_errors = {}  # Engine attribute -> why it is unavailable
         
         # Engine instances
         self.tts = None
@@ -47,57 +124,104 @@ class ARISEMain:
         self.data = None
         self.memory = None
         self.voice_recognition = None
+        self.intent_classifier = None
+        self.context_builder = None
         
         # System state
         self.running = False
         self.app_database_ready = False
         self.standby_mode = False
+        self.speech_sink = None  # Set by the async orchestrator to queue speech instead of blocking
+        
+        self.speaker_role = 'master'  # Role of the last verified speaker (open access until someone enrolls)
+        
+        # Speaker verification runs here while recognize_google is in flight
+        self._verify_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="arise-verify")
         
         # Initialize all engines
         self._init_engines()
         
+        # Chat context stays within a token budget however long the session or fact list grows
+        self.context_builder = ContextBuilder(self.memory, token_budget=CONTEXT_TOKEN_BUDGET)
+        self.profiler.finish()
+        self._save_startup_profile()
+        
         print("✅ A.R.I.S.E. initialization complete!")
     
+    def _engine_specs(self) -> dict:
+        """Engine constructors keyed by attribute name: (label, factory)."""
+        specs = {
+            # TTS first in sequential mode (most important for consistent voice output)
+            'tts': ("TTS", TTSEngine),
+            'voice_recognition': ("Voice Recognition", lambda: VoiceRecognition(background_load=self.lazy_models)),
+            'stt': ("STT", STTEngine),
+            'memory': ("Memory Manager", MemoryManager),
+            'chat': ("Chat Brain", ChatBrain),
+            'data': ("Data Engine", lambda: DataEngine(self.memory)),
+            'automation': ("Automation Engine", AutomationEngine),
+            'scanner': ("App Scanner", lambda: ApplicationScanner("data/applications.json")),
+        }
+        if self.intent_model:
+            specs['intent_classifier'] = ("Intent Classifier", IntentClassifier.from_file)
+        return specs
+    
+    def _build_engine(self, label: str, factory):
+        """Construct one engine under the startup profiler."""
+        with self.profiler.stage(label):
+            return factory()
+    
     def _init_engines(self):
-        """Initialize all engines independently."""
-        try:
-            # Initialize TTS first (most important for consistent voice output)
-            print("Initializing TTS engine...")
-            self.tts = TTSEngine()
-            
-            # Initialize STT
-            print("Initializing STT engine...")
-            self.stt = STTEngine()
-            
-            # Initialize Memory Manager (needed by other engines)
-            print("Initializing Memory Manager...")
-            self.memory = MemoryManager()
-            
-            # Initialize Chat Brain
-            print("Initializing Chat Brain...")
-            self.chat = ChatBrain()
-            
-            # Initialize Data Engine with memory manager
-            print("Initializing Data Engine...")
-            self.data = DataEngine(self.memory)
-            
-            # Initialize Automation Engine
-            print("Initializing Automation Engine...")
-            self.automation = AutomationEngine()
-            
-            # Initialize App Scanner
-            print("Initializing App Scanner...")
-            self.scanner = ApplicationScanner("data/applications.json")
-            
-            # Initialize Voice Recognition
-            print("Initializing Voice Recognition...")
-            self.voice_recognition = VoiceRecognition()
-            
-            print("✅ All engines initialized successfully!")
-            
-        except Exception as e:
-            print(f"❌ Engine initialization error: {e}")
+        """
+        Initialize engines on a thread pool, honoring ENGINE_DEPENDENCIES.
+        
+        Microphone calibration, model loading and file loading overlap, so startup
+        takes about as long as the slowest engine. A failed engine is left as None
+        and only the features that need it are disabled.
+        """
+        specs = self._engine_specs()
+        pending = dict(specs)
+        running = {}
+        workers = len(specs) if self.parallel_init else 1
+        
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="arise-init") as pool:
+            while pending or running:
+                # Start every engine whose dependencies have finished
+                for attr in list(pending):
+                    dependencies = ENGINE_DEPENDENCIES.get(attr, ())
+                    if any(dep in pending or dep in running.values() for dep in dependencies):
+                        continue
+                    
+                    label, factory = pending.pop(attr)
+                    failed = [dep for dep in dependencies if dep in self.engine_errors]
+                    if failed:
+                        self.engine_errors[attr] = f"requires {', '.join(failed)}"
+                        print(f"❌ {label} skipped: {self.engine_errors[attr]}")
+                        continue
+                    
+                    print(f"Initializing {label}...")
+                    running[pool.submit(self._build_engine, label, factory)] = attr
+                
+                if not running:
+                    continue
+                
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    attr = running.pop(future)
+                    try:
+                        setattr(self, attr, future.result())
+                    except Exception as e:
+                        self.engine_errors[attr] = str(e) or type(e).__name__
+                        print(f"❌ {specs[attr][0]} initialization error: {e}")
+        
+        missing = [specs[attr][0] for attr in REQUIRED_ENGINES if attr in self.engine_errors]
+        if missing:
+            print(f"❌ Engine initialization error: {', '.join(missing)} unavailable")
             sys.exit(1)
+        
+        if self.engine_errors:
+            print(f"⚠️ Running without: {', '.join(specs[attr][0] for attr in self.engine_errors)}")
+        else:
+            print("✅ All engines initialized successfully!")
     
     def _check_app_database(self):
         """Step 1: Check if application database exists."""
@@ -140,6 +264,10 @@ class ARISEMain:
         """Check if master user is enrolled, prompt for enrollment if needed."""
         print("🔐 Checking voice enrollment...")
         
+        if self.voice_recognition is None:
+            print("⚠️ Voice recognition unavailable - skipping enrollment check")
+            return
+        
         if not self.voice_recognition.is_master_enrolled():
             print("❌ No master user enrolled.")
             self._speak("Voice recognition is not set up. Would you like to enroll your voice for security? This will help me recognize you in the future.")
@@ -147,11 +275,11 @@ class ARISEMain:
             response = self.stt.listen_once(timeout=15)
             
             if response and any(word in response.lower() for word in ['yes', 'yeah', 'sure', 'okay', 'ok']):
-                self._speak("Great! Please say something for about 5 seconds. I'll use this to learn your voice. Say something like 'Hello A.R.I.S.E., this is my voice for enrollment.'")
+                self._speak(f"Great! I'll ask you to speak {ENROLLMENT_SAMPLES} times for a few seconds each. Say something like 'Hello A.R.I.S.E., this is my voice for enrollment.'")
                 
                 # Record enrollment audio
                 print("🎤 Recording enrollment audio...")
-                enrollment_audio = self.stt.record_audio_file(duration=5)
+                enrollment_audio = self._record_enrollment_samples()
                 
                 if enrollment_audio:
                     # Enroll the user
@@ -173,37 +301,120 @@ class ARISEMain:
             master_user = self.voice_recognition.get_master_user()
             print(f"✅ Master user '{master_user['name']}' is enrolled (created: {master_user['created_at']})")
     
-    def _verify_voice(self, audio_file_path: str) -> bool:
-        """Verify if the voice matches the enrolled master user."""
+    def _record_enrollment_samples(self) -> list:
+        """Record several short enrollment clips for a centroid voiceprint. Returns file paths."""
+        samples = []
+        for i in range(ENROLLMENT_SAMPLES):
+            self._speak("Start speaking now..." if i == 0 else "And once more, please...")
+            audio_file = self.stt.record_audio_file(duration=ENROLLMENT_SECONDS)
+            if audio_file:
+                samples.append(audio_file)
+        return samples
+    
+    def _start_voice_check(self, audio) -> Optional[Future]:
+        """
+        Start speaker verification on captured in-memory audio.
+        
+        Runs in parallel with speech recognition on the same AudioData, so the
+        faster of the two is hidden behind the slower one. Returns None when
+        no check is needed (no master enrolled, standby, or no audio).
+        """
+        if (audio is None or self.standby_mode or self.voice_recognition is None
+                or not self.voice_recognition.is_master_enrolled()):
+            return None
+        
+        print("🔐 Performing voice verification...")
+        samples, sample_rate = audio_data_to_array(audio)  # Zero-copy view of the captured PCM
+        return self._verify_pool.submit(self._run_verification, samples, sample_rate)
+    
+    def _run_verification(self, samples, sample_rate: int) -> tuple:
+        """Verification worker: result plus the matched speaker, read on the same thread."""
+        result = self.voice_recognition.verify_voice(samples, sample_rate)
+        return result + (self.voice_recognition.last_speaker,)
+    
+    def _verify_voice(self, verification: Future, speak_denial: bool = True) -> bool:
+        """
+        Wait for a started verification and check the voice matches an enrolled user.
+        
+        Sets speaker_role to the matched user's role. If verification itself
+        errors (e.g. voice models failed to load) the speaker continues as a
+        guest - degraded, but never with master permissions.
+        """
         try:
-            is_recognized, message, confidence = self.voice_recognition.verify_voice(audio_file_path)
+            is_recognized, message, confidence, speaker = verification.result()
             
             if is_recognized:
                 print(f"✅ Voice verified: {message} (confidence: {confidence:.2f})")
+                self.speaker_role = (speaker or {}).get('role', 'guest')
                 return True
             else:
                 print(f"❌ Voice verification failed: {message} (confidence: {confidence:.2f})")
-                # Get and speak security response
-                security_response = self.voice_recognition.get_security_response()
-                self._speak(security_response)
+                if speak_denial:
+                    # Get and speak security response
+                    security_response = self.voice_recognition.get_security_response()
+                    self._speak(security_response)
                 return False
                 
         except Exception as e:
-            print(f"❌ Voice verification error: {e}")
-            return True  # Allow access if verification fails (graceful degradation)
+            print(f"❌ Voice verification error: {e} - continuing as guest")
+            self.speaker_role = 'guest'
+            return True
+    
+    def _has_enrolled_master(self) -> bool:
+        """True if a master voice is enrolled, even when the voice engine is unavailable."""
+        if self.voice_recognition is not None:
+            return self.voice_recognition.is_master_enrolled()
+        try:
+            with open(USERS_FILE, 'r') as f:
+                return any(user.get('is_master', False) for user in json.load(f).values())
+        except (OSError, ValueError, AttributeError):
+            return False
+    
+    def _passes_voice_check(self, user_input: str, verification: Optional[Future]) -> bool:
+        """Gate a recognized request on its verification result and set speaker_role. Returns False to deny."""
+        # Least privilege until verification says otherwise
+        self.speaker_role = 'guest'
+        if verification is None:
+            # Open access only while nobody is enrolled; an unverifiable speaker after that is a guest
+            if not self._has_enrolled_master():
+                self.speaker_role = 'master'
+            return True
+        
+        # Enrollment requests are never blocked by the voice they are about to replace,
+        # but only a verified master keeps the role that may re-enroll
+        if any(keyword in user_input.lower() for keyword in ['voice_enroll', 'enroll my voice']):
+            self._verify_voice(verification, speak_denial=False)
+            return True
+        
+        if not self._verify_voice(verification):
+            # Voice verification failed - deny access and continue listening
+            print("❌ Access denied - voice verification failed")
+            return False
+        
+        print("✅ Voice verification passed")
+        return True
     
     def _speak(self, text: str):
         """Centralized TTS function - ALL responses go through here."""
         if not text or not text.strip():
             return
         
+        # Async mode: hand off to the speech task and keep processing
+        if self.speech_sink is not None:
+            self.speech_sink(text)
+            return
+        
+        self._speak_blocking(text)
+    
+    def _speak_blocking(self, text: str):
+        """Speak text and wait for the audio to finish."""
         # IMPORTANT: Speak FIRST, then display text
         tts_success = False
         
         try:
-            # Always create fresh TTS instance for maximum reliability
-            tts_instance = TTSEngine()
-            tts_success = tts_instance.speak(text)
+            # Reuse the persistent TTS worker so only synthesis time is paid per reply
+            if self.tts is not None:
+                tts_success = self.tts.speak(text)
             
             if not tts_success:
                 print("⚠️ Primary TTS failed - trying backup method...")
@@ -230,95 +441,124 @@ class ARISEMain:
         else:
             print(f"🤖 A.R.I.S.E (no audio): {text}")
     
+    def _speak_stream(self, sentences: Iterable[str]) -> str:
+        """
+        Streaming TTS path - queue each sentence as soon as it arrives.
+        
+        Sentence 1 plays while later sentences are still being generated.
+        Each sentence is printed once its audio has finished, in order.
+        
+        Returns:
+            The full spoken text
+        """
+        spoken = []
+        pending = deque()
+        
+        for sentence in sentences:
+            if not sentence or not sentence.strip():
+                continue
+            spoken.append(sentence)
+            
+            if self.speech_sink is not None:
+                self.speech_sink(sentence)
+                continue
+            
+            utterance = self.tts.say(sentence) if self.tts is not None else None
+            if utterance is None:
+                self._speak(sentence)  # No worker available - use blocking path with backup
+                continue
+            pending.append(utterance)
+            
+            # Report sentences that already finished without blocking the stream
+            while pending and pending[0].done.is_set():
+                self._report_utterance(pending.popleft())
+        
+        while pending:
+            utterance = pending.popleft()
+            utterance.wait()
+            self._report_utterance(utterance)
+        
+        return " ".join(spoken)
+    
+    def _report_utterance(self, utterance):
+        """Print a streamed sentence after its audio completes."""
+        if utterance.success:
+            print(f"🤖 A.R.I.S.E: {utterance.text}")
+        else:
+            print(f"🤖 A.R.I.S.E (no audio): {utterance.text}")
+    
     def _greet_user(self):
         """Step 2: Greet user and wait for response."""
         greeting = "Hello! I'm A.R.I.S.E., your AI assistant. I can help with conversations, real-time data, and opening applications. What can I do for you?"
         self._speak(greeting)
+        self._report_cold_start()
+    
+    def _report_cold_start(self):
+        """Record and print process start to first spoken word."""
+        cold_start = self.profiler.mark('first_spoken_word', getattr(self.tts, 'first_audio_at', None))
+        
+        if self.voice_recognition is None:
+            models = "unavailable"
+        elif self.voice_recognition.model_load_seconds is None:
+            models = "ready" if self.voice_recognition.is_ready() else "still loading"
+        else:
+            self.profiler.mark('voice_models_ready', self.voice_recognition.models_ready_at)
+            models = f"loaded in {self.voice_recognition.model_load_seconds:.2f}s"
+        print(f"⏱️ Cold start to first spoken word: {cold_start:.2f}s (voice models {models})")
+        self._save_startup_profile()
+    
+    def _save_startup_profile(self):
+        """Write the startup profile JSON if requested."""
+        if not self.profile_path:
+            return
+        try:
+            self.profiler.save(self.profile_path)
+        except Exception as e:
+            print(f"❌ Could not save startup profile: {e}")
     
     def _classify_request(self, user_input: str) -> str:
-        """Step 3: Classify user request to determine which engine to use."""
-        user_lower = user_input.lower()
-        
-        # Data engine keywords
-        data_keywords = [
-            'weather', 'temperature', 'temp', 'hot', 'cold', 'rain', 'sunny', 'climate',
-            'news', 'headlines', 'latest', 'happening', 'current events',
-            'stock', 'share', 'price', 'trading', 'market', 'nasdaq', 'dow', 'nifty'
-        ]
-        
-        # Automation engine keywords  
-        automation_keywords = [
-            'open', 'launch', 'start', 'run', 'execute', 'close',
-            'visit', 'go to', 'browse', 'navigate',
-            'play', 'watch', 'listen to', 'put on', 'show me'
-        ]
-        
-        # Memory deletion keywords
-        memory_deletion_keywords = [
-            'delete memory', 'remove memory', 'clear memory', 'forget everything',
-            'erase memory', 'wipe memory', 'reset memory', 'delete sessions',
-            'clear sessions', 'forget all', 'delete all memory', 'delete my memory',
-            'clear the memory', 'remove all memory', 'wipe all memory',
-            'delete all sessions', 'remove all sessions', 'clear all sessions'
-        ]
-        
-        # Standby mode keywords
-        standby_keywords = [
-            'go to standby', 'standby mode', 'go to sleep', 'sleep mode',
-            'stand by', 'enter standby', 'go standby', 'sleep now'
-        ]
-        
-        # Voice enrollment keywords
-        voice_enrollment_keywords = [
-            'enroll my voice', 'setup voice', 'voice enrollment', 'enroll voice',
-            'setup voice recognition', 'voice setup', 'register my voice',
-            'add my voice', 'learn my voice', 'voice training'
-        ]
-        
-        # Check for voice enrollment requests
-        if any(keyword in user_lower for keyword in voice_enrollment_keywords):
-            return 'voice_enroll'
-        
-        # Check for standby requests
-        if any(keyword in user_lower for keyword in standby_keywords):
-            return 'standby'
-        
-        # Check for memory deletion requests
-        if any(keyword in user_lower for keyword in memory_deletion_keywords):
-            return 'memory_delete'
-        
-        # Check for data requests
-        if any(keyword in user_lower for keyword in data_keywords):
-            return 'data'
-            
-        # Check for automation requests
-        if any(keyword in user_lower for keyword in automation_keywords):
-            return 'automation'
-            
-        # Default to chat for everything else
-        return 'chat'
+        """
+        Step 3: Classify user request to determine which engine to use.
+        
+        Priority: voice_enroll > standby > memory_delete > memory_recall > data > automation > chat.
+        Keywords match whole words via the precompiled router in one pass.
+        With the intent model enabled, IntentClassifier.route decides between its
+        prediction and the keywords, so phrasings without keywords ("will it be
+        chilly in berlin tonight") still reach the right engine and stray ones
+        ("what's the price of happiness") don't hijack a chat.
+        """
+        keyword_intent = REQUEST_ROUTER.classify(user_input)
+        if self.intent_classifier is None:
+            return keyword_intent
+        
+        intent, confidence = self.intent_classifier.route(user_input, keyword_intent)
+        if intent != keyword_intent:
+            print(f"🧭 Intent model: {intent} ({confidence:.2f}) over keywords: {keyword_intent}")
+        return intent
+    
+    def _recall_messages(self, user_input: str) -> str:
+        """Answer "what did I say about X last week" from the full-text session index."""
+        # Drop the trigger phrase so only the topic and period are searched
+        found = REQUEST_ROUTER.match(user_input)
+        question = user_input
+        if found is not None and found.intent == 'memory_recall':
+            question = user_input[:found.span[0]] + user_input[found.span[1]:]
+        
+        hits = self.memory.recall(question, limit=RECALL_RESULTS)
+        if not hits:
+            return "I couldn't find anything you said about that."
+        
+        lines = []
+        for hit in hits:
+            words = hit['content'].split()
+            quote = " ".join(words[:RECALL_WORDS]) + ("..." if len(words) > RECALL_WORDS else "")
+            day = datetime.fromtimestamp(hit['timestamp']).strftime('%B %d').replace(' 0', ' ')
+            lines.append(f"On {day} you said: {quote}")
+        return " ".join(lines)
     
-    def _build_memory_context(self) -> str:
-        """Build context string from recent session and facts for AI."""
-        context_parts = []
-        
-        # Add facts from long-term memory
-        facts = self.memory.load_facts()
-        if facts:
-            facts_text = ", ".join([f"{k}: {v}" for k, v in facts.items()])
-            context_parts.append(f"User facts: {facts_text}")
-        
-        # Add recent conversation from session buffer (last 5 messages)
-        if self.memory.session_buffer:
-            recent_messages = self.memory.session_buffer[-10:]  # Last 10 messages for context
-            conversation = []
-            for msg in recent_messages:
-                role = "User" if msg["role"] == "user" else "AI"
-                conversation.append(f"{role}: {msg['content']}")
-            if conversation:
-                context_parts.append(f"Recent conversation: {' | '.join(conversation)}")
-        
-        return " | ".join(context_parts) if context_parts else ""
+    def _build_memory_context(self, user_input: str = "") -> str:
+        """Build context string from relevant facts, summarized and recent session turns, and related earlier messages for AI."""
+        return self.context_builder.build(user_input)
     
     def _extract_and_update_facts(self, user_input: str, ai_response: str):
         """Extract important facts from conversation and update long-term memory."""
@@ -363,20 +603,59 @@ class ARISEMain:
         if facts_to_update:
             self.memory.update_facts(facts_to_update)
     
-    def _process_request(self, user_input: str):
-        """Process user request through appropriate engine."""
-        request_type = self._classify_request(user_input)
+    def _request_allowed(self, request_type: str, role: Optional[str] = None) -> bool:
+        """Check role permissions and engine availability; speaks the refusal if not."""
+        # Enrolled members and guests only get the request types their role allows
+        allowed = ROLE_PERMISSIONS.get(role or self.speaker_role)
+        if allowed is not None and request_type not in allowed:
+            response = "Sorry, you don't have permission to do that."
+            print(f"🔒 {role or self.speaker_role} not allowed: {request_type}")
+            self._speak(response)
+            self.memory.add_message("assistant", response)
+            return False
+        
+        # Engines that failed at startup only disable their own features
+        engine = REQUEST_ENGINES.get(request_type)
+        if engine is not None and getattr(self, engine) is None:
+            response = "Sorry, that feature isn't available right now."
+            print(f"⚠️ {engine} unavailable: {self.engine_errors.get(engine, 'not initialized')}")
+            self._speak(response)
+            self.memory.add_message("assistant", response)
+            return False
+        
+        return True
+    
+    async def _process_data_request_async(self, user_input: str, role: Optional[str] = None):
+        """Async data path: the fetch is awaited so the event loop keeps running."""
+        print("📍 Request type: data")
+        if not self._request_allowed('data', role):
+            return
+        
+        try:
+            response = await self.data.process_data_request_async(user_input)
+        except Exception as e:
+            print(f"❌ Request processing error: {e}")
+            response = "Sorry, I encountered an error processing your request."
+        self._speak(response)
+        self.memory.add_message("assistant", response)
+    
+    def _process_request(self, user_input: str, role: Optional[str] = None,
+                         request_type: Optional[str] = None):
+        """Process user request through appropriate engine (classifies it unless request_type is given)."""
+        request_type = request_type or self._classify_request(user_input)
         
         print(f"📍 Request type: {request_type}")
         
+        if not self._request_allowed(request_type, role):
+            return
+        
         try:
             if request_type == 'voice_enroll':
                 # Voice enrollment request
-                self._speak("I'll help you enroll your voice. Please say something for about 5 seconds when I tell you to start.")
-                self._speak("Ready? Start speaking now...")
+                self._speak(f"I'll help you enroll your voice. I'll ask you to speak {ENROLLMENT_SAMPLES} times for a few seconds each.")
                 
                 # Record enrollment audio
-                enrollment_audio = self.stt.record_audio_file(duration=5)
+                enrollment_audio = self._record_enrollment_samples()
                 
                 if enrollment_audio:
                     # Enroll or re-enroll the user
@@ -414,6 +693,12 @@ class ARISEMain:
                 self._speak(response)
                 # Note: We don't add this to memory since we just cleared it
                 
+            elif request_type == 'memory_recall':
+                # Search saved conversations for what the user said
+                response = self._recall_messages(user_input)
+                self._speak(response)
+                self.memory.add_message("assistant", response)
+                
             elif request_type == 'data':
                 # Data engine request
                 response = self.data.process_data_request(user_input)
@@ -432,9 +717,9 @@ class ARISEMain:
                 
             else:  # chat
                 # Chat brain request with memory context
-                memory_context = self._build_memory_context()
-                response = self.chat.get_response(user_input, memory_context)
-                self._speak(response)  # All responses go through TTS
+                memory_context = self._build_memory_context(user_input)
+                # Stream sentences into TTS while Gemini is still generating
+                response = self._speak_stream(self.chat.stream_response(user_input, memory_context))
                 self.memory.add_message("assistant", response)
                 
                 # Extract and store important facts from conversation
@@ -447,9 +732,8 @@ class ARISEMain:
             self.memory.add_message("assistant", error_msg)
     
     def _should_exit(self, user_input: str) -> bool:
-        """Check if user wants to exit."""
-        exit_phrases = ['bye', 'goodbye', 'exit', 'quit', 'stop', 'end', 'see you later']
-        return any(phrase in user_input.lower() for phrase in exit_phrases)
+        """Check if user wants to exit (whole words, so "weekend" is not "end")."""
+        return EXIT_ROUTER.matches(user_input)
     
     def _enter_standby_mode(self):
         """Enter standby mode, listen only for wake command."""
@@ -461,20 +745,8 @@ class ARISEMain:
                 user_input = self.stt.listen_once(timeout=60)  # Longer timeout in standby
                 
                 if user_input:
-                    user_lower = user_input.lower()
-                    
-                    # Check for wake commands - more flexible detection
-                    wake_commands = [
-                        'hey arise', 'hey a.r.i.s.e', 'hey a r i s e',
-                        'arise wake up', 'wake up arise', 'arise',
-                        'hey arize', 'hey a rise', 'wake arise',
-                        'a.r.i.s.e', 'arrise', 'a rise'
-                    ]
-                    
-                    # Also check if "arise" appears anywhere in the input
-                    contains_arise = any(word in user_lower for word in ['arise', 'arize', 'a.r.i.s.e', 'arrise'])
-                    
-                    if any(wake_cmd in user_lower for wake_cmd in wake_commands) or contains_arise:
+                    # Wake phrases and any spelling of "arise" as a whole word
+                    if WAKE_ROUTER.matches(user_input):
                         self.standby_mode = False
                         response = "I'm awake! How can I help you?"
                         self._speak(response)
@@ -512,9 +784,17 @@ class ARISEMain:
                 print("\n🎤 Listening for your request...")
                 
                 # Wait for user input
-                user_input = self.stt.listen_once(timeout=30)
+                audio = self.stt.capture(timeout=30)
+                if audio is None:
+                    continue
+                
+                # Verification and recognition both only need the captured audio
+                verification = self._start_voice_check(audio)
+                user_input = self.stt.recognize(audio)
                 
                 if not user_input:
+                    if verification is not None:
+                        verification.cancel()
                     continue
                     
                 print(f"👤 You: {user_input}")
@@ -523,33 +803,8 @@ class ARISEMain:
                 self.memory.add_message("user", user_input)
                 
                 # Voice verification checkpoint (if master is enrolled and not in standby)
-                if (self.voice_recognition.is_master_enrolled() and 
-                    not self.standby_mode and 
-                    not any(keyword in user_input.lower() for keyword in ['voice_enroll', 'enroll my voice'])):
-                    
-                    print("🔐 Performing voice verification...")
-                    # Use the audio from the speech we just captured instead of recording new audio
-                    verification_audio = self.stt.save_last_audio_to_file()
-                    
-                    if verification_audio:
-                        if not self._verify_voice(verification_audio):
-                            # Voice verification failed - deny access and continue listening
-                            print("❌ Access denied - voice verification failed")
-                            # Clean up temporary file
-                            try:
-                                os.remove(verification_audio)
-                            except:
-                                pass
-                            continue  # Skip processing this request
-                        else:
-                            print("✅ Voice verification passed")
-                            # Clean up temporary file
-                            try:
-                                os.remove(verification_audio)
-                            except:
-                                pass
-                    else:
-                        print("⚠️ Could not verify voice - proceeding with caution")
+                if not self._passes_voice_check(user_input, verification):
+                    continue  # Skip processing this request
                 
                 # Check for exit
                 if self._should_exit(user_input):
@@ -579,14 +834,63 @@ class ARISEMain:
             self.memory.add_message("assistant", error_msg)
             # Save session even on error
             self.memory.save_session()
+    
+    def run_async(self):
+        """Async A.R.I.S.E. execution flow - capture overlaps processing and speech."""
+        from modules.orchestrator import AsyncOrchestrator
+        
+        try:
+            # Steps 1-2 are interactive and stay sequential
+            self._check_app_database()
+            self._check_voice_enrollment()
+            self._greet_user()
+            
+            # Steps 3 & 4: pipelined conversation loop
+            asyncio.run(AsyncOrchestrator(self).run())
+            
+        except KeyboardInterrupt:
+            self.speech_sink = None
+            response = "Goodbye!"
+            self._speak(response)
+            self.memory.add_message("assistant", response)
+            # Save session before shutdown
+            self.memory.save_session()
+            print("\n👋 A.R.I.S.E. shutting down...")
+        except Exception as e:
+            self.speech_sink = None
+            error_msg = "I'm experiencing technical difficulties. Shutting down."
+            print(f"❌ Main loop error: {e}")
+            self._speak(error_msg)
+            self.memory.add_message("assistant", error_msg)
+            # Save session even on error
+            self.memory.save_session()
 
 
 def main():
     """Entry point for A.R.I.S.E. AI Assistant."""
+    parser = argparse.ArgumentParser(description="A.R.I.S.E. AI Assistant")
+    parser.add_argument('--async', dest='async_mode', action='store_true',
+                        help="Use the asyncio orchestrator (listen while processing and speaking)")
+    parser.add_argument('--lazy-models', action='store_true',
+                        help="Load voice models in the background instead of before the greeting")
+    parser.add_argument('--profile-startup', metavar='JSON',
+                        help="Print per-engine startup timings and save them to this JSON file")
+    parser.add_argument('--sequential-init', action='store_true',
+                        help="Build engines one at a time (for comparing startup profiles)")
+    parser.add_argument('--intent-model', action='store_true',
+                        help="Route requests with the local intent classifier (keyword fallback)")
+    args = parser.parse_args()
+    
     try:
         # Initialize and run A.R.I.S.E.
-        arise = ARISEMain()
-        arise.run()
+        arise = ARISEMain(lazy_models=args.lazy_models, profile_path=args.profile_startup,
+                          parallel_init=not args.sequential_init, intent_model=args.intent_model)
+        if args.profile_startup:
+            arise.profiler.print_summary()
+        if args.async_mode:
+            arise.run_async()
+        else:
+            arise.run()
         
     except KeyboardInterrupt:
         print("\n👋 A.R.I.S.E. interrupted by user")
@@ -599,6 +903,16 @@ def main():
         if 'arise' in locals() and hasattr(arise, 'memory'):
             arise.memory.save_session()
     finally:
+        # Let the TTS worker finish any queued speech before exiting
+        if 'arise' in locals() and getattr(arise, 'tts', None):
+            arise.tts.shutdown()
+        if 'arise' in locals() and getattr(arise, 'data', None):
+            arise.data.close()
+        if 'arise' in locals() and getattr(arise, 'voice_recognition', None):
+            arise.voice_recognition.close()
+        # Write any fact updates still waiting on the debounce timer
+        if 'arise' in locals() and getattr(arise, 'memory', None):
+            arise.memory.close()
         print("🔌 A.R.I.S.E. offline")
 
 
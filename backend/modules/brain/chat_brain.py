@@ -3,28 +3,63 @@ A.R.I.S.E. AI - Chat Brain Module
 
 Pure text-based chat using Gemini 2.5 Flash. Returns text responses only.
 No TTS, STT, or other engine dependencies.
+Replies can also be streamed sentence by sentence so speech can start early.
 """
 
 import os
+import re
+from typing import Iterator, List, Tuple
 import google.generativeai as genai
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+# Sentence end: terminal punctuation, optional closing quotes/brackets, then whitespace
+SENTENCE_END = re.compile(r'[.!?]+["\')\]]*\s+')
+# Tokens ending in a period that do not end a sentence (titles, initialisms like A.R.I.S.E.)
+NON_TERMINAL_TOKEN = re.compile(r'(?:\b(?:Mr|Mrs|Ms|Dr|St|Sr|Jr|vs|etc|e\.g|i\.e)|\b(?:[A-Za-z]\.)+[A-Za-z])\.$')
+
+
+def split_sentences(buffer: str) -> Tuple[List[str], str]:
+    """
+    Split complete sentences off the front of a streaming text buffer.
+    
+    Args:
+        buffer: Text received so far
+        
+    Returns:
+        Tuple of (complete sentences, unfinished remainder)
+        
+    Time: O(n), Space: O(n) where n is buffer length
+    """
+    sentences = []
+    start = 0
+    for match in SENTENCE_END.finditer(buffer):
+        candidate = buffer[start:match.end()].strip()
+        if NON_TERMINAL_TOKEN.search(candidate):
+            continue
+        if candidate:
+            sentences.append(candidate)
+        start = match.end()
+    return sentences, buffer[start:]
+
 
 class ChatBrain:
     """Pure text-based AI chat using Gemini 2.5 Flash."""
     
-    def __init__(self):
-        """Initialize chat brain with Gemini API only."""
+    def __init__(self, model=None):
+        """Initialize chat brain with Gemini API only (or an injected model for testing)."""
         self.api_key = os.getenv('GEMINI_API_KEY')
-        if not self.api_key:
-            raise ValueError("GEMINI_API_KEY not found in environment variables")
-        
-        # Configure Gemini
-        genai.configure(api_key=self.api_key)
-        self.model = genai.GenerativeModel('gemini-2.0-flash-exp')
+        if model is not None:
+            self.model = model
+        else:
+            if not self.api_key:
+                raise ValueError("GEMINI_API_KEY not found in environment variables")
+            
+            # Configure Gemini
+            genai.configure(api_key=self.api_key)
+            self.model = genai.GenerativeModel('gemini-2.0-flash-exp')
         
         # System prompt for short, human-like responses
         self.system_prompt = """You are A.R.I.S.E. AI, created by Subham — a smart, reliable, and witty assistant that feels like a natural human friend.
@@ -60,18 +95,51 @@ Always balance usefulness with personality.
         Time: O(1), Space: O(1)
         """
         try:
-            # Build prompt with memory context if available
-            if memory_context:
-                prompt = f"{self.system_prompt}\n\nContext from previous conversations and facts:\n{memory_context}\n\nUser: {user_input}\nARISE AI:"
-            else:
-                prompt = f"{self.system_prompt}\n\nUser: {user_input}\nARISE AI:"
-                
+            prompt = self._build_prompt(user_input, memory_context)
             response = self.model.generate_content(prompt)
             return response.text.strip()
         except Exception as e:
             print(f"AI error: {e}")
             return "Sorry, I'm having trouble processing that right now."
     
+    def stream_response(self, user_input: str, memory_context: str = "") -> Iterator[str]:
+        """
+        Stream the AI response sentence by sentence as Gemini generates it.
+        
+        Args:
+            user_input: User's message
+            memory_context: Previous conversation and facts context
+            
+        Yields:
+            Complete sentences of the response, in order
+            
+        Time: O(n) where n is response length, Space: O(s) for the longest sentence
+        """
+        yielded = False
+        buffer = ""
+        try:
+            prompt = self._build_prompt(user_input, memory_context)
+            for chunk in self.model.generate_content(prompt, stream=True):
+                buffer += chunk.text
+                sentences, buffer = split_sentences(buffer)
+                for sentence in sentences:
+                    yielded = True
+                    yield sentence
+            
+            if buffer.strip():
+                yielded = True
+                yield buffer.strip()
+        except Exception as e:
+            print(f"AI error: {e}")
+            if not yielded:
+                yield "Sorry, I'm having trouble processing that right now."
+    
+    def _build_prompt(self, user_input: str, memory_context: str = "") -> str:
+        """Build prompt with memory context if available."""
+        if memory_context:
+            return f"{self.system_prompt}\n\nContext from previous conversations and facts:\n{memory_context}\n\nUser: {user_input}\nARISE AI:"
+        return f"{self.system_prompt}\n\nUser: {user_input}\nARISE AI:"
+    
     def should_stop(self, text: str) -> bool:
         """Check if user wants to stop the conversation."""
         stop_words = ['stop', 'end', 'bye', 'goodbye', 'quit', 'exit']
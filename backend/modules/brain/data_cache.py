@@ -0,0 +1,213 @@
+"""
+A.R.I.S.E. AI - Data Response Cache
+
+TTL + LRU cache for DataEngine answers, keyed by normalized (source, key).
+- Fresh entries (younger than the source's TTL) are returned directly.
+- Stale entries (within the source's max_stale past its TTL) are returned
+  immediately while a single background refresh fetches a new answer
+  (stale-while-revalidate).
+- Anything older, or missing, is fetched inline; concurrent requests for the
+  same key share one fetch.
+Failed fetches raise and are never cached, so an outage is not remembered.
+prefetch() lets a scheduler warm entries before anyone asks for them.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Dict, Optional, Tuple
+
+# Seconds an answer stays fresh, per source
+DEFAULT_TTLS = {
+    'weather': 600,  # Conditions change slowly
+    'news': 900,     # Top headlines rotate a few times an hour
+    'stock': 60,     # Prices move during market hours
+}
+# Seconds past the TTL a stale answer may still be spoken, per source. Sources
+# not listed get one TTL, so fast-moving data never goes far out of date.
+DEFAULT_MAX_STALE = {
+    'weather': 3600,
+    'news': 3600,
+    'stock': 60,     # A quote is at most two minutes old, never "current" an hour later
+}
+DEFAULT_MAX_ENTRIES = 256
+
+
+class DataCache:
+    """
+    Thread-safe TTL/LRU response cache with stale-while-revalidate.
+    Time: O(1) lookup, insert and eviction (OrderedDict)
+    Space: O(max_entries)
+    """
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 max_stale: Optional[Dict[str, float]] = None, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            ttls: Per-source freshness in seconds, merged over DEFAULT_TTLS
+            max_entries: LRU bound across all sources
+            max_stale: Per-source seconds past the TTL an entry may still be served
+                stale, merged over DEFAULT_MAX_STALE (unlisted sources: one TTL)
+            clock: Time source (monotonic seconds)
+        """
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.max_entries = max_entries
+        self.max_stale = {**DEFAULT_MAX_STALE, **(max_stale or {})}
+        self.clock = clock
+
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, str]]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, str], Future] = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "prefetches": 0,
+                      "errors": 0, "evictions": 0}
+
+    @staticmethod
+    def normalize_key(*parts) -> str:
+        """Case- and whitespace-insensitive key from request parameters."""
+        return ":".join(" ".join(str(part).lower().split()) for part in parts)
+
+    def get_or_fetch(self, source: str, key: str, fetch: Callable[[], str]) -> str:
+        """
+        Answer from cache when possible, otherwise fetch (and cache) it.
+
+        Args:
+            source: 'weather', 'news', 'stock', ... (selects the TTL)
+            key: Normalized request key, see normalize_key()
+            fetch: Produces the answer; raises on failure
+
+        Returns:
+            Cached or freshly fetched answer
+
+        Raises:
+            Whatever fetch raised, when there is no usable cached answer
+        """
+        cache_key = (source, key)
+        ttl = self.ttls.get(source, 0)
+        max_stale = self.max_stale.get(source, ttl)
+
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None:
+                age = self.clock() - entry[0]
+                if age < ttl:
+                    self._entries.move_to_end(cache_key)
+                    self.stats["hits"] += 1
+                    return entry[1]
+                if age < ttl + max_stale:
+                    self._entries.move_to_end(cache_key)
+                    self.stats["stale_hits"] += 1
+                    if cache_key not in self._inflight:
+                        self._start_refresh(cache_key, fetch)
+                    return entry[1]
+
+            # Miss: join an in-flight fetch for the same key, or become the fetcher
+            self.stats["misses"] += 1
+            future = self._inflight.get(cache_key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[cache_key] = future
+
+        if owner:
+            self._fetch(cache_key, fetch, future)
+        return future.result()
+
+    def _start_refresh(self, cache_key: Tuple[str, str], fetch: Callable[[], str]):
+        """Refresh one stale entry on a daemon thread. Caller holds the lock."""
+        future = Future()
+        self._inflight[cache_key] = future
+        self.stats["refreshes"] += 1
+        threading.Thread(target=self._fetch, args=(cache_key, fetch, future),
+                         name="arise-data-refresh", daemon=True).start()
+
+    def _fetch(self, cache_key: Tuple[str, str], fetch: Callable[[], str], future: Future):
+        """Run a fetch, store a successful answer and release waiters."""
+        try:
+            value = fetch()
+        except Exception as e:
+            with self._lock:
+                self._inflight.pop(cache_key, None)
+                self.stats["errors"] += 1
+            future.set_exception(e)
+            return
+
+        with self._lock:
+            self._entries[cache_key] = (self.clock(), value)
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+            self._inflight.pop(cache_key, None)
+        future.set_result(value)
+
+    def remaining_ttl(self, source: str, key: str) -> Optional[float]:
+        """Seconds until an entry goes stale (negative once stale), or None if absent."""
+        with self._lock:
+            entry = self._entries.get((source, key))
+            if entry is None:
+                return None
+            return self.ttls.get(source, 0) - (self.clock() - entry[0])
+
+    def prefetch(self, source: str, key: str, fetch: Callable[[], str]) -> bool:
+        """
+        Fetch and store an answer ahead of demand, on the calling thread.
+
+        Returns:
+            True if a fresh answer was stored; False if the fetch failed or
+            another fetch for the key was already running
+        """
+        cache_key = (source, key)
+        with self._lock:
+            if cache_key in self._inflight:
+                return False
+            future = Future()
+            self._inflight[cache_key] = future
+            self.stats["prefetches"] += 1
+
+        self._fetch(cache_key, fetch, future)
+        return future.exception() is None
+
+    def invalidate(self, source: Optional[str] = None):
+        """Drop cached answers for one source, or everything."""
+        with self._lock:
+            for cache_key in [k for k in self._entries if source is None or k[0] == source]:
+                del self._entries[cache_key]
+
+    def get_stats(self) -> dict:
+        """Snapshot of hit/miss counters and current size."""
+        with self._lock:
+            return {**self.stats, "entries": len(self._entries)}
+
+
+def demo():
+    """Show fresh hits, a stale hit with background refresh, and LRU eviction."""
+    now = [0.0]
+    calls = []
+
+    def slow_weather(city):
+        def fetch():
+            time.sleep(0.2)  # Stand-in for a weatherapi.com round trip
+            calls.append(city)
+            return f"Weather for {city} #{len(calls)}"
+        return fetch
+
+    cache = DataCache(ttls={'weather': 600}, max_entries=2, clock=lambda: now[0])
+    key = DataCache.normalize_key("London")
+
+    for label, advance in (("miss", 0), ("fresh hit", 60), ("stale hit", 600)):
+        now[0] += advance
+        start = time.perf_counter()
+        answer = cache.get_or_fetch('weather', key, slow_weather("London"))
+        print(f"{label:>10}: {answer!r} in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    time.sleep(0.3)  # Let the background refresh land
+    print(f" refreshed: {cache.get_or_fetch('weather', key, slow_weather('London'))!r}")
+
+    for city in ("Paris", "Tokyo"):
+        cache.get_or_fetch('weather', DataCache.normalize_key(city), slow_weather(city))
+    print(f"     stats: {cache.get_stats()}")
+
+
+if __name__ == "__main__":
+    demo()
@@ -3,27 +3,143 @@ A.R.I.S.E. AI - Real-time Data Engine
 
 Pure data fetching for weather, news, and stock data. Returns text responses only.
 No TTS, STT, or other engine dependencies.
+Answers are cached per source with TTLs and refreshed in the background when stale.
+HTTP calls share one keep-alive connection pool; *_async wrappers let the asyncio
+orchestrator await a fetch without tying up the event loop.
+Requests a user makes at the same time every day are prefetched into the cache
+shortly before they are due, within an hourly API-call budget.
+Cities, countries, companies and topics are resolved against a prebuilt
+entity index over the bundled gazetteer.tsv.
 """
 
 import os
+import re
+import asyncio
+import threading
 import requests
 import yfinance as yf
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from typing import Dict, List, Optional
 from dotenv import load_dotenv
 
+from data_cache import DataCache
+from entity_index import Entity, EntityIndex
+from prefetch import DEFAULT_BUDGET_PER_HOUR, PrefetchScheduler
+from symbol_metadata import SymbolMetadata
+
+# Keep-alive connections per host (weatherapi.com, gnews.io) and hosts to keep pools for
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 8
+
+
+# Data sources in priority order; whole-word keywords, so "hot" is not "photo" and "rain" is not "train".
+# The suffix keeps "stocks" and "raining" matching, like the request router's keywords.
+DATA_SOURCES = [
+    ('weather', re.compile(r"\b(?:weather|temperature|temp|hot|cold|rain|sunny)(?:s|es|d|ed|ing)?\b")),
+    ('stock', re.compile(r"\b(?:stock|share|price|trading|market)(?:s|es|d|ed|ing)?\b")),
+    ('news', re.compile(r"\b(?:news|headlines|latest|happening)(?:s|es|d|ed|ing)?\b")),
+]
+
+
+def _data_source(text: str) -> Optional[str]:
+    """Highest-priority data source with a keyword in the text, or None."""
+    lowered = text.lower()
+    return next((source for source, pattern in DATA_SOURCES if pattern.search(lowered)), None)
+
+# Most symbols answered in one reply; more than this is too long to listen to
+MAX_BATCH_SYMBOLS = 5
+
+# Spoken index names map to Yahoo index symbols
+INDEX_ALIASES = {
+    'NIFTY': '^NSEI', 'NIFTY50': '^NSEI',
+    'SENSEX': '^BSESN',
+    'DOW': '^DJI', 'DJIA': '^DJI',
+    'NASDAQ': '^IXIC',
+    'SP500': '^GSPC', 'S&P500': '^GSPC'
+}
+
+# Spoken names for indices
+INDEX_NAMES = {
+    '^NSEI': 'Nifty 50',
+    '^BSESN': 'Sensex',
+    '^DJI': 'Dow Jones',
+    '^IXIC': 'Nasdaq',
+    '^GSPC': 'S&P 500'
+}
+
+
+def _seed_symbol_names(companies: Dict[str, str]) -> Dict[str, str]:
+    """Display names we already know: indices plus the gazetteer's companies (first name wins)."""
+    names = dict(INDEX_NAMES)
+    for company, symbol in companies.items():
+        names.setdefault(symbol, company.upper() if len(company) <= 3 else company.title())
+    return names
+
+
+def create_session(pool_connections: int = POOL_CONNECTIONS, pool_maxsize: int = POOL_MAXSIZE) -> requests.Session:
+    """Session whose connections (TCP + TLS) are reused across requests and threads."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
 # Load environment variables
 load_dotenv()
 
 
+class DataUnavailable(Exception):
+    """Service answered without usable data. The message is spoken but never cached."""
+
+
 class DataEngine:
     """Pure data fetching for weather, news, and stocks. Text responses only."""
     
-    def __init__(self, memory_manager=None):
-        """Initialize data engine with API keys and optional memory manager."""
+    def __init__(self, memory_manager=None, cache_ttls: Optional[Dict[str, float]] = None,
+                 cache_size: int = 256, prefetch_budget: int = DEFAULT_BUDGET_PER_HOUR,
+                 cache_max_stale: Optional[Dict[str, float]] = None):
+        """
+        Initialize data engine with API keys and optional memory manager.
+        
+        Args:
+            memory_manager: Source of the user's stored location
+            cache_ttls: Per-source freshness in seconds ('weather', 'news', 'stock')
+            cache_max_stale: Per-source seconds past the TTL a stale answer may still be spoken
+            cache_size: Maximum cached answers across all sources (LRU)
+            prefetch_budget: Background prefetch API calls allowed per hour (0 disables)
+        """
         self.weather_api = os.getenv('WEATHER_API_KEY')
         self.news_api = os.getenv('GNEWS_API_KEY')  # Using GNews API
         self.stock_api = os.getenv('STOCK_API_KEY')
         self.memory_manager = memory_manager
+        self.cache = DataCache(ttls=cache_ttls, max_entries=cache_size, max_stale=cache_max_stale)
+        self.session = create_session()
+        
+        # Built once; one pass over a request finds every known city, country and company
+        self.entities = EntityIndex.from_file()
+        self.country_names = {}  # GNews code -> spoken name, first gazetteer name per code
+        for name, code in self.entities.names('country').items():
+            self.country_names.setdefault(code, name.title())
+        
+        # yfinance Tickers keep their own HTTP state; build each symbol's once
+        self._tickers: Dict[str, "yf.Ticker"] = {}
+        self._tickers_lock = threading.Lock()
+        
+        # Display names come from disk; ticker.info is only called once per new symbol, off the request path
+        self.symbols = SymbolMetadata(seed=_seed_symbol_names(self.entities.names('company')), lookup=self._lookup_symbol_name)
+        
+        # Multi-symbol questions fetch every symbol at once
+        self._stock_pool = ThreadPoolExecutor(max_workers=MAX_BATCH_SYMBOLS, thread_name_prefix="arise-stock")
+        
+        # Learns which requests recur at which hour and warms the cache before them
+        self.prefetcher = PrefetchScheduler(self.cache, {
+            'weather': self._fetch_weather,
+            'news': self._fetch_news,
+            'stock': self._fetch_stock,
+        }, budget_per_hour=prefetch_budget)
+        self.prefetcher.start()
         
         # Default location (can be changed)
         self.default_city = "New York"
@@ -31,20 +147,8 @@ class DataEngine:
         print("Data engine initialized - Text mode only")
     
     def _get_country_name(self, country_code: str) -> str:
-        """Get friendly country name from code."""
-        country_map = {
-            'us': 'United States',
-            'in': 'India', 
-            'uk': 'United Kingdom',
-            'ca': 'Canada',
-            'au': 'Australia',
-            'de': 'Germany',
-            'fr': 'France',
-            'jp': 'Japan',
-            'cn': 'China',
-            'br': 'Brazil'
-        }
-        return country_map.get(country_code.lower(), country_code.upper())
+        """Get friendly country name from code (every country in the gazetteer)."""
+        return self.country_names.get(country_code.lower(), country_code.upper())
     
     def get_weather(self, city: str = None) -> str:
         """
@@ -59,41 +163,47 @@ class DataEngine:
         Time: O(1), Space: O(1)
         """
         if not city:
-            # Try to get location from facts.json first
+            # Try to get location from the user's stored facts first
             if self.memory_manager:
-                facts = self.memory_manager.load_facts()
-                city = facts.get('location', self.default_city)
+                city = self.memory_manager.get_fact('location', self.default_city)
             else:
                 city = self.default_city
             
+        key = DataCache.normalize_key(city)
+        self.prefetcher.record('weather', key, city)
         try:
-            url = f"http://api.weatherapi.com/v1/current.json"
-            params = {
-                'key': self.weather_api,
-                'q': city,
-                'aqi': 'no'
-            }
-            
-            response = requests.get(url, params=params, timeout=5)
-            data = response.json()
-            
-            if 'error' in data:
-                return f"Sorry, couldn't find weather for {city}"
-            
-            current = data['current']
-            location = data['location']
-            
-            temp_c = current['temp_c']
-            condition = current['condition']['text']
-            feels_like = current['feelslike_c']
-            
-            weather_msg = f"It's {temp_c}°C in {location['name']}, {condition.lower()}. Feels like {feels_like}°C."
-            
-            return weather_msg
-            
+            return self.cache.get_or_fetch('weather', key, lambda: self._fetch_weather(city))
+        except DataUnavailable as e:
+            return str(e)
         except Exception as e:
             return f"Weather service unavailable: {str(e)}"
     
+    def _fetch_weather(self, city: str) -> str:
+        """Call weatherapi.com for one city. Raises on failure."""
+        url = f"http://api.weatherapi.com/v1/current.json"
+        params = {
+            'key': self.weather_api,
+            'q': city,
+            'aqi': 'no'
+        }
+        
+        response = self.session.get(url, params=params, timeout=5)
+        data = response.json()
+        
+        if 'error' in data:
+            raise DataUnavailable(f"Sorry, couldn't find weather for {city}")
+        
+        current = data['current']
+        location = data['location']
+        
+        temp_c = current['temp_c']
+        condition = current['condition']['text']
+        feels_like = current['feelslike_c']
+        
+        weather_msg = f"It's {temp_c}°C in {location['name']}, {condition.lower()}. Feels like {feels_like}°C."
+        
+        return weather_msg
+    
     def get_news(self, topic: str = "general", country: str = "us") -> str:
         """
         Get latest news headlines using GNews API with location support.
@@ -107,46 +217,53 @@ class DataEngine:
             
         Time: O(1), Space: O(1)
         """
+        key = DataCache.normalize_key(country, topic)
+        self.prefetcher.record('news', key, topic, country)
         try:
-            # GNews API endpoint
-            url = "https://gnews.io/api/v4/top-headlines"
-            params = {
-                'token': self.news_api,
-                'lang': 'en',
-                'country': country.lower(),
-                'max': 3
-            }
-            
-            # Add category if it's a valid one
-            if topic and topic != "general":
-                params['category'] = topic if topic in ['general', 'world', 'nation', 'business', 'technology', 'entertainment', 'sports', 'science', 'health'] else 'general'
-            
-            response = requests.get(url, params=params, timeout=5)
-            data = response.json()
-            
-            if 'articles' not in data:
-                return f"News service unavailable for {country.upper()} right now"
-            
-            articles = data.get('articles', [])
-            if not articles:
-                return f"No {topic} news found for {country.upper()}"
-            
-            headlines = []
-            for i, article in enumerate(articles[:3], 1):
-                title = article['title']
-                # Clean up title - remove source if present
-                if ' - ' in title:
-                    title = title.split(' - ')[0]
-                headlines.append(f"{i}. {title}")
-            
-            country_name = self._get_country_name(country)
-            news_msg = f"Top {topic} news from {country_name}: " + ". ".join(headlines)
-            
-            return news_msg
-            
+            return self.cache.get_or_fetch('news', key, lambda: self._fetch_news(topic, country))
+        except DataUnavailable as e:
+            return str(e)
         except Exception as e:
             return f"News service error: {str(e)}"
     
+    def _fetch_news(self, topic: str, country: str) -> str:
+        """Call GNews top-headlines for one country and topic. Raises on failure."""
+        # GNews API endpoint
+        url = "https://gnews.io/api/v4/top-headlines"
+        params = {
+            'token': self.news_api,
+            'lang': 'en',
+            'country': country.lower(),
+            'max': 3
+        }
+        
+        # Add category if it's a valid one
+        if topic and topic != "general":
+            params['category'] = topic if topic in ['general', 'world', 'nation', 'business', 'technology', 'entertainment', 'sports', 'science', 'health'] else 'general'
+        
+        response = self.session.get(url, params=params, timeout=5)
+        data = response.json()
+        
+        if 'articles' not in data:
+            raise DataUnavailable(f"News service unavailable for {country.upper()} right now")
+        
+        articles = data.get('articles', [])
+        if not articles:
+            raise DataUnavailable(f"No {topic} news found for {country.upper()}")
+        
+        headlines = []
+        for i, article in enumerate(articles[:3], 1):
+            title = article['title']
+            # Clean up title - remove source if present
+            if ' - ' in title:
+                title = title.split(' - ')[0]
+            headlines.append(f"{i}. {title}")
+        
+        country_name = self._get_country_name(country)
+        news_msg = f"Top {topic} news from {country_name}: " + ". ".join(headlines)
+        
+        return news_msg
+    
     def get_stock(self, symbol: str = "AAPL") -> str:
         """
         Get stock price information using yfinance.
@@ -163,61 +280,113 @@ class DataEngine:
             symbol = symbol.upper()
             
             # Handle special indices
-            if symbol in ['NIFTY', 'NIFTY50']:
-                symbol = '^NSEI'
-            elif symbol in ['SENSEX']:
-                symbol = '^BSESN'
-            elif symbol in ['DOW', 'DJIA']:
-                symbol = '^DJI'
-            elif symbol in ['NASDAQ']:
-                symbol = '^IXIC'
-            elif symbol in ['SP500', 'S&P500']:
-                symbol = '^GSPC'
-            
-            # Create yfinance ticker
-            ticker = yf.Ticker(symbol)
-            
-            # Get current data
-            info = ticker.info
-            hist = ticker.history(period="2d")
-            
-            if hist.empty:
-                return f"No data available for {symbol}"
-            
-            current_price = hist['Close'].iloc[-1]
-            prev_close = hist['Close'].iloc[-2] if len(hist) > 1 else current_price
-            
-            change = current_price - prev_close
-            change_percent = (change / prev_close) * 100
-            
-            direction = "up" if change > 0 else "down" if change < 0 else "unchanged"
-            
-            # Get friendly name
-            name = info.get('longName', symbol)
-            if name == symbol:
-                # For indices, use common names
-                index_names = {
-                    '^NSEI': 'Nifty 50',
-                    '^BSESN': 'Sensex',
-                    '^DJI': 'Dow Jones',
-                    '^IXIC': 'Nasdaq',
-                    '^GSPC': 'S&P 500'
-                }
-                name = index_names.get(symbol, symbol)
-            
-            # Format price based on value
-            if current_price > 1000:
-                price_str = f"{current_price:,.0f}"
-            else:
-                price_str = f"{current_price:.2f}"
-            
-            stock_msg = f"{name} is {price_str}, {direction} {abs(change):.2f} or {abs(change_percent):.2f}% today"
-            
-            return stock_msg
+            symbol = INDEX_ALIASES.get(symbol, symbol)
             
+            key = DataCache.normalize_key(symbol)
+            self.prefetcher.record('stock', key, symbol)
+            return self.cache.get_or_fetch('stock', key, lambda: self._fetch_stock(symbol))
+        except DataUnavailable as e:
+            return str(e)
         except Exception as e:
             return f"Stock data error for {symbol}: {str(e)}"
     
+    def get_stocks(self, symbols: List[str]) -> str:
+        """
+        Get several stock prices in one combined answer.
+        
+        Symbols are fetched concurrently (each through the cache), so the reply
+        takes about as long as the slowest single quote.
+        
+        Args:
+            symbols: Stock symbols or index names, in the order to speak them
+            
+        Returns:
+            One sentence per symbol, joined
+            
+        Time: O(k) requests in parallel for k symbols, Space: O(k)
+        """
+        if len(symbols) == 1:
+            return self.get_stock(symbols[0])
+        
+        answers = self._stock_pool.map(self.get_stock, symbols[:MAX_BATCH_SYMBOLS])
+        return ". ".join(answer.rstrip('.') for answer in answers) + "."
+    
+    def _extract_symbols(self, user_input: str, entities: Optional[List[Entity]] = None) -> List[str]:
+        """Every stock symbol mentioned, in order, without duplicates."""
+        if entities is None:
+            entities = self.entities.find(user_input)
+        words = user_input.split()
+        found = []
+        
+        # Company and index names, plus direct stock symbols (all caps words) that aren't part of one
+        mentions = [(e.start, e.value) for e in entities if e.type in ('company', 'index')]
+        for match in re.finditer(r"\b[A-Z]{2,5}\b", user_input):
+            if not any(e.start <= match.start() < e.end for e in entities):
+                mentions.append((match.start(), match.group()))
+        for _, symbol in sorted(mentions):
+            found.append(symbol)
+        
+        # Look for "of [symbol]" patterns
+        if not found:
+            for i, word in enumerate(words):
+                if word.lower() == 'of' and i + 1 < len(words) and len(words[i + 1]) <= 5:
+                    found.append(words[i + 1].upper())
+                    break
+        
+        # "Nifty" and "NIFTY50" are the same index - dedupe on the Yahoo symbol
+        unique, seen = [], set()
+        for symbol in found:
+            key = INDEX_ALIASES.get(symbol.upper(), symbol.upper())
+            if key not in seen:
+                seen.add(key)
+                unique.append(symbol)
+        return unique
+    
+    def _get_ticker(self, symbol: str) -> "yf.Ticker":
+        """Reuse one yfinance Ticker per symbol."""
+        with self._tickers_lock:
+            ticker = self._tickers.get(symbol)
+            if ticker is None:
+                ticker = self._tickers[symbol] = yf.Ticker(symbol)
+            return ticker
+    
+    def _lookup_symbol_name(self, symbol: str) -> Optional[str]:
+        """Slow path: ask Yahoo for a symbol's display name (runs in the background)."""
+        # A Ticker of its own: Tickers are not thread-safe and the shared one may be mid-fetch
+        info = yf.Ticker(symbol).info
+        return info.get('longName') or info.get('shortName')
+    
+    def _fetch_stock(self, symbol: str) -> str:
+        """Look up one normalized symbol on Yahoo Finance. Raises on failure."""
+        ticker = self._get_ticker(symbol)
+        
+        # Only the last two daily closes - the one request on the answer path
+        hist = ticker.history(period="2d", interval="1d", actions=False)
+        
+        if hist.empty:
+            raise DataUnavailable(f"No data available for {symbol}")
+        
+        current_price = hist['Close'].iloc[-1]
+        prev_close = hist['Close'].iloc[-2] if len(hist) > 1 else current_price
+        
+        change = current_price - prev_close
+        change_percent = (change / prev_close) * 100
+        
+        direction = "up" if change > 0 else "down" if change < 0 else "unchanged"
+        
+        # Get friendly name
+        name = self.symbols.get_name(symbol)
+        
+        # Format price based on value
+        if current_price > 1000:
+            price_str = f"{current_price:,.0f}"
+        else:
+            price_str = f"{current_price:.2f}"
+        
+        stock_msg = f"{name} is {price_str}, {direction} {abs(change):.2f} or {abs(change_percent):.2f}% today"
+        
+        return stock_msg
+    
     def process_data_request(self, user_input: str) -> str:
         """
         Process user request for weather, news, or stock data.
@@ -228,22 +397,24 @@ class DataEngine:
         Returns:
             Appropriate data response
         """
-        user_lower = user_input.lower()
+        source = _data_source(user_input)
+        entities = self.entities.find(user_input)
         
         # Weather requests
-        if any(word in user_lower for word in ['weather', 'temperature', 'temp', 'hot', 'cold', 'rain', 'sunny']):
-            # Try to extract city name - improved extraction
-            city = None
+        if source == 'weather':
+            # Known cities first, then guess from the wording
+            city = next((e.value for e in entities if e.type == 'city'), None)
             words = user_input.split()
             
-            # Look for "in [city]", "of [city]", "at [city]", "on [city]" patterns
-            for i, word in enumerate(words):
-                if word.lower() in ['in', 'of', 'at', 'on'] and i + 1 < len(words):
-                    city = words[i + 1].title()
-                    # Handle multi-word cities
-                    if i + 2 < len(words) and words[i + 2].istitle():
-                        city += " " + words[i + 2].title()
-                    break
+            # Unknown city: look for "in [city]", "of [city]", "at [city]", "on [city]" patterns
+            if not city:
+                for i, word in enumerate(words):
+                    if word.lower() in ['in', 'of', 'at', 'on'] and i + 1 < len(words):
+                        city = words[i + 1].title()
+                        # Handle multi-word cities
+                        if i + 2 < len(words) and words[i + 2].istitle():
+                            city += " " + words[i + 2].title()
+                        break
             
             # If no preposition found, look for proper nouns
             if not city:
@@ -256,98 +427,50 @@ class DataEngine:
             return response
         
         # Stock requests
-        elif any(word in user_lower for word in ['stock', 'share', 'price', 'trading', 'market']):
-            # Try to extract stock symbol - improved extraction
-            symbol = None
-            words = user_input.split()
-            
-            # Common company names to symbols mapping
-            company_symbols = {
-                'apple': 'AAPL', 'google': 'GOOGL', 'tesla': 'TSLA', 'microsoft': 'MSFT',
-                'amazon': 'AMZN', 'meta': 'META', 'facebook': 'META', 'nvidia': 'NVDA',
-                'netflix': 'NFLX', 'uber': 'UBER', 'disney': 'DIS', 'walmart': 'WMT',
-                'coca cola': 'KO', 'pepsi': 'PEP', 'intel': 'INTC', 'amd': 'AMD',
-                'ibm': 'IBM', 'oracle': 'ORCL', 'salesforce': 'CRM', 'adobe': 'ADBE',
-                'zoom': 'ZM', 'twitter': 'TWTR', 'snapchat': 'SNAP', 'spotify': 'SPOT',
-                # Indian stocks
-                'reliance': 'RELIANCE.NS', 'tcs': 'TCS.NS', 'infosys': 'INFY.NS',
-                'hdfc': 'HDFCBANK.NS', 'icici': 'ICICIBANK.NS', 'wipro': 'WIPRO.NS',
-                # Indices
-                'nifty': 'NIFTY', 'nifty50': 'NIFTY', 'sensex': 'SENSEX',
-                'dow': 'DOW', 'nasdaq': 'NASDAQ', 'sp500': 'SP500', 's&p500': 'SP500'
-            }
-            
-            # Look for company names
-            user_text = user_input.lower()
-            for company, sym in company_symbols.items():
-                if company in user_text:
-                    symbol = sym
-                    break
-            
-            # Look for direct stock symbols (all caps words)
-            if not symbol:
-                for word in words:
-                    if word.isupper() and len(word) >= 2 and len(word) <= 5:
-                        symbol = word
-                        break
-            
-            # Look for "of [company]" patterns
-            if not symbol:
-                for i, word in enumerate(words):
-                    if word.lower() == 'of' and i + 1 < len(words):
-                        next_word = words[i + 1].lower()
-                        if next_word in company_symbols:
-                            symbol = company_symbols[next_word]
-                            break
-                        # Try the word as a symbol
-                        elif len(words[i + 1]) <= 5:
-                            symbol = words[i + 1].upper()
-                            break
+        elif source == 'stock':
+            # Every company or symbol mentioned ("Apple, Tesla and Nvidia")
+            symbols = self._extract_symbols(user_input, entities)
             
             # Default fallback
-            if not symbol:
-                symbol = "AAPL"
+            if not symbols:
+                symbols = ["AAPL"]
             
-            response = self.get_stock(symbol)
+            response = self.get_stocks(symbols)
             return response
         
         # News requests  
-        elif any(word in user_lower for word in ['news', 'headlines', 'latest', 'happening']):
-            # Try to extract location/country
-            country = "us"  # Default
-            topic = "general"
-            
-            # Country mapping
-            countries = {
-                'india': 'in', 'indian': 'in',
-                'america': 'us', 'american': 'us', 'usa': 'us', 'united states': 'us',
-                'britain': 'uk', 'british': 'uk', 'england': 'uk', 'uk': 'uk',
-                'canada': 'ca', 'canadian': 'ca',
-                'australia': 'au', 'australian': 'au',
-                'germany': 'de', 'german': 'de',
-                'france': 'fr', 'french': 'fr',
-                'japan': 'jp', 'japanese': 'jp',
-                'china': 'cn', 'chinese': 'cn'
-            }
-            
-            # Extract country from user input
-            for country_name, country_code in countries.items():
-                if country_name in user_lower:
-                    country = country_code
-                    break
-            
-            # Extract topic
-            topics = ['business', 'technology', 'sports', 'health', 'science']
-            for top in topics:
-                if top in user_lower:
-                    topic = top
-                    break
+        elif source == 'news':
+            # Country and topic from the entity index, defaulting to general US news
+            country = next((e.value for e in entities if e.type == 'country'), "us")
+            topic = next((e.value for e in entities if e.type == 'topic'), "general")
             
             response = self.get_news(topic, country)
             return response
         
         else:
             return None  # Not a data request
+    
+    async def get_weather_async(self, city: str = None) -> str:
+        """get_weather() for asyncio callers - runs on a worker thread."""
+        return await asyncio.to_thread(self.get_weather, city)
+    
+    async def get_news_async(self, topic: str = "general", country: str = "us") -> str:
+        """get_news() for asyncio callers - runs on a worker thread."""
+        return await asyncio.to_thread(self.get_news, topic, country)
+    
+    async def get_stock_async(self, symbol: str = "AAPL") -> str:
+        """get_stock() for asyncio callers - runs on a worker thread."""
+        return await asyncio.to_thread(self.get_stock, symbol)
+    
+    async def process_data_request_async(self, user_input: str) -> str:
+        """process_data_request() for asyncio callers - runs on a worker thread."""
+        return await asyncio.to_thread(self.process_data_request, user_input)
+    
+    def close(self):
+        """Release pooled connections and worker threads, and save prefetch history."""
+        self.prefetcher.stop()
+        self.session.close()
+        self._stock_pool.shutdown(wait=False)
 
 
 def main():
@@ -368,6 +491,11 @@ def main():
     print("\nTesting stock...")
     stock = engine.get_stock("AAPL")
     print(f"Stock: {stock}")
+    
+    # Repeat answers come from the cache
+    print("\nTesting cache...")
+    engine.get_weather("london")
+    print(f"Cache: {engine.cache.get_stats()}")
 
 
 if __name__ == "__main__":
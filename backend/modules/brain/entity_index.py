@@ -0,0 +1,210 @@
+"""
+A.R.I.S.E. AI - Entity Index
+
+Aho-Corasick automaton over the bundled gazetteer (cities, countries, companies,
+indices, news topics). Built once; every name in a request is then found in a
+single left-to-right pass, whatever the size of the gazetteer. Matches must sit
+on word boundaries ("amd" does not match inside "amdahl") and overlapping names
+resolve leftmost-longest ("new delhi" over "delhi").
+"""
+
+import os
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+GAZETTEER_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gazetteer.tsv")
+
+
+class Entity(NamedTuple):
+    """One resolved mention: its type, canonical value and span in the input."""
+    type: str
+    name: str
+    value: str
+    start: int
+    end: int
+
+
+def _normalize(name: str) -> str:
+    return " ".join(name.lower().split())
+
+
+def _is_boundary(text: str, position: int) -> bool:
+    """True if text[position] is outside the text or not part of a word."""
+    return position < 0 or position >= len(text) or not text[position].isalnum()
+
+
+class EntityIndex:
+    """
+    Aho-Corasick multi-pattern matcher with word-boundary filtering.
+    Time: O(N) build over N gazetteer characters, O(L + m) lookup for L input
+          characters and m raw matches - independent of the number of names
+    Space: O(N) trie nodes
+    """
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]  # Pattern ids ending at each node (incl. via fail links once built)
+        self._patterns: List[Tuple[str, str, str]] = []  # (type, name, value)
+        self._built = True
+
+    def add(self, name: str, entity_type: str, value: str):
+        """Add one name; call build() (or use from_file) before find()."""
+        name = _normalize(name)
+        if not name:
+            return
+        node = 0
+        for ch in name:
+            next_node = self._goto[node].get(ch)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][ch] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = next_node
+        self._out[node].append(len(self._patterns))
+        self._patterns.append((entity_type, name, value))
+        self._built = False
+
+    def build(self) -> "EntityIndex":
+        """Compute failure links breadth-first and merge suffix outputs."""
+        queue = list(self._goto[0].values())
+        for node in queue:
+            self._fail[node] = 0
+        head = 0
+        while head < len(queue):
+            node = queue[head]
+            head += 1
+            for ch, child in self._goto[node].items():
+                fallback = self._fail[node]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(ch, 0)
+                if self._out[self._fail[child]]:
+                    self._out[child] = self._out[child] + self._out[self._fail[child]]
+                queue.append(child)
+        self._built = True
+        return self
+
+    def find(self, text: str) -> List[Entity]:
+        """
+        All gazetteer names in a text, in order of position.
+
+        Overlaps resolve leftmost-longest; a name listed under several types
+        (Singapore the city and the country) yields one Entity per type.
+        """
+        if not self._built:
+            self.build()
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            lowered = text  # Lowercasing changed lengths; keep spans aligned
+
+        goto, fail, out, patterns = self._goto, self._fail, self._out, self._patterns
+        node = 0
+        matches = []
+        for i, ch in enumerate(lowered):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node] and _is_boundary(lowered, i + 1):
+                for pattern_id in out[node]:
+                    start = i + 1 - len(patterns[pattern_id][1])
+                    if _is_boundary(lowered, start - 1):
+                        matches.append((start, -(i + 1), pattern_id))
+
+        entities = []
+        last_end = 0
+        matches.sort()
+        for start, negative_end, pattern_id in matches:
+            end = -negative_end
+            if start < last_end and not (entities and (entities[-1].start, entities[-1].end) == (start, end)):
+                continue
+            entity_type, name, value = patterns[pattern_id]
+            entities.append(Entity(entity_type, name, value, start, end))
+            last_end = end
+        return entities
+
+    def first(self, text: str, entity_type: str) -> Optional[Entity]:
+        """Leftmost entity of one type, or None."""
+        return next((entity for entity in self.find(text) if entity.type == entity_type), None)
+
+    def names(self, entity_type: str) -> Dict[str, str]:
+        """name -> value for every entry of one type, in gazetteer order."""
+        return {name: value for kind, name, value in self._patterns if kind == entity_type}
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    @classmethod
+    def from_file(cls, path: str = GAZETTEER_FILE) -> "EntityIndex":
+        """Build an index from '<type>\\t<name>\\t<value>' lines, skipping blanks and # comments."""
+        index = cls()
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                entity_type, name, value = line.split('\t')
+                index.add(name, entity_type, value)
+        return index.build()
+
+
+def benchmark(sizes=(1_000, 10_000, 50_000), rounds: int = 2000) -> dict:
+    """
+    Per-request cost of the index vs. substring scans over a growing gazetteer.
+
+    Returns:
+        Dict of gazetteer size -> (build ms, index us, scan us) per request
+    """
+    import random
+
+    rng = random.Random(0)
+    queries = [
+        "what's the weather in new delhi today",
+        "how are apple, tesla and amd doing on the market",
+        "latest technology news from india",
+        "is it raining in sao paulo right now",
+        "tell me about amdahl's law",
+    ]
+    base = EntityIndex.from_file()
+    base_names = [(name, kind, value) for kind, name, value in base._patterns]
+
+    results = {}
+    print(f"Entity lookup per request ({rounds} requests):")
+    for size in sizes:
+        names = list(base_names)
+        while len(names) < size:
+            word = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(4, 12)))
+            names.append((word, "city", word.title()))
+
+        start = time.perf_counter()
+        index = EntityIndex()
+        for name, kind, value in names:
+            index.add(name, kind, value)
+        index.build()
+        build_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        for i in range(rounds):
+            index.find(queries[i % len(queries)])
+        index_us = (time.perf_counter() - start) / rounds * 1e6
+
+        # What process_data_request used to do: a substring test per known name
+        scan_rounds = max(1, rounds // 20)
+        start = time.perf_counter()
+        for i in range(scan_rounds):
+            query = queries[i % len(queries)]
+            [name for name, _, _ in names if name in query]
+        scan_us = (time.perf_counter() - start) / scan_rounds * 1e6
+
+        results[size] = (build_ms, index_us, scan_us)
+        print(f"   {size:>6} names: build {build_ms:7.1f} ms, index {index_us:6.1f} us, substring scan {scan_us:8.1f} us")
+
+    for query in queries:
+        print(f"   {query!r}: {[(e.type, e.value, e.start, e.end) for e in base.find(query)]}")
+    return results
+
+
+if __name__ == "__main__":
+    benchmark()
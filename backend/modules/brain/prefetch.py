@@ -0,0 +1,224 @@
+"""
+A.R.I.S.E. AI - Data Prefetch Scheduler
+
+Learns which (source, key) data requests a user makes at which hour of the day
+(weather at home in the morning, headlines before work) and refreshes those
+cache entries shortly before they are usually asked for, within a fixed budget
+of API calls per hour. Request history persists to data/prefetch_history.json.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+from data_cache import DataCache
+
+HISTORY_FILE = "data/prefetch_history.json"
+
+DEFAULT_BUDGET_PER_HOUR = 20  # Prefetch API calls, on top of what the user asks for
+CHECK_INTERVAL = 60           # Seconds between scheduler passes
+LEAD_SECONDS = 600            # Prefetch when an entry is missing or expires this soon
+MIN_REQUESTS = 2              # Requests in an hour-of-day bucket before it counts as a habit
+HISTORY_CAP = 64              # Per-pair total that triggers halving, so old habits fade
+SAVE_INTERVAL = 60            # Seconds between history writes
+
+
+class PrefetchScheduler:
+    """
+    Hour-of-day request histogram per (source, key) driving cache prefetches.
+    Time: O(1) per recorded request, O(p log p) per pass over p tracked pairs
+    Space: O(p * 24)
+    """
+
+    def __init__(self, cache: DataCache, fetchers: Dict[str, Callable[..., str]],
+                 budget_per_hour: int = DEFAULT_BUDGET_PER_HOUR, path: str = HISTORY_FILE,
+                 lead_seconds: float = LEAD_SECONDS, min_requests: int = MIN_REQUESTS,
+                 clock: Callable[[], float] = time.time):
+        """
+        Args:
+            cache: Cache the prefetched answers go into
+            fetchers: Source name -> function fetching one answer from recorded args
+            budget_per_hour: Maximum prefetch calls in any rolling hour (0 disables)
+            path: JSON file the request history persists to
+            lead_seconds: How far ahead of expiry (and of the usual request hour) to refresh
+            min_requests: Requests at an hour of day before that hour is prefetched
+            clock: Wall-clock seconds (hour of day comes from local time)
+        """
+        self.cache = cache
+        self.fetchers = fetchers
+        self.budget_per_hour = budget_per_hour
+        self.path = path
+        self.lead_seconds = lead_seconds
+        self.min_requests = min_requests
+        self.clock = clock
+
+        # "source|key" -> {"source", "key", "args", "hours": [24 counts]}
+        self.history: Dict[str, dict] = {}
+        self._calls = deque()  # Timestamps of prefetch calls in the last hour
+        self._unused = set()   # Prefetched pairs nobody has asked for since; not fetched again until they do
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_save = 0.0
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.history = json.load(f)
+        except Exception as e:
+            print(f"Error loading prefetch history: {e}")
+
+    def _save(self):
+        """Write history atomically (temp file + rename)."""
+        with self._lock:
+            snapshot = json.dumps(self.history)
+            self._dirty = False
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(snapshot)
+        os.replace(tmp_path, self.path)
+        self._last_save = self.clock()
+
+    def _hour(self, timestamp: float) -> int:
+        return time.localtime(timestamp).tm_hour
+
+    def record(self, source: str, key: str, *args):
+        """Note one user request; args are what the source's fetcher needs to repeat it."""
+        if source not in self.fetchers:
+            return
+        now = self.clock()
+        with self._lock:
+            entry = self.history.setdefault(f"{source}|{key}", {
+                "source": source, "key": key, "args": list(args), "hours": [0.0] * 24,
+            })
+            entry["args"] = list(args)
+            entry["hours"][self._hour(now)] += 1
+            if sum(entry["hours"]) > HISTORY_CAP:
+                entry["hours"] = [count / 2 for count in entry["hours"]]
+            self._unused.discard((source, key))
+            self._dirty = True
+
+    def _take_budget(self, now: float) -> bool:
+        """Spend one call from the rolling hourly budget if any is left."""
+        while self._calls and now - self._calls[0] >= 3600:
+            self._calls.popleft()
+        if len(self._calls) >= self.budget_per_hour:
+            return False
+        self._calls.append(now)
+        return True
+
+    def due(self, now: Optional[float] = None) -> List[Tuple[float, dict]]:
+        """Pairs habitually requested around now, most requested first."""
+        now = self.clock() if now is None else now
+        hours = {self._hour(now), self._hour(now + self.lead_seconds)}
+        with self._lock:
+            candidates = [(max(entry["hours"][h] for h in hours), dict(entry)) for entry in self.history.values()]
+        return sorted([c for c in candidates if c[0] >= self.min_requests], key=lambda c: -c[0])
+
+    def run_once(self, now: Optional[float] = None) -> int:
+        """
+        One scheduler pass: refresh due entries that are missing or about to expire.
+
+        Sources whose TTL is shorter than lead_seconds are never prefetched; their
+        answer would expire before the request it was fetched for.
+
+        Returns:
+            Number of prefetch calls made
+        """
+        now = self.clock() if now is None else now
+        fetched = 0
+        for _, entry in self.due(now):
+            pair = (entry["source"], entry["key"])
+            if self.cache.ttls.get(entry["source"], 0) < self.lead_seconds:
+                continue  # Would be stale again before the user is expected (stock quotes)
+            with self._lock:
+                if pair in self._unused:
+                    continue
+            remaining = self.cache.remaining_ttl(entry["source"], entry["key"])
+            if remaining is not None and remaining > self.lead_seconds:
+                continue  # Still fresh when the user is expected
+            if not self._take_budget(now):
+                break
+
+            fetcher = self.fetchers[entry["source"]]
+            args = entry["args"]
+            if self.cache.prefetch(entry["source"], entry["key"], lambda: fetcher(*args)):
+                fetched += 1
+                with self._lock:
+                    self._unused.add(pair)
+                print(f"📥 Prefetched {entry['source']}: {entry['key']}")
+
+        if self._dirty and now - self._last_save >= SAVE_INTERVAL:
+            self._save()
+        return fetched
+
+    def _run(self):
+        while not self._stop.wait(CHECK_INTERVAL):
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"Prefetch error: {e}")
+
+    def start(self):
+        """Start the background scheduler thread (no-op without a budget)."""
+        if self.budget_per_hour <= 0 or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="arise-prefetch", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the scheduler and persist the request history."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._dirty:
+            try:
+                self._save()
+            except Exception as e:
+                print(f"Error saving prefetch history: {e}")
+
+
+def demo():
+    """Simulate a week of 8am weather checks, then show the 7:55 prefetch and the 8:00 hit."""
+    import tempfile
+
+    base = time.mktime((2024, 1, 1, 8, 0, 0, 0, 0, -1))
+    now = [base]
+    calls = []
+
+    def fetch_weather(city):
+        time.sleep(0.2)  # Stand-in for a weatherapi.com round trip
+        calls.append(city)
+        return f"Weather for {city}"
+
+    cache = DataCache(clock=lambda: now[0])
+    with tempfile.TemporaryDirectory() as scratch:
+        scheduler = PrefetchScheduler(cache, {'weather': fetch_weather}, budget_per_hour=5,
+                                      path=os.path.join(scratch, "history.json"), clock=lambda: now[0])
+        key = DataCache.normalize_key("London")
+        for day in range(5):
+            scheduler.record('weather', key, "London")
+
+        now[0] = base + 7 * 86400 - 300  # A week later, 7:55
+        print(f"7:55 pass prefetched {scheduler.run_once()} entry")
+
+        now[0] += 300
+        start = time.perf_counter()
+        answer = cache.get_or_fetch('weather', key, lambda: fetch_weather("London"))
+        print(f"8:00 request: {answer!r} in {(time.perf_counter() - start) * 1000:.1f} ms")
+        print(f"Network calls: {len(calls)}, cache: {cache.get_stats()}")
+        scheduler.stop()
+
+
+if __name__ == "__main__":
+    demo()
@@ -0,0 +1,100 @@
+"""
+A.R.I.S.E. AI - Symbol Metadata Cache
+
+Persistent display names for stock symbols and indices (data/symbol_metadata.json).
+Seeded from DataEngine's company and index maps; symbols not seen before are
+answered with their ticker right away while the name is looked up once on a
+background thread and saved, so yfinance's slow `info` endpoint never sits on
+the request path.
+"""
+
+import json
+import os
+import threading
+from typing import Callable, Dict, Optional, Set
+
+METADATA_FILE = "data/symbol_metadata.json"
+
+
+class SymbolMetadata:
+    """
+    Symbol -> display name map, filled lazily.
+    Time: O(1) lookup, O(n) save of n symbols (only after a new name is learned)
+    Space: O(n)
+    """
+
+    def __init__(self, path: str = METADATA_FILE, seed: Optional[Dict[str, str]] = None,
+                 lookup: Optional[Callable[[str], Optional[str]]] = None):
+        """
+        Args:
+            path: JSON file the learned names persist to
+            seed: Names known up front; saved names take precedence
+            lookup: Fetches a display name for a symbol (slow, network), or None
+        """
+        self.path = path
+        self.lookup = lookup
+        self._names: Dict[str, str] = dict(seed or {})
+        self._learned: Dict[str, str] = {}  # Only looked-up names are persisted; seeds live in code
+        self._pending: Set[str] = set()
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()  # Lookups finishing together share one temp file
+        self._load()
+
+    def _load(self):
+        """Merge previously learned names over the seed."""
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._learned = json.load(f)
+                self._names.update(self._learned)
+        except Exception as e:
+            print(f"Error loading symbol metadata: {e}")
+
+    def _save(self):
+        """Write learned names atomically (temp file + rename)."""
+        with self._save_lock:
+            with self._lock:
+                names = dict(self._learned)
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(names, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+
+    def get_name(self, symbol: str) -> str:
+        """
+        Display name for a symbol, never blocking on the network.
+
+        Unknown symbols return the symbol itself and queue a background lookup.
+        """
+        with self._lock:
+            name = self._names.get(symbol)
+            if name is not None:
+                return name
+            if self.lookup is None or symbol in self._pending:
+                return symbol
+            self._pending.add(symbol)
+
+        threading.Thread(target=self._learn, args=(symbol,), name="arise-symbol-meta", daemon=True).start()
+        return symbol
+
+    def _learn(self, symbol: str):
+        """Look one symbol up and persist its name."""
+        try:
+            name = self.lookup(symbol)
+            if name:
+                with self._lock:
+                    self._names[symbol] = name
+                    self._learned[symbol] = name
+                self._save()
+        except Exception as e:
+            print(f"Symbol metadata lookup failed for {symbol}: {e}")
+        finally:
+            with self._lock:
+                self._pending.discard(symbol)
+
+    def __contains__(self, symbol: str) -> bool:
+        with self._lock:
+            return symbol in self._names
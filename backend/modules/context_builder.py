@@ -0,0 +1,304 @@
+"""
+A.R.I.S.E. AI - Context Builder
+
+Assembles the memory context sent with each chat request under a token budget.
+The last few turns go in verbatim; older turns of the session are replaced by
+extractive summaries of fixed chunks of messages, each computed once when its
+chunk fills and folded into a single rolling summary as it ages. Facts and
+related earlier messages come from MemoryManager's relevance ranking. When the
+pieces exceed the budget, the least useful go first. Prompt size is recorded
+per turn.
+"""
+
+import re
+import time
+from collections import Counter, deque
+from typing import Any, Dict, List, Optional, Tuple
+
+from session_store import STOPWORDS
+
+CHARS_PER_TOKEN = 4          # Rough average for English text with Gemini's tokenizer
+DEFAULT_TOKEN_BUDGET = 600   # Memory context per request (the system prompt and input are extra)
+RECENT_MESSAGES = 6          # Newest messages always considered verbatim
+MIN_RECENT_MESSAGES = 2      # Verbatim messages kept even when over budget
+RELATED_MESSAGES = 4
+MAX_FACTS = 5
+SUMMARY_CHUNK = 8            # Messages covered by one chunk summary
+CHUNK_SENTENCES = 2          # Sentences kept per chunk summary
+ROLLING_SENTENCES = 4        # Sentences kept in the rolling summary of the oldest chunks
+MAX_CHUNK_SUMMARIES = 3      # Newer chunk summaries kept separately before folding into the rolling one
+MAX_SENTENCE_WORDS = 30
+METRICS_HISTORY = 200
+
+_SENTENCE = re.compile(r"(?<=[.!?])\s+")
+_WORD = re.compile(r"[a-z0-9]{2,}")
+
+Summary = List[Tuple[str, str]]  # (speaker, sentence) pairs in conversation order
+
+
+def estimate_tokens(text: str) -> int:
+    """Token estimate without a tokenizer: about four characters per token."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def summarize(lines: Summary, max_sentences: int) -> Summary:
+    """
+    Extractive summary: the sentences carrying the chunk's most repeated content words.
+
+    Args:
+        lines: (speaker, text) pairs; texts are split into sentences
+        max_sentences: Sentences to keep, in their original order
+
+    Returns:
+        (speaker, sentence) pairs
+    """
+    sentences = []
+    for speaker, text in lines:
+        for sentence in _SENTENCE.split(text.strip()):
+            words = sentence.split()
+            if words:
+                sentences.append((speaker, " ".join(words[:MAX_SENTENCE_WORDS])))
+    if len(sentences) <= max_sentences:
+        return sentences
+
+    terms = [[w for w in _WORD.findall(sentence.lower()) if w not in STOPWORDS] for _, sentence in sentences]
+    frequency = Counter(w for words in terms for w in set(words))
+
+    def score(i: int) -> float:
+        unique = set(terms[i])
+        weight = sum(frequency[w] for w in unique) / (len(unique) ** 0.5) if unique else 0.0
+        return weight * (1.2 if sentences[i][0] == "User" else 1.0)  # The user's own statements matter most
+
+    keep = sorted(sorted(range(len(sentences)), key=score, reverse=True)[:max_sentences])
+    return [sentences[i] for i in keep]
+
+
+def _speaker(message: Dict[str, Any]) -> str:
+    return "User" if message["role"] == "user" else "AI"
+
+
+class ContextBuilder:
+    """
+    Token-budgeted memory context with cached rolling summaries.
+    Time: O(r + k) per turn for r verbatim messages and k retrieved snippets; each chunk
+          of the session is summarized once and folded once
+    Space: O(MAX_CHUNK_SUMMARIES) cached summaries + METRICS_HISTORY turn records
+    """
+
+    def __init__(self, memory, token_budget: int = DEFAULT_TOKEN_BUDGET,
+                 recent_messages: int = RECENT_MESSAGES, chunk_size: int = SUMMARY_CHUNK):
+        """
+        Args:
+            memory: MemoryManager (session_buffer, relevant_facts, retrieve)
+            token_budget: Estimated tokens the context may use
+            recent_messages: Newest messages kept verbatim
+            chunk_size: Messages per summarized chunk
+        """
+        self.memory = memory
+        self.token_budget = token_budget
+        self.recent_messages = recent_messages
+        self.chunk_size = chunk_size
+
+        self._session: Optional[float] = None  # Timestamp of the buffer's first message
+        self._chunks: Dict[int, Tuple[Tuple[float, float], Summary]] = {}
+        self._rolling: Summary = []
+        self._folded = 0  # Chunks already folded into the rolling summary
+        self.summary_stats = {"computed": 0, "reused": 0, "folded": 0}
+        self.turns = deque(maxlen=METRICS_HISTORY)
+
+    def build(self, user_input: str = "") -> str:
+        """Context string for one chat request, within the token budget."""
+        start = time.perf_counter()
+        buffer = list(self.memory.session_buffer)
+        summarized = max(0, (len(buffer) - self.recent_messages) // self.chunk_size * self.chunk_size)
+
+        facts = [f"{k}: {v}" for k, v in self.memory.relevant_facts(user_input, MAX_FACTS).items()]
+        summary = [f"{speaker}: {sentence}" for speaker, sentence in self._summary(buffer, summarized)]
+        related = []
+        if user_input:
+            # Earlier sessions only; this session's older turns are covered by the summary
+            before = buffer[0]["timestamp"] if buffer else None
+            for msg in self.memory.retrieve(user_input, k=RELATED_MESSAGES, before=before):
+                day = time.strftime("%Y-%m-%d", time.localtime(msg["timestamp"]))
+                related.append((msg["score"], msg["timestamp"], f"{_speaker(msg)} ({day}): {msg['text']}"))
+        recent = [f"{_speaker(msg)}: {msg['content']}" for msg in buffer[summarized:]]
+
+        trimmed = self._fit(facts, summary, related, recent)
+        context = self._render(facts, summary, related, recent)
+
+        sections = {
+            "facts": estimate_tokens(", ".join(facts)),
+            "summary": estimate_tokens(" ".join(summary)),
+            "related": estimate_tokens(" | ".join(text for _, _, text in related)),
+            "recent": estimate_tokens(" | ".join(recent)),
+        }
+        turn = {"tokens": estimate_tokens(context), "budget": self.token_budget, "trimmed": trimmed,
+                "buffer_messages": len(buffer), "build_ms": (time.perf_counter() - start) * 1000, **sections}
+        self.turns.append(turn)
+        print(f"🧮 Context: {turn['tokens']}/{self.token_budget} tokens "
+              f"(facts {sections['facts']}, summary {sections['summary']}, related {sections['related']}, "
+              f"recent {sections['recent']}" + (f", trimmed {trimmed}" if trimmed else "") + ")")
+        return context
+
+    def _summary(self, buffer: List[Dict[str, Any]], summarized: int) -> Summary:
+        """Rolling summary plus per-chunk summaries for buffer[:summarized], reusing cached ones."""
+        session = buffer[0]["timestamp"] if buffer else None
+        if session != self._session:
+            # New session (or buffer cleared): nothing cached applies
+            self._session = session
+            self._chunks.clear()
+            self._rolling = []
+            self._folded = 0
+
+        chunks = summarized // self.chunk_size
+        fold_until = max(0, chunks - MAX_CHUNK_SUMMARIES)
+        lines: Summary = []
+        for index in range(self._folded, chunks):
+            messages = buffer[index * self.chunk_size:(index + 1) * self.chunk_size]
+            window = (messages[0]["timestamp"], messages[-1]["timestamp"])
+            cached = self._chunks.get(index)
+            if cached and cached[0] == window:
+                self.summary_stats["reused"] += 1
+                chunk_summary = cached[1]
+            else:
+                chunk_summary = summarize([(_speaker(msg), msg["content"]) for msg in messages], CHUNK_SENTENCES)
+                self._chunks[index] = (window, chunk_summary)
+                self.summary_stats["computed"] += 1
+
+            if index < fold_until:
+                # Aged out: merge into the rolling summary once, then forget the chunk
+                self._rolling = summarize(self._rolling + chunk_summary, ROLLING_SENTENCES)
+                self._folded = index + 1
+                del self._chunks[index]
+                self.summary_stats["folded"] += 1
+            else:
+                lines.extend(chunk_summary)
+        return self._rolling + lines
+
+    def _fit(self, facts: List[str], summary: List[str], related: List[tuple], recent: List[str]) -> int:
+        """
+        Drop items in place until the estimate fits the budget.
+
+        Order: verbatim messages older than the recent window (not summarized
+        yet), weakest related snippet, oldest summary sentence, oldest verbatim
+        message (keeping MIN_RECENT_MESSAGES), lowest-ranked fact; a single item
+        still too large is cut to fit.
+
+        Returns:
+            Number of items dropped or cut
+        """
+        trimmed = 0
+        related.sort(key=lambda item: item[1])
+        while estimate_tokens(self._render(facts, summary, related, recent)) > self.token_budget:
+            if len(recent) > self.recent_messages:
+                recent.pop(0)
+            elif related:
+                related.remove(min(related, key=lambda item: item[0]))
+            elif summary:
+                summary.pop(0)
+            elif len(recent) > MIN_RECENT_MESSAGES:
+                recent.pop(0)
+            elif len(facts) > 1:
+                facts.pop()
+            else:
+                # One oversized message or fact: cut the longest item to what's left of the budget
+                items = [(lst, i) for lst in (recent, facts) for i in range(len(lst))]
+                if not items:
+                    break
+                lst, i = max(items, key=lambda item: len(item[0][item[1]]))
+                excess = estimate_tokens(self._render(facts, summary, related, recent)) - self.token_budget
+                keep = max(0, len(lst[i]) - excess * CHARS_PER_TOKEN - 3)
+                if keep == 0:
+                    lst.pop(i)
+                else:
+                    lst[i] = lst[i][:keep] + "..."
+            trimmed += 1
+        return trimmed
+
+    @staticmethod
+    def _render(facts: List[str], summary: List[str], related: List[tuple], recent: List[str]) -> str:
+        parts = []
+        if facts:
+            parts.append(f"User facts: {', '.join(facts)}")
+        if summary:
+            parts.append(f"Earlier in this conversation: {' '.join(summary)}")
+        if related:
+            parts.append(f"Related earlier conversation: {' | '.join(text for _, _, text in related)}")
+        if recent:
+            parts.append(f"Recent conversation: {' | '.join(recent)}")
+        return " | ".join(parts)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Prompt-size metrics over the recorded turns."""
+        if not self.turns:
+            return {"turns": 0, **self.summary_stats}
+        tokens = [turn["tokens"] for turn in self.turns]
+        return {
+            "turns": len(self.turns),
+            "last_tokens": tokens[-1],
+            "mean_tokens": sum(tokens) / len(tokens),
+            "max_tokens": max(tokens),
+            "over_budget_turns": sum(turn["trimmed"] > 0 for turn in self.turns),
+            "mean_build_ms": sum(turn["build_ms"] for turn in self.turns) / len(self.turns),
+            **self.summary_stats,
+        }
+
+
+def benchmark(turns: int = 120, budget: int = DEFAULT_TOKEN_BUDGET) -> dict:
+    """
+    Prompt size over a long, chatty session for a user with many facts.
+
+    Compares the old context (every fact + the last 10 messages, concatenated)
+    with the budgeted builder.
+    """
+    import contextlib
+    import io
+    import random
+    import tempfile
+
+    from memory_manager import MemoryManager
+
+    rng = random.Random(0)
+    topics = ["my garden tomatoes are finally ripening after weeks of rain",
+              "the marathon training plan says twenty miles on sunday",
+              "work has been hectic because of the product launch next month",
+              "I'm reading a long novel about the history of the silk road",
+              "my sister is visiting from toronto and we're planning a road trip"]
+
+    with tempfile.TemporaryDirectory() as scratch:
+        memory = MemoryManager(scratch)
+        memory.update_facts({f"preference_{i}": f"likes detailed answers about topic number {i} in depth"
+                             for i in range(25)})
+        memory.update_facts({"name": "Sam", "location": "London"})
+        builder = ContextBuilder(memory, token_budget=budget)
+
+        old_tokens, new_tokens = [], []
+        with contextlib.redirect_stdout(io.StringIO()):  # The per-turn lines would flood the output
+            for turn in range(turns):
+                user_input = f"{rng.choice(topics)}. What do you think about that, and what should I do next?"
+                memory.add_message("user", user_input)
+
+                facts = memory.load_facts()
+                recent = memory.session_buffer[-10:]
+                old = " | ".join([f"User facts: {', '.join(f'{k}: {v}' for k, v in facts.items())}",
+                                  "Recent conversation: " + " | ".join(
+                                      f"{_speaker(m)}: {m['content']}" for m in recent)])
+                old_tokens.append(estimate_tokens(old))
+                builder.build(user_input)
+                new_tokens.append(builder.turns[-1]["tokens"])
+
+                memory.add_message("assistant", "That sounds great. " * rng.randint(5, 25)
+                                   + "Let me know how it goes and I can help you plan the next steps.")
+
+        stats = builder.get_stats()
+        print(f"Context size over {turns} turns, {len(memory.load_facts())} facts (budget {budget} tokens):")
+        print(f"   old builder:      mean {sum(old_tokens) / turns:6.0f}, max {max(old_tokens):5d} tokens")
+        print(f"   budgeted builder: mean {stats['mean_tokens']:6.0f}, max {stats['max_tokens']:5d} tokens, "
+              f"{stats['mean_build_ms']:.2f} ms/turn")
+        print(f"   summaries: {stats['computed']} computed, {stats['reused']} reused, {stats['folded']} folded "
+              f"(vs {turns} turns)")
+        return stats
+
+
+if __name__ == "__main__":
+    benchmark()
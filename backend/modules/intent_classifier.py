@@ -0,0 +1,244 @@
+"""
+A.R.I.S.E. AI - Intent Classifier
+
+Optional on-CPU intent model used in front of the keyword router.
+Utterances are hashed into a fixed-size bag of word unigrams, word bigrams and
+character trigrams; a softmax linear model over those buckets gives a probability
+per route. Trained in a fraction of a second with NumPy from the bundled
+intent_utterances.tsv, so there is no model file to ship or keep in sync.
+"""
+
+import os
+import re
+import time
+import zlib
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+TRAINING_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "intent_utterances.tsv")
+HELD_OUT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "intent_heldout.tsv")
+
+HASH_DIM = 4096
+CONFIDENCE_THRESHOLD = 0.6     # A prediction this likely wins over the keyword router
+KEYWORD_AGREEMENT = 0.2        # Below the threshold, keywords only win if the model gives their intent this much
+DESTRUCTIVE_CONFIDENCE = 0.9   # Destructive intents without a confirming keyword need this much
+
+# Destructive intents the model may only pick on its own when it is very sure
+KEYWORD_CONFIRMED_INTENTS = {'memory_delete'}
+
+_WORD = re.compile(r"[a-z0-9']+")
+
+
+def load_training_data(path: str = TRAINING_FILE) -> Tuple[List[str], List[str]]:
+    """Read '<intent>\\t<utterance>' lines, skipping blanks and # comments."""
+    texts, labels = [], []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            label, text = line.split('\t', 1)
+            labels.append(label.strip())
+            texts.append(text.strip())
+    return texts, labels
+
+
+class IntentClassifier:
+    """
+    Hashed n-gram softmax regression.
+    Time: O(L) feature hashing + O(F*C) scoring per prediction for F active buckets
+    Space: O(D*C) weights for D hash buckets and C intents
+    """
+
+    def __init__(self, dim: int = HASH_DIM):
+        self.dim = dim
+        self.labels: List[str] = []
+        self.weights = np.zeros((dim, 0), dtype=np.float32)
+        self.bias = np.zeros(0, dtype=np.float32)
+
+    def _features(self, text: str) -> np.ndarray:
+        """Unique hash buckets for a text's unigrams, bigrams and char trigrams."""
+        words = _WORD.findall(text.lower())
+        grams = [f"w:{word}" for word in words]
+        grams += [f"b:{a} {b}" for a, b in zip(words, words[1:])]
+        for word in words:
+            padded = f"<{word}>"
+            grams += [f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2)]
+        # crc32 rather than hash(): stable across processes
+        return np.unique(np.fromiter((zlib.crc32(gram.encode()) % self.dim for gram in grams),
+                                     dtype=np.int64, count=len(grams)))
+
+    def _matrix(self, texts: Sequence[str]) -> np.ndarray:
+        """L2-normalized binary feature rows for a batch of texts."""
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            buckets = self._features(text)
+            if buckets.size:
+                matrix[row, buckets] = 1.0 / np.sqrt(buckets.size)
+        return matrix
+
+    def fit(self, texts: Sequence[str], labels: Sequence[str], epochs: int = 200,
+            learning_rate: float = 20.0, l2: float = 1e-4) -> "IntentClassifier":
+        """Full-batch gradient descent on the softmax cross-entropy."""
+        self.labels = sorted(set(labels))
+        targets = np.zeros((len(labels), len(self.labels)), dtype=np.float32)
+        targets[np.arange(len(labels)), [self.labels.index(label) for label in labels]] = 1.0
+
+        # Train only the buckets the corpus uses; the rest stay zero
+        features = self._matrix(texts)
+        active = np.flatnonzero(features.any(axis=0))
+        features = np.ascontiguousarray(features[:, active])
+        features_t = np.ascontiguousarray(features.T)
+        weights = np.zeros((active.size, len(self.labels)), dtype=np.float32)
+        self.bias = np.zeros(len(self.labels), dtype=np.float32)
+
+        for _ in range(epochs):
+            probabilities = self._softmax(features @ weights + self.bias)
+            error = (probabilities - targets) / len(labels)
+            weights -= learning_rate * (features_t @ error + l2 * weights)
+            self.bias -= learning_rate * error.sum(axis=0)
+
+        self.weights = np.zeros((self.dim, len(self.labels)), dtype=np.float32)
+        self.weights[active] = weights
+        return self
+
+    @staticmethod
+    def _softmax(logits: np.ndarray) -> np.ndarray:
+        shifted = np.exp(logits - logits.max(axis=-1, keepdims=True))
+        return shifted / shifted.sum(axis=-1, keepdims=True)
+
+    def predict_proba(self, text: str) -> Dict[str, float]:
+        """Probability per intent for one utterance."""
+        buckets = self._features(text)
+        logits = self.bias.copy()
+        if buckets.size:
+            logits += self.weights[buckets].sum(axis=0) / np.sqrt(buckets.size)
+        return dict(zip(self.labels, self._softmax(logits).tolist()))
+
+    def predict(self, text: str) -> Tuple[str, float]:
+        """Most likely intent and its probability."""
+        probabilities = self.predict_proba(text)
+        best = max(probabilities, key=probabilities.get)
+        return best, probabilities[best]
+
+    def route(self, text: str, keyword_intent: str) -> Tuple[str, float]:
+        """
+        Combine the model's prediction with the keyword router's intent.
+
+        A confident prediction wins. Below CONFIDENCE_THRESHOLD the keywords
+        only take over when the model also rates their intent at least
+        KEYWORD_AGREEMENT, so a stray keyword ("the price of happiness") can't
+        overrule a model that has all but ruled it out. Destructive intents
+        also need a confirming keyword unless the model is very sure.
+
+        Returns:
+            Tuple of (intent, model probability of that intent)
+        """
+        probabilities = self.predict_proba(text)
+        intent = max(probabilities, key=probabilities.get)
+        confidence = probabilities[intent]
+        keyword_probability = probabilities.get(keyword_intent, 0.0)
+        if intent in KEYWORD_CONFIRMED_INTENTS and keyword_intent != intent and confidence < DESTRUCTIVE_CONFIDENCE:
+            return keyword_intent, keyword_probability
+        if confidence < CONFIDENCE_THRESHOLD and keyword_probability >= KEYWORD_AGREEMENT:
+            return keyword_intent, keyword_probability
+        return intent, confidence
+
+    @classmethod
+    def from_file(cls, path: str = TRAINING_FILE, dim: int = HASH_DIM) -> "IntentClassifier":
+        """Train a classifier from a labeled utterance file."""
+        texts, labels = load_training_data(path)
+        return cls(dim).fit(texts, labels)
+
+
+def evaluate_held_out(model: "IntentClassifier", path: str = HELD_OUT_FILE) -> dict:
+    """
+    Route utterances kept out of training with the model, the keyword router, and both combined.
+
+    Returns:
+        Dict of accuracy per strategy plus the (utterance, expected, routed) misses
+    """
+    from intent_router import REQUEST_ROUTER
+
+    texts, labels = load_training_data(path)
+    model_hits = keyword_hits = routed_hits = 0
+    misses = []
+    for text, label in zip(texts, labels):
+        intent, _ = model.predict(text)
+        keyword = REQUEST_ROUTER.classify(text)
+        routed, _ = model.route(text, keyword)
+        model_hits += intent == label
+        keyword_hits += keyword == label
+        routed_hits += routed == label
+        if routed != label:
+            misses.append((text, label, routed))
+    total = max(len(texts), 1)
+    return {
+        "model_accuracy": model_hits / total,
+        "keyword_accuracy": keyword_hits / total,
+        "routed_accuracy": routed_hits / total,
+        "misses": misses,
+    }
+
+
+def benchmark(folds: int = 5, rounds: int = 2000) -> dict:
+    """
+    Cross-validated accuracy against the keyword router, plus prediction latency.
+
+    Returns:
+        Dict with model and keyword accuracy and microseconds per prediction
+    """
+    from intent_router import REQUEST_ROUTER
+
+    texts, labels = load_training_data()
+    order = np.random.default_rng(0).permutation(len(texts))
+    model_hits = keyword_hits = fallback_hits = 0
+    for fold in range(folds):
+        test = set(order[fold::folds].tolist())
+        model = IntentClassifier().fit([t for i, t in enumerate(texts) if i not in test],
+                                       [l for i, l in enumerate(labels) if i not in test])
+        for i in test:
+            intent, _ = model.predict(texts[i])
+            keyword = REQUEST_ROUTER.classify(texts[i])
+            model_hits += intent == labels[i]
+            keyword_hits += keyword == labels[i]
+            fallback_hits += model.route(texts[i], keyword)[0] == labels[i]
+
+    start = time.perf_counter()
+    model = IntentClassifier.from_file()
+    train_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    for i in range(rounds):
+        model.predict(texts[i % len(texts)])
+    predict_us = (time.perf_counter() - start) / rounds * 1e6
+
+    total = len(texts)
+    results = {
+        "model_accuracy": model_hits / total,
+        "keyword_accuracy": keyword_hits / total,
+        "routed_accuracy": fallback_hits / total,
+        "train_ms": train_ms,
+        "predict_us": predict_us,
+    }
+    print(f"Intent classifier, {folds}-fold over {total} utterances:")
+    print(f"   keyword router:         {results['keyword_accuracy']:.1%}")
+    print(f"   classifier:             {results['model_accuracy']:.1%}")
+    print(f"   classifier + fallback:  {results['routed_accuracy']:.1%} "
+          f"(threshold {CONFIDENCE_THRESHOLD}, keyword agreement {KEYWORD_AGREEMENT})")
+    print(f"   training: {train_ms:.0f} ms, prediction: {predict_us:.0f} us")
+
+    held_out = evaluate_held_out(model)
+    results["held_out"] = held_out
+    print(f"Held-out utterances ({os.path.basename(HELD_OUT_FILE)}):")
+    print(f"   keyword router:         {held_out['keyword_accuracy']:.1%}")
+    print(f"   classifier:             {held_out['model_accuracy']:.1%}")
+    print(f"   classifier + fallback:  {held_out['routed_accuracy']:.1%}")
+    for text, label, routed in held_out["misses"]:
+        print(f"   miss: {text!r} -> {routed} (expected {label})")
+    return results
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,209 @@
+"""
+A.R.I.S.E. AI - Intent Router
+
+Keyword routing for requests, exit phrases and wake words.
+All keywords of a router compile into one regex with word boundaries, built once,
+so a single pass over the input finds the intent and the matched span.
+Word boundaries stop "start" firing inside "restart", "temp" inside "attempt"
+and "end" inside "weekend"; a short inflection suffix keeps "stocks", "raining"
+and "opened" matching like the old substring scans did.
+"""
+
+import re
+import time
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+# Suffixes a keyword may carry and still count as that keyword
+INFLECTION = r"(?:s|es|d|ed|ing)?"
+
+# Intents in priority order - when several match, the earliest entry wins
+REQUEST_INTENTS = [
+    ('voice_enroll', [
+        'enroll my voice', 'setup voice', 'voice enrollment', 'enroll voice',
+        'setup voice recognition', 'voice setup', 'register my voice',
+        'add my voice', 'learn my voice', 'voice training'
+    ]),
+    ('standby', [
+        'go to standby', 'standby mode', 'go to sleep', 'sleep mode',
+        'stand by', 'enter standby', 'go standby', 'sleep now'
+    ]),
+    ('memory_delete', [
+        'delete memory', 'remove memory', 'clear memory', 'forget everything', 'wipe everything',
+        'erase memory', 'wipe memory', 'reset memory', 'delete sessions',
+        'clear sessions', 'forget all', 'delete all memory', 'delete my memory',
+        'clear the memory', 'remove all memory', 'wipe all memory',
+        'delete all sessions', 'remove all sessions', 'clear all sessions'
+    ]),
+    ('memory_recall', [
+        'what did i say about', 'what did i tell you about', 'what did i say',
+        'when did i mention', 'when did i say', 'did i say anything about',
+        'do you remember what i said', 'remind me what i said',
+        'search my conversations', 'search our conversations', 'search my memory'
+    ]),
+    ('data', [
+        'weather', 'temperature', 'temp', 'hot', 'cold', 'rain', 'sunny', 'climate',
+        'news', 'headlines', 'latest', 'happening', 'current events',
+        'stock', 'share', 'price', 'trading', 'market', 'nasdaq', 'dow', 'nifty'
+    ]),
+    ('automation', [
+        'open', 'launch', 'start', 'run', 'execute', 'close',
+        'visit', 'go to', 'browse', 'navigate',
+        'play', 'watch', 'listen to', 'put on', 'show me'
+    ]),
+]
+
+EXIT_PHRASES = ['bye', 'goodbye', 'exit', 'quit', 'stop', 'end', 'see you later']
+
+WAKE_PHRASES = [
+    'hey arise', 'hey a.r.i.s.e', 'hey a r i s e',
+    'arise wake up', 'wake up arise', 'arise',
+    'hey arize', 'hey a rise', 'wake arise',
+    'a.r.i.s.e', 'arrise', 'a rise', 'arize'
+]
+
+
+class IntentMatch(NamedTuple):
+    """Winning intent with the keyword that triggered it and its span in the input."""
+    intent: str
+    keyword: str
+    span: Tuple[int, int]
+
+
+class IntentRouter:
+    """
+    Priority keyword router compiled into a single regex.
+    Time: one regex pass over the input per call; O(k) compile once at construction
+    Space: O(k) compiled pattern for k keywords
+    """
+
+    def __init__(self, intents: Sequence[Tuple[str, Sequence[str]]], default: Optional[str] = None):
+        """
+        Args:
+            intents: (intent, keywords) pairs in priority order
+            default: Intent returned by classify() when nothing matches
+        """
+        self.intents = [intent for intent, _ in intents]
+        self.default = default
+
+        branches = []
+        for priority, (_, keywords) in enumerate(intents):
+            # Longest first so "go to standby" is preferred over "go to" at the same spot
+            alternatives = "|".join(self._keyword_pattern(keyword)
+                                    for keyword in sorted(keywords, key=len, reverse=True))
+            branches.append(f"(?P<i{priority}>{alternatives})")
+
+        # Branches are tried in priority order at each position; no keyword of a
+        # higher-priority intent starts inside a lower-priority one, so the
+        # non-overlapping scan still sees every candidate. Inputs are lowercased
+        # up front, which is much cheaper than re.IGNORECASE on a large alternation.
+        self.pattern = re.compile(rf"\b(?:{'|'.join(branches)}){INFLECTION}\b")
+
+    @staticmethod
+    def _keyword_pattern(keyword: str) -> str:
+        """Escape a keyword and let its words be separated by any whitespace."""
+        return r"\s+".join(re.escape(word) for word in keyword.lower().split())
+
+    def match(self, text: str) -> Optional[IntentMatch]:
+        """
+        Find the highest-priority keyword in the text.
+
+        Returns:
+            IntentMatch, or None if no keyword occurs as a word
+        """
+        best_priority = len(self.intents)
+        best = None
+        for found in self.pattern.finditer(text.lower()):
+            group = found.lastgroup
+            priority = int(group[1:])
+            if priority < best_priority:
+                best_priority = priority
+                best = IntentMatch(self.intents[priority], found.group(group), found.span(group))
+                if priority == 0:
+                    break  # Nothing can outrank the first intent
+        return best
+
+    def classify(self, text: str) -> Optional[str]:
+        """Intent name for the text, or the default when nothing matches."""
+        found = self.match(text)
+        return found.intent if found else self.default
+
+    def matches(self, text: str) -> bool:
+        """True if any keyword occurs in the text."""
+        return self.pattern.search(text.lower()) is not None
+
+
+# Built once at import - classification never recompiles
+REQUEST_ROUTER = IntentRouter(REQUEST_INTENTS, default='chat')
+EXIT_ROUTER = IntentRouter([('exit', EXIT_PHRASES)])
+WAKE_ROUTER = IntentRouter([('wake', WAKE_PHRASES)])
+
+
+def _legacy_classify(text: str) -> str:
+    """The previous substring scan, kept for the benchmark comparison."""
+    text_lower = text.lower()
+    for intent, keywords in REQUEST_INTENTS:
+        if any(keyword in text_lower for keyword in keywords):
+            return intent
+    return 'chat'
+
+
+def _build_corpus(size: int) -> List[str]:
+    """Synthetic utterances mixing keyword requests, look-alikes and plain chat."""
+    templates = [
+        "what's the weather like in {city} today",
+        "how are the {ticker} stocks doing",
+        "open {app} for me please",
+        "can you play some music on {app}",
+        "please restart the conversation about {topic}",
+        "I made an attempt at {topic} yesterday",
+        "my friend recommended {topic} last weekend",
+        "tell me something interesting about {topic}",
+        "go to standby for a while",
+        "clear all sessions and forget everything",
+        "enroll my voice again",
+        "is it raining in {city} right now",
+        "what are the latest headlines about {topic}",
+        "I was wondering whether {topic} is worth learning",
+    ]
+    fillers = {
+        "city": ["London", "Mumbai", "New York", "Tokyo"],
+        "ticker": ["Apple", "Tesla", "Nifty", "Reliance"],
+        "app": ["Spotify", "Chrome", "Notepad", "YouTube"],
+        "topic": ["black holes", "cooking pasta", "quantum computing", "chess openings"],
+    }
+    corpus = []
+    for i in range(size):
+        template = templates[i % len(templates)]
+        corpus.append(template.format(**{key: values[i % len(values)] for key, values in fillers.items()}))
+    return corpus
+
+
+def benchmark(size: int = 20000) -> dict:
+    """
+    Time the compiled router against the old substring scans over a corpus.
+
+    Returns:
+        Dict with microseconds per utterance for both and the disagreement count
+    """
+    corpus = _build_corpus(size)
+
+    start = time.perf_counter()
+    legacy = [_legacy_classify(text) for text in corpus]
+    legacy_us = (time.perf_counter() - start) / size * 1e6
+
+    start = time.perf_counter()
+    routed = [REQUEST_ROUTER.classify(text) for text in corpus]
+    router_us = (time.perf_counter() - start) / size * 1e6
+
+    changed = sorted({(text, old, new) for text, old, new in zip(corpus, legacy, routed) if old != new})
+    print(f"Intent routing over {size} utterances:")
+    print(f"   substring scans: {legacy_us:.2f} us/utterance")
+    print(f"   compiled router: {router_us:.2f} us/utterance")
+    print(f"   {len(changed)} distinct utterances routed differently:")
+    for text, old, new in changed:
+        print(f"      '{text}': {old} -> {new}")
+    return {"legacy_us": legacy_us, "router_us": router_us, "changed": len(changed)}
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,186 @@
+"""
+A.R.I.S.E. AI - Semantic Memory Index
+
+Hashed TF-IDF vectors for past messages in a fixed-size NumPy matrix, so the chat
+context can carry the few earlier snippets that relate to what the user just said
+instead of every fact and a fixed tail of the conversation. Words and word bigrams
+are hashed into DIM buckets (no vocabulary to store or grow); document rows hold
+log-scaled, L2-normalized term frequencies and queries are weighted by IDF from
+document frequencies kept up to date as rows are added and evicted.
+"""
+
+import re
+import threading
+import time
+import zlib
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from session_store import STOPWORDS
+
+DIM = 1024                 # Hash buckets per vector
+MAX_DOCUMENTS = 10000      # Rows kept; the oldest message is evicted first (~40 MB at DIM 1024)
+INITIAL_ROWS = 256         # Rows allocated up front; storage doubles as messages arrive
+MIN_SCORE = 0.2            # Cosine similarity below this is treated as unrelated
+
+_WORD = re.compile(r"[a-z0-9]{2,}")  # "sister's" -> "sister"
+
+
+class MemoryIndex:
+    """
+    Ring buffer of hashed TF-IDF message vectors with brute-force cosine search.
+    Time: O(L) to add a message of L words, O(N*D) matrix-vector product per search
+    Space: O(N*D) float32 for N indexed rows (at most max_documents) of D = dim buckets
+    """
+
+    def __init__(self, dim: int = DIM, max_documents: int = MAX_DOCUMENTS):
+        self.dim = dim
+        self.max_documents = max_documents
+        self._df = np.zeros(dim, dtype=np.int64)
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        """Drop every row and shrink storage back to INITIAL_ROWS. Caller holds the lock (or owns the index)."""
+        rows = min(INITIAL_ROWS, self.max_documents)
+        self._vectors = np.zeros((rows, self.dim), dtype=np.float32)
+        self._times = np.full(rows, np.inf)
+        self._buckets: List[Optional[np.ndarray]] = [None] * rows
+        self._meta: List[Optional[Dict[str, Any]]] = [None] * rows
+        self._df[:] = 0
+        self._count = 0
+        self._next = 0
+
+    def _grow(self) -> None:
+        """Double row storage, up to max_documents. Caller holds the lock."""
+        rows = len(self._times)
+        extra = min(rows, self.max_documents - rows)
+        self._vectors = np.vstack([self._vectors, np.zeros((extra, self.dim), dtype=np.float32)])
+        self._times = np.concatenate([self._times, np.full(extra, np.inf)])
+        self._buckets.extend([None] * extra)
+        self._meta.extend([None] * extra)
+
+    def _terms(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Unique hash buckets of a text's words and bigrams, with log-scaled counts."""
+        words = [word for word in _WORD.findall(text.lower()) if word not in STOPWORDS]
+        grams = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+        if not grams:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        hashed = np.fromiter((zlib.crc32(gram.encode()) % self.dim for gram in grams),
+                             dtype=np.int64, count=len(grams))
+        buckets, counts = np.unique(hashed, return_counts=True)
+        return buckets, (1.0 + np.log(counts)).astype(np.float32)
+
+    def add(self, text: str, timestamp: Optional[float] = None, **meta) -> None:
+        """Index one message; meta (role, session_id, ...) comes back with search hits."""
+        buckets, weights = self._terms(text)
+        if not buckets.size:
+            return
+        weights /= np.linalg.norm(weights)
+        with self._lock:
+            row = self._next
+            if row == len(self._times):
+                self._grow()
+            if self._buckets[row] is not None:
+                self._df[self._buckets[row]] -= 1  # Evict the oldest message
+                self._vectors[row] = 0.0
+            else:
+                self._count += 1
+            self._vectors[row, buckets] = weights
+            self._times[row] = time.time() if timestamp is None else timestamp
+            self._buckets[row] = buckets
+            self._meta[row] = {"text": text, "timestamp": self._times[row], **meta}
+            self._df[buckets] += 1
+            self._next = (row + 1) % self.max_documents
+
+    def _query(self, text: str, indexed_only: bool = True) -> Optional[np.ndarray]:
+        """IDF-weighted, normalized query vector, or None if nothing in it is usable. Caller holds the lock."""
+        buckets, weights = self._terms(text)
+        if indexed_only:
+            # Words no indexed message contains can't match anything; leaving them out keeps
+            # scores comparable against MIN_SCORE however much of the query is new
+            known = self._df[buckets] > 0
+            buckets, weights = buckets[known], weights[known]
+        if not buckets.size:
+            return None
+        idf = np.log((1 + self._count) / (1 + self._df[buckets])) + 1.0
+        query = np.zeros(self.dim, dtype=np.float32)
+        query[buckets] = weights * idf
+        return query / np.linalg.norm(query)
+
+    def search(self, text: str, k: int = 4, before: Optional[float] = None,
+               min_score: float = MIN_SCORE) -> List[Tuple[float, Dict[str, Any]]]:
+        """
+        Most similar indexed messages.
+
+        Args:
+            text: Query (usually the user's latest input)
+            k: Maximum hits
+            before: Only messages older than this timestamp (skip what's already in context)
+            min_score: Drop weaker matches
+
+        Returns:
+            (score, meta) pairs, best first; meta includes text and timestamp
+        """
+        with self._lock:
+            query = self._query(text)
+            if query is None or not self._count:
+                return []
+            # Rows fill in order until the buffer wraps, so the first _count rows are the live ones
+            scores = self._vectors[:self._count] @ query
+            if before is not None:
+                scores[self._times[:self._count] >= before] = -1.0
+            top = np.argpartition(-scores, min(k, len(scores) - 1))[:k]
+            return [(float(scores[row]), dict(self._meta[row]))
+                    for row in top[np.argsort(-scores[top])] if scores[row] >= min_score]
+
+    def rank(self, text: str, candidates: Sequence[str]) -> List[float]:
+        """Similarity of a query to each of a few ad-hoc texts (e.g. facts), using the index's IDF."""
+        with self._lock:
+            query = self._query(text, indexed_only=False)
+        if query is None:
+            return [0.0] * len(candidates)
+        scores = []
+        for candidate in candidates:
+            buckets, weights = self._terms(candidate)
+            scores.append(float(query[buckets] @ weights / np.linalg.norm(weights)) if buckets.size else 0.0)
+        return scores
+
+    def clear(self) -> None:
+        with self._lock:
+            self._reset()
+
+    def __len__(self) -> int:
+        return self._count
+
+
+def benchmark(history: int = MAX_DOCUMENTS, rounds: int = 200) -> dict:
+    """Index a long synthetic history, then time retrieval and check it finds a planted memory."""
+    import random
+
+    rng = random.Random(0)
+    topics = ("weather coffee project deadline python guitar lesson doctor appointment trip paris budget movie "
+              "dinner recipe running marathon book meeting birthday gift garden tomatoes car insurance "
+              "laptop battery football match concert tickets").split()
+    index = MemoryIndex()
+
+    start = time.perf_counter()
+    for i in range(history):
+        index.add(" ".join(rng.choice(topics) for _ in range(10)), timestamp=float(i), role="user")
+    index.add("my sister Priya is getting married in june", timestamp=float(history), role="user")
+    add_us = (time.perf_counter() - start) / (history + 1) * 1e6
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        hits = index.search("when is my sister's wedding, is Priya married yet")
+    search_ms = (time.perf_counter() - start) / rounds * 1000
+
+    print(f"Memory index over {len(index)} messages (dim {index.dim}):")
+    print(f"   add: {add_us:.1f} us/message, search: {search_ms:.2f} ms")
+    print(f"   top hit: {hits[0][1]['text']!r} (score {hits[0][0]:.2f})" if hits else "   no hit")
+    return {"add_us": add_us, "search_ms": search_ms, "found": bool(hits) and "Priya" in hits[0][1]["text"]}
+
+
+if __name__ == "__main__":
+    benchmark()
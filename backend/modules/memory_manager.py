@@ -1,66 +1,141 @@
 # Explanation: JSON-based memory system with session buffer and long-term facts storage
+# Every message is also appended to a JSONL journal (data/sessions/journal) as it arrives, so a crash
+# loses at most the unflushed tail; journals are compacted into session_<epoch>.json off the exit path
+# Facts live in memory; facts.json is re-read only when its mtime changes and written back in
+# debounced, coalesced, atomic (temp file + rename) flushes
+# Saved sessions are indexed in data/sessions.db (SQLite FTS5) for search and maintained counts
+# Messages are also kept in an in-memory TF-IDF vector index for relevance-ranked recall
 # Assumptions: data/ directory will be created if missing, JSON serializable messages only
 # Files to create: backend/modules/memory_manager.py
 # Run commands: python -c "from modules.memory_manager import MemoryManager; mm = MemoryManager(); mm.add_message('user', 'test')"
 
 import json
 import os
+import threading
 import time
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 
+from memory_index import MemoryIndex
+from session_store import SessionStore
+
+# How hard each journaled message is pushed to disk:
+#   "none"  - Python's buffer, written on rollover/save (fastest, a crash loses the buffer)
+#   "flush" - handed to the OS per message (survives a process crash)
+#   "fsync" - forced to the device per message (survives power loss)
+JOURNAL_SYNC_MODES = ("none", "flush", "fsync")
+SEGMENT_MAX_MESSAGES = 200  # Messages per journal segment before rolling over to a new file
+
+FACTS_WRITE_DELAY = 0.5      # Seconds update_facts waits so a burst of updates becomes one write
+FACTS_CHECK_INTERVAL = 1.0   # Seconds between mtime checks for edits made outside A.R.I.S.E.
+
 class MemoryManager:
     """
     Two-layer memory system: session buffer + long-term facts.
-    Time: O(1) for add_message, O(n) for save/load operations
+    Time: O(1) for add_message (one journal line), O(1) for save_session (compaction runs
+          in the background), O(1) for fact lookups, O(n) for load operations
     Space: O(n) where n is buffer size + facts size
     """
     
-    def __init__(self, data_dir: str = "data"):
+    def __init__(self, data_dir: str = "data", journal_sync: str = "flush",
+                 segment_max_messages: int = SEGMENT_MAX_MESSAGES):
+        """
+        Args:
+            data_dir: Root for facts.json and sessions/
+            journal_sync: One of JOURNAL_SYNC_MODES
+            segment_max_messages: Journal segment size before rollover
+        """
+        if journal_sync not in JOURNAL_SYNC_MODES:
+            raise ValueError(f"journal_sync must be one of {JOURNAL_SYNC_MODES}, got {journal_sync!r}")
+        
         self.data_dir = Path(data_dir)
         self.sessions_dir = self.data_dir / "sessions"
+        self.journal_dir = self.sessions_dir / "journal"
         self.facts_file = self.data_dir / "facts.json"
+        self.store = SessionStore(self.data_dir / "sessions.db")
+        self.index = MemoryIndex()
         self.session_buffer: List[Dict[str, Any]] = []
         
+        self.journal_sync = journal_sync
+        self.segment_max_messages = segment_max_messages
+        self._journal = None  # Open segment file of the current session
+        self._journal_session: Optional[str] = None
+        self._journal_segment = 0
+        self._segment_messages = 0
+        self._journal_lock = threading.Lock()
+        self._compactions: List[threading.Thread] = []
+        
+        # In-memory facts; _pending_facts are updates not yet written to facts.json
+        self._facts: Dict[str, Any] = {}
+        self._facts_mtime: Optional[int] = None
+        self._facts_checked = 0.0
+        self._pending_facts: Dict[str, Any] = {}
+        self._facts_timer: Optional[threading.Timer] = None
+        self._facts_lock = threading.RLock()
+        
         # Create directories if they don't exist
-        self.sessions_dir.mkdir(parents=True, exist_ok=True)
+        self.journal_dir.mkdir(parents=True, exist_ok=True)
         
         # Initialize facts.json if it doesn't exist
         if not self.facts_file.exists():
             self._write_json(self.facts_file, {})
+        self._reload_facts()
+        
+        # Journals left behind by a crash become ordinary sessions (listed now, before this run writes any)
+        orphaned = sorted({path.name.split('.')[0] for path in self.journal_dir.glob("session_*.jsonl")})
+        if orphaned:
+            self._start_compaction(self._recover_journals, orphaned)
+        
+        # Index session files saved before the store existed (or copied in by hand), then
+        # load the newest saved messages into the vector index
+        self._start_compaction(self._load_history)
     
     def add_message(self, role: str, content: str) -> None:
-        """Add message to session buffer. O(1) operation."""
-        self.session_buffer.append({
+        """Add message to session buffer and append it to the journal. O(1) operation."""
+        message = {
             "role": role,
             "content": content,
             "timestamp": time.time()
-        })
+        }
+        with self._journal_lock:
+            self.session_buffer.append(message)
+            try:
+                self._append_journal(message)
+            except Exception as e:
+                print(f"Error writing session journal: {e}")
+        self.index.add(content, message["timestamp"], role=role)
     
     def save_session(self) -> str:
-        """Save buffer to sessions file, clear buffer. Returns session_id."""
-        if not self.session_buffer:
-            return ""
+        """
+        End the current session and clear the buffer. Returns session_id.
         
-        session_id = f"session_{int(time.time())}"
-        session_file = self.sessions_dir / f"{session_id}.json"
-        
-        try:
+        The messages are already on disk in the journal; writing the session
+        file and removing the journal happen on a background thread.
+        """
+        with self._journal_lock:
+            if not self.session_buffer:
+                return ""
+            
+            session_id = self._journal_session or self._new_session_id()
             session_data = {
                 "session_id": session_id,
                 "created_at": time.time(),
                 "messages": self.session_buffer.copy()
             }
-            self._write_json(session_file, session_data)
             self.session_buffer.clear()
-            print(f"Session saved: {session_id}")
-            return session_id
-        except Exception as e:
-            print(f"Error saving session: {e}")
-            return ""
+            try:
+                self._close_segment()
+            except Exception as e:
+                print(f"Error closing session journal: {e}")
+            self._journal_session = None
+            self._journal_segment = 0
+        
+        self._start_compaction(self._compact, session_data)
+        print(f"Session saved: {session_id}")
+        return session_id
     
     def load_session(self, session_id: str) -> Optional[Dict[str, Any]]:
-        """Load session from sessions folder. O(1) file operation."""
+        """Load session from sessions folder, or from its journal if not compacted yet. O(1) file operation."""
         session_file = self.sessions_dir / f"{session_id}.json"
         
         try:
@@ -68,34 +143,229 @@ class MemoryManager:
                 session_data = self._read_json(session_file)
                 print(f"Session loaded: {session_id}")
                 return session_data
+            messages = self._read_journal(session_id)
+            if messages:
+                print(f"Session loaded from journal: {session_id}")
+                return {"session_id": session_id, "created_at": messages[-1]["timestamp"], "messages": messages}
             return None
         except Exception as e:
             print(f"Error loading session: {e}")
             return None
     
-    def update_facts(self, new_facts: Dict[str, Any]) -> None:
-        """Merge/update new facts into facts.json. O(n) where n is facts size."""
+    def recall(self, question: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """User messages answering "what did I say about X last week". See SessionStore.recall."""
+        return self.store.recall(question, limit=limit)
+    
+    def retrieve(self, query: str, k: int = 4, before: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Past messages most related to a query, best first.
+        
+        Args:
+            query: Usually the user's latest input
+            k: Maximum snippets
+            before: Only messages older than this (those after it are already in context)
+            
+        Returns:
+            Dicts with text, role, timestamp and score
+        """
+        return [{**meta, "score": score} for score, meta in self.index.search(query, k=k, before=before)]
+    
+    def relevant_facts(self, query: str, k: int) -> Dict[str, Any]:
+        """The k facts most related to a query (all of them if there are no more than k)."""
+        facts = self.load_facts()
+        if len(facts) <= k:
+            return facts
+        scores = self.index.rank(query, [f"{key} {value}" for key, value in facts.items()])
+        ranked = sorted(zip(scores, facts.items()), key=lambda item: -item[0])[:k]
+        return {key: value for score, (key, value) in ranked if score > 0}
+    
+    def close(self) -> None:
+        """
+        Write pending facts, close the open journal segment (the session stays open for
+        recovery) and wait for background compactions, which would die with the process.
+        """
+        self.flush_facts()
+        with self._journal_lock:
+            self._close_segment()
+        self._wait_for_compactions()
+    
+    def _new_session_id(self) -> str:
+        """session_<epoch>, bumped past any ID already on disk."""
+        stamp = int(time.time())
+        while ((self.sessions_dir / f"session_{stamp}.json").exists()
+               or any(self.journal_dir.glob(f"session_{stamp}.*.jsonl"))):
+            stamp += 1
+        return f"session_{stamp}"
+    
+    def _append_journal(self, message: Dict[str, Any]) -> None:
+        """Write one message as a JSONL line, rolling over full segments. Caller holds the lock."""
+        if self._journal is None:
+            if self._journal_session is None:
+                self._journal_session = self._new_session_id()
+            segment_file = self.journal_dir / f"{self._journal_session}.{self._journal_segment:04d}.jsonl"
+            self._journal = open(segment_file, 'a', encoding='utf-8')
+            self._journal_segment += 1
+            self._segment_messages = 0
+        
+        self._journal.write(json.dumps(message, ensure_ascii=False) + "\n")
+        self._segment_messages += 1
+        if self.journal_sync != "none":
+            self._journal.flush()
+        if self.journal_sync == "fsync":
+            os.fsync(self._journal.fileno())
+        
+        if self._segment_messages >= self.segment_max_messages:
+            self._close_segment()
+    
+    def _close_segment(self) -> None:
+        """Flush, sync and close the open segment. Caller holds the lock."""
+        if self._journal is None:
+            return
+        journal, self._journal = self._journal, None
         try:
-            current_facts = self.load_facts()
-            current_facts.update(new_facts)
-            self._write_json(self.facts_file, current_facts)
-            print("Facts updated")
-        except Exception as e:
-            print(f"Error updating facts: {e}")
+            journal.flush()
+            if self.journal_sync != "none":
+                os.fsync(journal.fileno())
+        finally:
+            journal.close()
     
-    def load_facts(self) -> Dict[str, Any]:
-        """Return current facts as dict. O(1) file operation."""
+    def _journal_segments(self, session_id: str) -> List[Path]:
+        return sorted(self.journal_dir.glob(f"{session_id}.*.jsonl"))
+    
+    def _read_journal(self, session_id: str) -> List[Dict[str, Any]]:
+        """Messages from a session's segments in order; a torn last line from a crash is skipped."""
+        messages = []
+        for segment_file in self._journal_segments(session_id):
+            with open(segment_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        messages.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        break
+        return messages
+    
+    def _start_compaction(self, target, *args) -> None:
+        thread = threading.Thread(target=target, args=args, name="arise-session-compact", daemon=True)
+        self._compactions = [t for t in self._compactions if t.is_alive()] + [thread]
+        thread.start()
+    
+    def _wait_for_compactions(self, timeout: float = 5.0) -> None:
+        for thread in self._compactions:
+            thread.join(timeout)
+    
+    def _compact(self, session_data: Dict[str, Any]) -> None:
+        """Write one session file atomically, index it, then drop its journal segments."""
+        session_id = session_data["session_id"]
         try:
-            return self._read_json(self.facts_file)
+            self._write_json_atomic(self.sessions_dir / f"{session_id}.json", session_data)
+            self.store.ingest(session_data)
+            for segment_file in self._journal_segments(session_id):
+                segment_file.unlink()
         except Exception as e:
-            print(f"Error loading facts: {e}")
-            return {}
+            print(f"Error compacting session {session_id}: {e}")
+    
+    def _load_history(self) -> None:
+        """Backfill the session store, then fill the vector index from it (runs in the background)."""
+        self.store.sync(self.sessions_dir)
+        with self._journal_lock:
+            live = len(self.session_buffer)  # Already indexed by add_message
+        for message in self.store.recent_messages(self.index.max_documents - live):
+            self.index.add(message["content"], message["timestamp"], role=message["role"],
+                           session_id=message["session_id"])
+    
+    def _recover_journals(self, session_ids: List[str]) -> None:
+        """Compact journaled sessions that never reached save_session."""
+        for session_id in session_ids:
+            if (self.sessions_dir / f"{session_id}.json").exists():
+                # Compacted before the crash; only the cleanup was lost
+                for segment_file in self._journal_segments(session_id):
+                    segment_file.unlink()
+                continue
+            messages = self._read_journal(session_id)
+            if messages:
+                self._compact({"session_id": session_id, "created_at": messages[-1]["timestamp"],
+                               "messages": messages})
+                print(f"Recovered session from journal: {session_id}")
+    
+    def update_facts(self, new_facts: Dict[str, Any]) -> None:
+        """Merge new facts in memory; facts.json is written FACTS_WRITE_DELAY later. O(k) for k new facts."""
+        with self._facts_lock:
+            self._current_facts().update(new_facts)
+            self._pending_facts.update(new_facts)
+            if self._facts_timer is None:
+                self._facts_timer = threading.Timer(FACTS_WRITE_DELAY, self.flush_facts)
+                self._facts_timer.daemon = True
+                self._facts_timer.start()
+        print("Facts updated")
+    
+    def load_facts(self) -> Dict[str, Any]:
+        """Return a copy of the current facts. O(n) copy, no file I/O."""
+        with self._facts_lock:
+            return dict(self._current_facts())
+    
+    def get_fact(self, key: str, default: Any = None) -> Any:
+        """Return one fact. O(1), no file I/O."""
+        with self._facts_lock:
+            return self._current_facts().get(key, default)
+    
+    def flush_facts(self) -> None:
+        """Write pending fact updates to facts.json now (atomic temp file + rename)."""
+        with self._facts_lock:
+            if self._facts_timer is not None:
+                self._facts_timer.cancel()
+                self._facts_timer = None
+            if not self._pending_facts:
+                return
+            try:
+                self._write_json_atomic(self.facts_file, self._facts)
+                self._facts_mtime = os.stat(self.facts_file).st_mtime_ns
+                self._pending_facts.clear()
+            except Exception as e:
+                print(f"Error updating facts: {e}")
+    
+    def _current_facts(self) -> Dict[str, Any]:
+        """The in-memory facts, reloaded if facts.json was edited externally. Caller holds the lock."""
+        now = time.monotonic()
+        if now - self._facts_checked >= FACTS_CHECK_INTERVAL:
+            self._facts_checked = now
+            try:
+                mtime = os.stat(self.facts_file).st_mtime_ns
+            except FileNotFoundError:
+                mtime = None
+            if mtime != self._facts_mtime:
+                self._reload_facts()
+        return self._facts
+    
+    def _reload_facts(self) -> None:
+        """Read facts.json and reapply updates that haven't been written yet."""
+        with self._facts_lock:
+            try:
+                mtime = os.stat(self.facts_file).st_mtime_ns
+                facts = self._read_json(self.facts_file)
+            except FileNotFoundError:
+                mtime, facts = None, {}
+            except Exception as e:
+                # Keep what we have (e.g. a half-saved external edit); retry on the next change
+                print(f"Error loading facts: {e}")
+                return
+            facts.update(self._pending_facts)
+            self._facts = facts
+            self._facts_mtime = mtime
     
     def delete_all_sessions(self) -> bool:
         """Delete all session files and clear current session buffer. Returns True if successful."""
         try:
-            # Clear current session buffer
-            self.session_buffer.clear()
+            # Clear current session buffer and its journal
+            with self._journal_lock:
+                self.session_buffer.clear()
+                self._close_segment()
+                self._journal_session = None
+                self._journal_segment = 0
+            self._wait_for_compactions()
+            for segment_file in self.journal_dir.glob("session_*.jsonl"):
+                segment_file.unlink()
+            self.store.delete_all()
+            self.index.clear()
             
             # Delete all session files
             deleted_count = 0
@@ -123,13 +393,12 @@ class MemoryManager:
                 "stored_facts": 0
             }
             
-            # Count saved session files
-            if self.sessions_dir.exists():
-                stats["saved_sessions"] = len(list(self.sessions_dir.glob("session_*.json")))
+            # Count saved sessions (maintained by the store, no directory scan)
+            stats["saved_sessions"] = self.store.count_sessions()
             
             # Count stored facts
-            facts = self.load_facts()
-            stats["stored_facts"] = len(facts)
+            with self._facts_lock:
+                stats["stored_facts"] = len(self._current_facts())
             
             return stats
             
@@ -145,4 +414,98 @@ class MemoryManager:
     def _write_json(self, file_path: Path, data: Dict[str, Any]) -> None:
         """Write JSON file safely with proper formatting."""
         with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
\ No newline at end of file
+            json.dump(data, f, indent=2, ensure_ascii=False)
+    
+    def _write_json_atomic(self, file_path: Path, data: Dict[str, Any]) -> None:
+        """Write JSON to a temp file and rename it over the target, so readers never see half a file."""
+        tmp_path = file_path.with_name(file_path.name + ".tmp")
+        self._write_json(tmp_path, data)
+        os.replace(tmp_path, file_path)
+
+
+def journal_benchmark(messages: int = 2000):
+    """Per-message cost per sync mode and exit-path cost, against the old save-everything-at-exit."""
+    import tempfile
+    
+    content = "This is a typical conversational reply of moderate length. " * 3
+    print(f"Session journal, {messages} messages:")
+    with tempfile.TemporaryDirectory() as scratch:
+        buffer = [{"role": "user", "content": content, "timestamp": time.time()}] * messages
+        # Outside any MemoryManager's sessions dir, so no indexer reads the half-written file
+        start = time.perf_counter()
+        with open(os.path.join(scratch, "legacy_session.json"), 'w', encoding='utf-8') as f:
+            json.dump({"session_id": "session_0", "created_at": time.time(), "messages": buffer},
+                      f, indent=2, ensure_ascii=False)
+        print(f"   old exit-time dump:   {(time.perf_counter() - start) * 1000:8.1f} ms at shutdown")
+        
+        for mode in JOURNAL_SYNC_MODES:
+            memory = MemoryManager(os.path.join(scratch, mode), journal_sync=mode)
+            start = time.perf_counter()
+            for i in range(messages):
+                memory.add_message("user" if i % 2 else "assistant", content)
+            per_message_us = (time.perf_counter() - start) / messages * 1e6
+            start = time.perf_counter()
+            session_id = memory.save_session()
+            save_ms = (time.perf_counter() - start) * 1000
+            memory._wait_for_compactions()
+            saved = memory.load_session(session_id)
+            print(f"   journal {mode:>5}: {per_message_us:7.1f} us/message, save_session {save_ms:5.2f} ms, "
+                  f"{len(saved['messages'])} messages compacted")
+        
+        # A crash mid-session: the next start recovers the journal into a session file
+        crashed = MemoryManager(os.path.join(scratch, "crash"))
+        for i in range(10):
+            crashed.add_message("user", f"message {i}")
+        crashed._journal.write('{"role": "user", "cont')  # Torn write
+        crashed._journal.flush()
+        crashed._journal.close()
+        recovered = MemoryManager(os.path.join(scratch, "crash"))
+        recovered._wait_for_compactions()
+        session_files = list(recovered.sessions_dir.glob("session_*.json"))
+        print(f"   crash recovery: {len(recovered._read_journal(crashed._journal_session))} journal messages left, "
+              f"{len(recovered._read_json(session_files[0])['messages'])} recovered into {session_files[0].name}")
+
+
+def facts_benchmark(lookups: int = 20000):
+    """Per-turn facts access and a burst of updates, against re-reading facts.json each time."""
+    import tempfile
+    
+    print(f"Facts access, {lookups} lookups:")
+    with tempfile.TemporaryDirectory() as scratch:
+        memory = MemoryManager(scratch)
+        memory.update_facts({f"fact_{i}": f"value {i}" for i in range(20)})
+        memory.update_facts({"location": "London"})
+        memory.flush_facts()
+        
+        start = time.perf_counter()
+        for _ in range(lookups):
+            memory._read_json(memory.facts_file).get('location')
+        print(f"   re-read facts.json:  {(time.perf_counter() - start) / lookups * 1e6:7.2f} us/lookup")
+        
+        start = time.perf_counter()
+        for _ in range(lookups):
+            memory.get_fact('location')
+        print(f"   get_fact:            {(time.perf_counter() - start) / lookups * 1e6:7.2f} us/lookup")
+        
+        start = time.perf_counter()
+        for _ in range(lookups):
+            memory.load_facts()
+        print(f"   load_facts (copy):   {(time.perf_counter() - start) / lookups * 1e6:7.2f} us/lookup")
+        
+        writes = [0]
+        write_json = memory._write_json
+        memory._write_json = lambda *args: (writes.__setitem__(0, writes[0] + 1), write_json(*args))
+        for i in range(50):
+            memory.update_facts({"mood": f"mood {i}"})
+        time.sleep(FACTS_WRITE_DELAY + 0.2)
+        print(f"   50 updates in a burst -> {writes[0]} file write(s)")
+        
+        # An edit made outside A.R.I.S.E. is picked up after the next mtime check
+        memory._write_json_atomic(memory.facts_file, {"location": "Paris"})
+        time.sleep(FACTS_CHECK_INTERVAL)
+        print(f"   external edit seen:  location={memory.get_fact('location')}")
+
+
+if __name__ == "__main__":
+    journal_benchmark()
+    facts_benchmark()
@@ -0,0 +1,273 @@
+"""
+A.R.I.S.E. AI - Async Orchestrator
+
+Non-blocking conversation loop for ARISEMain built on asyncio.
+Capture, recognition, verification, dispatch and speech run as separate
+tasks connected by bounded queues, so the microphone keeps listening
+while the current request is processed or spoken (including barge-in).
+Existing blocking engines run on a thread pool executor.
+"""
+
+import asyncio
+import re
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+# Short capture window so exclusive flows (enrollment, standby) never wait long for the mic
+CAPTURE_TIMEOUT = 5
+QUEUE_SIZE = 2
+SPEECH_QUEUE_SIZE = 8
+
+# Intents that need the microphone to themselves and run with blocking speech
+EXCLUSIVE_INTENTS = {'voice_enroll', 'standby'}
+
+# Echo suppression for audio captured while the assistant is speaking
+ECHO_HISTORY = 6              # Recently spoken texts a transcript is compared against
+ECHO_OVERLAP = 0.6            # Share of transcript words found in recent speech that marks an echo
+BARGE_IN_ENERGY_RATIO = 3.0   # Unverified barge-in must be this much louder than the ambient threshold
+BARGE_IN_MARGIN = 1.5         # ... and this much louder than the echo of our own playback heard so far
+
+_WORD = re.compile(r"[a-z0-9']+")
+
+
+def audio_rms(audio) -> float:
+    """RMS level of captured AudioData, in the units of Recognizer.energy_threshold."""
+    dtype = {1: np.uint8, 2: np.int16, 4: np.int32}.get(audio.sample_width, np.int16)
+    samples = np.frombuffer(audio.get_raw_data(), dtype=dtype).astype(np.float64)
+    return float(np.sqrt(np.mean(samples ** 2))) if samples.size else 0.0
+
+
+class AsyncOrchestrator:
+    """Pipelined capture -> recognize -> verify -> dispatch -> speak loop."""
+
+    def __init__(self, arise, barge_in: bool = True, queue_size: int = QUEUE_SIZE):
+        """
+        Args:
+            arise: Initialized ARISEMain instance that owns the engines
+            barge_in: Cut off current speech when the user starts talking
+            queue_size: Bound for the audio/text/request queues (backpressure)
+        """
+        self.arise = arise
+        self.barge_in = barge_in
+        self.queue_size = queue_size
+        self.executor = ThreadPoolExecutor(max_workers=6, thread_name_prefix="arise-io")
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.running = False
+        self._recent_speech = deque(maxlen=ECHO_HISTORY)  # Texts handed to TTS, newest last
+        self._playback_rms = 0.0  # Loudest echo of our own speech heard so far
+
+    async def _run_blocking(self, func: Callable, *args) -> Any:
+        """Run a blocking engine call on the executor."""
+        return await self.loop.run_in_executor(self.executor, func, *args)
+
+    def _submit_speech(self, text: str):
+        """Speech sink for ARISEMain._speak - callable from any thread."""
+        if threading.current_thread() is self._loop_thread:
+            self.speech_queue.put_nowait(text)
+        else:
+            # Blocks the producing worker when the speech queue is full (backpressure)
+            asyncio.run_coroutine_threadsafe(self.speech_queue.put(text), self.loop).result()
+
+    def _is_speaking(self) -> bool:
+        """True while TTS is playing or has speech queued."""
+        return self.arise.tts is not None and self.arise.tts.is_speaking()
+
+    async def _capture_loop(self):
+        """Keep the microphone listening, independent of processing and speech."""
+        while self.running:
+            await self.capture_enabled.wait()
+            speaking = self._is_speaking()
+            audio = await self._run_blocking(self.arise.stt.capture, CAPTURE_TIMEOUT, 10, True)
+            if audio is not None:
+                # Flag audio that overlapped playback; it may be our own voice from the speakers
+                await self.audio_queue.put((audio, speaking or self._is_speaking()))
+
+    def _is_echo(self, user_input: str) -> bool:
+        """True if most words of a transcript were just spoken by the assistant."""
+        words = _WORD.findall(user_input.lower())
+        if not words:
+            return False
+        spoken = set(_WORD.findall(" ".join(self._recent_speech).lower()))
+        return sum(word in spoken for word in words) / len(words) >= ECHO_OVERLAP
+
+    async def _accept_during_playback(self, audio, user_input: str, verification) -> bool:
+        """
+        Decide whether speech heard over playback is the user barging in.
+
+        Echo of recent speech is dropped. Otherwise the speaker must verify as an
+        enrolled user, or (with no one enrolled) be clearly louder than both the
+        ambient threshold and the echo level measured so far.
+        """
+        level = audio_rms(audio)
+        if self._is_echo(user_input):
+            self._playback_rms = max(self._playback_rms, level)
+            print(f"🔇 Ignored echo of my own speech: {user_input}")
+            return False
+
+        if verification is not None:
+            try:
+                is_recognized = (await asyncio.wrap_future(verification))[0]
+            except Exception as e:
+                print(f"❌ Barge-in verification error: {e}")
+                is_recognized = False
+            if not is_recognized:
+                print(f"🔇 Ignored unverified speech during playback: {user_input}")
+            return is_recognized
+
+        threshold = max(BARGE_IN_ENERGY_RATIO * self.arise.stt.recognizer.energy_threshold,
+                        BARGE_IN_MARGIN * self._playback_rms)
+        if level < threshold:
+            print(f"🔇 Ignored quiet speech during playback ({level:.0f} < {threshold:.0f}): {user_input}")
+            return False
+        return True
+
+    async def _recognize_loop(self):
+        """Turn captured audio into text; interrupt speech on barge-in."""
+        while self.running:
+            audio, during_playback = await self.audio_queue.get()
+            # Verification starts on the same audio while recognition is in flight
+            verification = self.arise._start_voice_check(audio)
+            user_input = await self._run_blocking(self.arise.stt.recognize, audio)
+            if not user_input:
+                if verification is not None:
+                    verification.cancel()
+                continue
+
+            if during_playback or self._is_speaking():
+                if not await self._accept_during_playback(audio, user_input, verification):
+                    if verification is not None:
+                        verification.cancel()
+                    continue
+
+            print(f"👤 You: {user_input}")
+            if self.barge_in and self._is_speaking():
+                self._cancel_speech()
+                print("✋ Barge-in - stopped speaking")
+
+            await self.text_queue.put((verification, user_input))
+
+    async def _verify_loop(self):
+        """Gate recognized requests on both recognition and speaker verification."""
+        while self.running:
+            verification, user_input = await self.text_queue.get()
+            self.arise.memory.add_message("user", user_input)
+
+            if await self._run_blocking(self.arise._passes_voice_check, user_input, verification):
+                # Carry the verified role with the request; the next turn may verify before this one runs
+                await self.request_queue.put((user_input, self.arise.speaker_role))
+
+    async def _dispatch_loop(self):
+        """Route requests to engines without waiting for their speech to finish."""
+        while self.running:
+            user_input, role = await self.request_queue.get()
+
+            if self.arise._should_exit(user_input):
+                response = "Goodbye! Have a great day!"
+                self.arise._speak(response)
+                self.arise.memory.add_message("assistant", response)
+                await self.speech_queue.join()
+                await self._run_blocking(self.arise.memory.save_session)
+                self.running = False
+                return
+
+            # Classified once here; the result travels with the request
+            intent = self.arise._classify_request(user_input)
+            if intent in EXCLUSIVE_INTENTS:
+                await self._run_exclusive(self.arise._process_request, user_input, role, intent)
+            elif intent == 'data' and self.arise.data is not None:
+                # Network fetch is awaited; no executor slot is held for the whole request
+                await self.arise._process_data_request_async(user_input, role)
+            else:
+                await self._run_blocking(self.arise._process_request, user_input, role, intent)
+
+    async def _run_exclusive(self, func: Callable, *args):
+        """Pause capture and speak synchronously for flows that own the mic."""
+        self.capture_enabled.clear()
+        await self.speech_queue.join()
+        if self.arise.tts is not None:
+            await self._run_blocking(self.arise.tts.wait_idle)
+
+        self.arise.speech_sink = None
+        try:
+            await self._run_blocking(func, *args)
+        finally:
+            self.arise.speech_sink = self._submit_speech
+            self.capture_enabled.set()
+
+    async def _speech_loop(self):
+        """Hand text to the TTS worker as soon as it is produced."""
+        while True:
+            text = await self.speech_queue.get()
+            self._recent_speech.append(text)
+            try:
+                utterance = self.arise.tts.say(text) if self.arise.tts is not None else None
+                if utterance is None:
+                    # No worker available - fall back to the blocking path with backup
+                    await self._run_blocking(self.arise._speak_blocking, text)
+                else:
+                    await self.played_queue.put(utterance)
+            finally:
+                self.speech_queue.task_done()
+
+    async def _report_loop(self):
+        """Print each reply once its audio has finished, in order."""
+        while True:
+            utterance = await self.played_queue.get()
+            try:
+                await self._run_blocking(utterance.wait)
+                self.arise._report_utterance(utterance)
+            finally:
+                self.played_queue.task_done()
+
+    def _cancel_speech(self):
+        """Drop speech that has not started and cut off the current utterance."""
+        while not self.speech_queue.empty():
+            self.speech_queue.get_nowait()
+            self.speech_queue.task_done()
+        self.arise.tts.interrupt()
+
+    async def run(self):
+        """Run all pipeline stages until the user exits."""
+        self.loop = asyncio.get_running_loop()
+        self._loop_thread = threading.current_thread()
+        self.running = True
+
+        self.audio_queue = asyncio.Queue(maxsize=self.queue_size)
+        self.text_queue = asyncio.Queue(maxsize=self.queue_size)
+        self.request_queue = asyncio.Queue(maxsize=self.queue_size)
+        self.speech_queue = asyncio.Queue(maxsize=SPEECH_QUEUE_SIZE)
+        self.played_queue = asyncio.Queue()
+        self.capture_enabled = asyncio.Event()
+        self.capture_enabled.set()
+
+        self.arise.speech_sink = self._submit_speech
+        print("\n🎤 Listening for your request... (async mode)")
+
+        stages = [
+            asyncio.create_task(self._capture_loop(), name="capture"),
+            asyncio.create_task(self._recognize_loop(), name="recognize"),
+            asyncio.create_task(self._verify_loop(), name="verify"),
+            asyncio.create_task(self._speech_loop(), name="speech"),
+            asyncio.create_task(self._report_loop(), name="report"),
+        ]
+        dispatch = asyncio.create_task(self._dispatch_loop(), name="dispatch")
+
+        try:
+            # A stage only finishes early if it crashed - surface that instead of hanging
+            done, _ = await asyncio.wait([dispatch, *stages], return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task is not dispatch:
+                    raise RuntimeError(f"{task.get_name()} stage stopped: {task.exception()!r}")
+            dispatch.result()
+            await self.played_queue.join()
+        finally:
+            self.running = False
+            self.arise.speech_sink = None
+            for task in [dispatch, *stages]:
+                task.cancel()
+            await asyncio.gather(dispatch, *stages, return_exceptions=True)
+            self.executor.shutdown(wait=False, cancel_futures=True)
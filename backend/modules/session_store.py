@@ -0,0 +1,301 @@
+"""
+A.R.I.S.E. AI - Session Store
+
+SQLite index over saved conversations (data/sessions.db). Sessions are ingested
+once, when they are saved (plus a one-time backfill of older session files), into
+a messages table with an FTS5 full-text index, so "what did I say about X last
+week" is an indexed query instead of a scan over every session file. Session and
+message counts are kept in a stats table by triggers rather than counted on demand.
+The JSON session files stay the source of truth; the database can be rebuilt from them.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+DB_FILE = "data/sessions.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,
+    message_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    session_id TEXT NOT NULL REFERENCES sessions(session_id) ON DELETE CASCADE,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL,
+    timestamp REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS messages_session ON messages(session_id);
+CREATE INDEX IF NOT EXISTS messages_timestamp ON messages(timestamp);
+CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+    content, content='messages', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+INSERT OR IGNORE INTO stats VALUES ('sessions', 0), ('messages', 0), ('user_messages', 0);
+
+CREATE TRIGGER IF NOT EXISTS messages_ai AFTER INSERT ON messages BEGIN
+    INSERT INTO messages_fts(rowid, content) VALUES (new.id, new.content);
+    UPDATE stats SET value = value + 1 WHERE name = 'messages';
+    UPDATE stats SET value = value + 1 WHERE name = 'user_messages' AND new.role = 'user';
+END;
+CREATE TRIGGER IF NOT EXISTS messages_ad AFTER DELETE ON messages BEGIN
+    INSERT INTO messages_fts(messages_fts, rowid, content) VALUES ('delete', old.id, old.content);
+    UPDATE stats SET value = value - 1 WHERE name = 'messages';
+    UPDATE stats SET value = value - 1 WHERE name = 'user_messages' AND old.role = 'user';
+END;
+CREATE TRIGGER IF NOT EXISTS sessions_ai AFTER INSERT ON sessions BEGIN
+    UPDATE stats SET value = value + 1 WHERE name = 'sessions';
+END;
+CREATE TRIGGER IF NOT EXISTS sessions_ad AFTER DELETE ON sessions BEGIN
+    UPDATE stats SET value = value - 1 WHERE name = 'sessions';
+END;
+"""
+
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+# Question words that would otherwise have to appear in every hit
+STOPWORDS = frozenset(
+    "a an the i me my we our you your it its is was were be been are am has have had did do does "
+    "what when where who how why which say said tell told talk talked about of on in at to for and "
+    "or with that this these those there here he she him her his they them us so if then than as "
+    "by from up out not no yes just also very can could would should will shall may might going "
+    "get got want like know think really please some any".split()
+)
+
+# Spoken periods -> (days back to start, days back to end), counted from local midnight
+PERIODS = {
+    "today": (0, None),
+    "yesterday": (1, 0),
+    "this week": (7, None),
+    "last week": (14, 7),
+    "past week": (7, None),
+    "this month": (30, None),
+    "last month": (60, 30),
+    "past month": (30, None),
+    "this year": (365, None),
+    "last year": (730, 365),
+}
+_PERIOD_PATTERN = re.compile(r"\b(" + "|".join(sorted(PERIODS, key=len, reverse=True)) + r")\b", re.IGNORECASE)
+
+
+def parse_period(text: str, now: Optional[float] = None) -> Tuple[Optional[float], Optional[float], str]:
+    """
+    Pull a spoken period ("last week", "yesterday") out of a query.
+
+    Returns:
+        (since, until, remaining text); since/until are epoch seconds or None
+    """
+    match = _PERIOD_PATTERN.search(text)
+    if not match:
+        return None, None, text
+    now = time.time() if now is None else now
+    local = time.localtime(now)
+    midnight = time.mktime((local.tm_year, local.tm_mon, local.tm_mday, 0, 0, 0, 0, 0, -1))
+    start_days, end_days = PERIODS[match.group(1).lower()]
+    since = midnight - start_days * 86400
+    until = None if end_days is None else midnight - end_days * 86400
+    remaining = " ".join((text[:match.start()] + text[match.end():]).split())
+    return since, until, remaining
+
+
+class SessionStore:
+    """
+    Incrementally ingested, full-text indexed conversation history.
+    Time: O(m log n) to ingest a session of m messages, O(log n + k) for a search
+          returning k hits, O(1) for counts
+    Space: O(total message text) plus the FTS index
+    """
+
+    def __init__(self, path: Union[str, Path] = DB_FILE):
+        """
+        Args:
+            path: SQLite database file (created if missing), or ":memory:"
+        """
+        self.path = str(path)
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA foreign_keys=ON")
+            self._conn.executescript(SCHEMA)
+
+    def ingest(self, session_data: Dict[str, Any]) -> bool:
+        """
+        Index one session (the session_<epoch>.json format). Already indexed sessions are skipped.
+
+        Returns:
+            True if the session was added
+        """
+        messages = session_data.get("messages", [])
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO sessions(session_id, created_at, message_count) VALUES (?, ?, ?)",
+                (session_data["session_id"], session_data.get("created_at", time.time()), len(messages)))
+            if cursor.rowcount == 0:
+                return False
+            self._conn.executemany(
+                "INSERT INTO messages(session_id, role, content, timestamp) VALUES (?, ?, ?, ?)",
+                [(session_data["session_id"], message.get("role", ""), message.get("content", ""),
+                  message.get("timestamp", session_data.get("created_at", 0))) for message in messages])
+        return True
+
+    def sync(self, sessions_dir: Union[str, Path]) -> int:
+        """
+        Ingest session files not indexed yet (first run, or files copied in by hand).
+
+        Returns:
+            Number of sessions added
+        """
+        with self._lock:
+            indexed = {row[0] for row in self._conn.execute("SELECT session_id FROM sessions")}
+        added = 0
+        for session_file in sorted(Path(sessions_dir).glob("session_*.json")):
+            if session_file.stem in indexed:
+                continue
+            try:
+                with open(session_file, 'r', encoding='utf-8') as f:
+                    added += self.ingest(json.load(f))
+            except Exception as e:
+                print(f"Error indexing {session_file.name}: {e}")
+        return added
+
+    def search(self, query: str, since: Optional[float] = None, until: Optional[float] = None,
+               role: Optional[str] = None, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Messages matching every word of a query, best match first.
+
+        Args:
+            query: Free text; words are matched stemmed ("running" finds "run"), stopwords ignored
+            since, until: Optional epoch bounds on the message timestamp
+            role: Only 'user' or 'assistant' messages
+            limit: Maximum hits
+
+        Returns:
+            Dicts with session_id, role, content, timestamp and a highlighted snippet
+        """
+        terms = [term for term in _TERM.findall(query.lower()) if term not in STOPWORDS]
+        if not terms:
+            return []
+        sql = ["SELECT m.session_id, m.role, m.content, m.timestamp,",
+               "snippet(messages_fts, 0, '[', ']', '...', 12) AS snippet",
+               "FROM messages_fts JOIN messages m ON m.id = messages_fts.rowid",
+               "WHERE messages_fts MATCH ?"]
+        params: List[Any] = [" ".join(f'"{term}"' for term in terms)]
+        if since is not None:
+            sql.append("AND m.timestamp >= ?")
+            params.append(since)
+        if until is not None:
+            sql.append("AND m.timestamp < ?")
+            params.append(until)
+        if role:
+            sql.append("AND m.role = ?")
+            params.append(role)
+        sql.append("ORDER BY bm25(messages_fts) LIMIT ?")
+        params.append(limit)
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(" ".join(sql), params)]
+
+    def recall(self, question: str, limit: int = 5, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Answer "what did I say about X last week": the user's own messages about X in that period."""
+        since, until, remaining = parse_period(question, now)
+        topic = re.split(r"\babout\b", remaining, maxsplit=1, flags=re.IGNORECASE)
+        return self.search(topic[-1], since=since, until=until, role="user", limit=limit)
+
+    def recent_messages(self, limit: int) -> List[Dict[str, Any]]:
+        """The newest indexed messages, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT session_id, role, content, timestamp FROM messages ORDER BY timestamp DESC LIMIT ?",
+                (limit,)).fetchall()
+        return [dict(row) for row in reversed(rows)]
+
+    def count_sessions(self) -> int:
+        """Number of indexed sessions, from the trigger-maintained stats row. O(1)."""
+        with self._lock:
+            return self._conn.execute("SELECT value FROM stats WHERE name = 'sessions'").fetchone()[0]
+
+    def get_stats(self) -> Dict[str, int]:
+        """Maintained counts: sessions, messages, user_messages."""
+        with self._lock:
+            return {row["name"]: row["value"] for row in self._conn.execute("SELECT name, value FROM stats")}
+
+    def delete_all(self) -> None:
+        """Forget every indexed session."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM messages")
+            self._conn.execute("DELETE FROM sessions")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def benchmark(days: int = 3 * 365, sessions_per_day: int = 3, messages_per_session: int = 20):
+    """Ingest years of synthetic history, then time recall queries against a file scan."""
+    import os
+    import random
+    import tempfile
+
+    rng = random.Random(0)
+    words = ("weather coffee project deadline python guitar lesson doctor appointment trip paris "
+             "budget movie dinner recipe running marathon book meeting birthday gift").split()
+    now = time.time()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        store = SessionStore(os.path.join(scratch, "sessions.db"))
+        sessions = []
+        for day in range(days, 0, -1):
+            for n in range(sessions_per_day):
+                created = now - day * 86400 + n * 3600
+                sessions.append({
+                    "session_id": f"session_{int(created)}",
+                    "created_at": created,
+                    "messages": [{"role": "user" if i % 2 == 0 else "assistant",
+                                  "content": " ".join(rng.choice(words) for _ in range(12)),
+                                  "timestamp": created + i * 30} for i in range(messages_per_session)],
+                })
+        sessions[-5]["messages"][0]["content"] = "I want to learn the ukulele this summer"
+
+        start = time.perf_counter()
+        for session in sessions:
+            store.ingest(session)
+        ingest_s = time.perf_counter() - start
+        stats = store.get_stats()
+        print(f"Session store: {stats['sessions']} sessions, {stats['messages']} messages "
+              f"ingested in {ingest_s:.1f} s ({ingest_s / len(sessions) * 1000:.2f} ms/session)")
+
+        for question in ("what did I say about the ukulele this week",
+                         "what did I say about the marathon last week",
+                         "what did I say about paris budget"):
+            start = time.perf_counter()
+            hits = store.recall(question, now=now)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            print(f"   {question!r}: {len(hits)} hits in {elapsed_ms:.2f} ms"
+                  + (f" - {hits[0]['snippet']!r}" if hits else ""))
+
+        start = time.perf_counter()
+        for _ in range(1000):
+            store.count_sessions()
+        print(f"   count_sessions: {(time.perf_counter() - start) * 1000:.1f} us/call")
+
+        # The same lookup as a scan over every message, as a directory of session files would need
+        start = time.perf_counter()
+        scan_hits = [m for s in sessions for m in s["messages"] if m["role"] == "user" and "ukulele" in m["content"]]
+        print(f"   in-memory scan for comparison: {len(scan_hits)} hits in "
+              f"{(time.perf_counter() - start) * 1000:.1f} ms (before any file parsing)")
+        store.close()
+
+
+if __name__ == "__main__":
+    benchmark()
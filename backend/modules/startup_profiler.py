@@ -0,0 +1,270 @@
+"""
+A.R.I.S.E. AI - Startup Profiler
+
+Records where ARISEMain's startup time goes, per engine:
+- import: wall time of the engine module's top-level import
+- init: wall time of the engine constructor
+- init_imports: part of init spent importing (torch, SpeechBrain, ...)
+plus named milestones such as the first spoken word. Emits a JSON report.
+
+Run as a self-check against a startup budget with heavy dependencies stubbed:
+    python modules/startup_profiler.py --budget 2.0 [--json report.json]
+The same check runs under pytest in tests/test_startup_budget.py.
+"""
+
+import builtins
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional, Sequence
+from unittest import mock
+
+# Wall-clock budget to engines_ready for the stubbed self-check: everything left is our own code
+DEFAULT_BUDGET_SECONDS = 2.0
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Third-party modules stubbed by the self-check (hardware, network or model weights)
+HEAVY_DEPENDENCIES = (
+    "pyttsx3", "comtypes", "speech_recognition", "google.generativeai", "dotenv",
+    "requests", "requests.adapters", "yfinance", "torch", "torchaudio", "speechbrain", "speechbrain.inference",
+    "librosa", "winreg",
+)
+
+
+class StartupProfiler:
+    """
+    Per-engine startup timings.
+    Time: O(1) per recorded import or stage
+    Space: O(engines + milestones)
+    """
+
+    def __init__(self, start: Optional[float] = None):
+        """
+        Args:
+            start: perf_counter() value treated as process start (defaults to now)
+        """
+        self.start = start if start is not None else time.perf_counter()
+        self.engines: Dict[str, Dict[str, float]] = {}
+        self.milestones: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._original_import = None
+
+    def _add(self, engine: str, key: str, seconds: float):
+        with self._lock:
+            timings = self.engines.setdefault(engine, {"import": 0.0, "init": 0.0, "init_imports": 0.0})
+            timings[key] += seconds
+
+    def _timed_import(self, *args, **kwargs):
+        """builtins.__import__ wrapper charging outermost imports to the running stage."""
+        engine = getattr(self._local, "engine", None)
+        if engine is None or getattr(self._local, "importing", False):
+            return self._original_import(*args, **kwargs)
+
+        self._local.importing = True
+        start = time.perf_counter()
+        try:
+            return self._original_import(*args, **kwargs)
+        finally:
+            self._local.importing = False
+            self._add(engine, "init_imports", time.perf_counter() - start)
+
+    @contextmanager
+    def importing(self, engine: str):
+        """Time a block of top-level imports for an engine."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._add(engine, "import", time.perf_counter() - start)
+
+    @contextmanager
+    def stage(self, engine: str):
+        """Time an engine constructor, separating the imports it triggers."""
+        if self._original_import is None:
+            with self._lock:
+                if self._original_import is None:
+                    self._original_import = builtins.__import__
+                    builtins.__import__ = self._timed_import
+
+        self._local.engine = engine
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._add(engine, "init", time.perf_counter() - start)
+            self._local.engine = None
+
+    def finish(self):
+        """Stop attributing imports and restore the original import hook."""
+        with self._lock:
+            # Bound methods are recreated on access, so compare with == rather than is
+            if self._original_import is not None and builtins.__import__ == self._timed_import:
+                builtins.__import__ = self._original_import
+                self._original_import = None
+        self.mark("engines_ready")
+
+    def mark(self, name: str, at: Optional[float] = None) -> float:
+        """Record a milestone as seconds since process start."""
+        elapsed = (at if at is not None else time.perf_counter()) - self.start
+        self.milestones[name] = elapsed
+        return elapsed
+
+    def report(self) -> dict:
+        """JSON-serializable snapshot of all timings."""
+        with self._lock:
+            engines = {name: {key: round(value, 4) for key, value in timings.items()}
+                       for name, timings in self.engines.items()}
+        return {
+            "total_import": round(sum(t["import"] for t in engines.values()), 4),
+            "total_init": round(sum(t["init"] for t in engines.values()), 4),
+            "engines": engines,
+            "milestones": {name: round(value, 4) for name, value in self.milestones.items()},
+        }
+
+    def save(self, path: str):
+        """Write the report as JSON."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+
+    def print_summary(self):
+        """Print a per-engine table, slowest first."""
+        report = self.report()
+        print("⏱️ Startup profile (seconds):")
+        print(f"   {'engine':<20}{'import':>9}{'init':>9}{'of which imports':>18}")
+        for name, timings in sorted(report["engines"].items(), key=lambda item: -(item[1]["import"] + item[1]["init"])):
+            print(f"   {name:<20}{timings['import']:>9.3f}{timings['init']:>9.3f}{timings['init_imports']:>18.3f}")
+        for name, value in report["milestones"].items():
+            print(f"   {name}: {value:.3f}")
+
+    def startup_seconds(self) -> float:
+        """
+        Wall-clock seconds from process start to engines_ready.
+
+        Engines initialize in parallel, so summed per-engine times overstate
+        startup; the sum is only used before finish() has run.
+        """
+        if "engines_ready" in self.milestones:
+            return self.milestones["engines_ready"]
+        report = self.report()
+        return report["total_import"] + report["total_init"]
+
+    def check_budget(self, budget_seconds: float) -> bool:
+        """True if startup (to engines_ready) fits in the budget."""
+        return self.startup_seconds() <= budget_seconds
+
+
+def heavy_dependency_stubs(keep: Sequence[str] = ()) -> Dict[str, Any]:
+    """
+    MagicMocks for the missing or slow third-party modules, plus parent packages not already loaded.
+
+    Args:
+        keep: Top-level packages to leave real (e.g. "requests" for a test against a local server)
+    """
+    stubs = {}
+    for name in HEAVY_DEPENDENCIES:
+        parts = name.split(".")
+        if parts[0] in keep:
+            continue
+        for i in range(1, len(parts) + 1):
+            module_name = ".".join(parts[:i])
+            if module_name == name or (module_name not in sys.modules and module_name not in stubs):
+                stubs[module_name] = mock.MagicMock(name=module_name)
+    return stubs
+
+
+@contextmanager
+def stubbed_heavy_dependencies(keep: Sequence[str] = ()):
+    """
+    Stub the heavy third-party modules for the duration of the block.
+
+    Afterwards the originals are put back and A.R.I.S.E. modules first
+    imported inside the block (which hold references to the stubs) are
+    unloaded. Real libraries imported meanwhile, like numpy, stay loaded.
+    """
+    stubs = heavy_dependency_stubs(keep)
+    saved = {name: sys.modules.get(name) for name in stubs}
+    loaded = set(sys.modules)
+    sys.modules.update(stubs)
+    try:
+        yield
+    finally:
+        for name, module in saved.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+        for name in set(sys.modules) - loaded:
+            path = getattr(sys.modules[name], "__file__", None) or ""
+            if os.path.abspath(path).startswith(BACKEND_DIR + os.sep):
+                del sys.modules[name]
+
+
+def close_engines(arise) -> None:
+    """Shut down what ARISEMain started, in the same order as main.py's finally block."""
+    if getattr(arise, 'tts', None):
+        arise.tts.shutdown()
+    if getattr(arise, 'data', None):
+        arise.data.close()  # Stops the prefetch scheduler thread
+    if getattr(arise, 'voice_recognition', None):
+        arise.voice_recognition.close()
+    if getattr(arise, 'memory', None):
+        arise.memory.close()
+
+
+def self_check(budget_seconds: float = DEFAULT_BUDGET_SECONDS, json_path: Optional[str] = None) -> bool:
+    """
+    Build ARISEMain with heavy dependencies stubbed and check it fits the budget.
+
+    Runs in a scratch directory so no real data files are touched, and
+    restores sys.modules afterwards.
+
+    Returns:
+        True if startup stayed within budget
+    """
+    import tempfile
+
+    sys.path.insert(0, BACKEND_DIR)
+    os.environ.setdefault("GEMINI_API_KEY", "self-check")
+
+    cwd = os.getcwd()
+    original_import = builtins.__import__
+    with tempfile.TemporaryDirectory() as scratch, stubbed_heavy_dependencies():
+        os.chdir(scratch)
+        arise = None
+        try:
+            import main as arise_main
+            arise = arise_main.ARISEMain()
+        finally:
+            # Startup patches __import__ while engines load; never leave it patched if init failed
+            builtins.__import__ = original_import
+            if arise is not None:
+                close_engines(arise)
+            os.chdir(cwd)
+
+    profiler = arise.profiler
+    profiler.print_summary()
+    if json_path:
+        profiler.save(json_path)
+
+    within = profiler.check_budget(budget_seconds)
+    print(f"{'✅' if within else '❌'} Startup {profiler.startup_seconds():.3f}s against a {budget_seconds:.3f}s budget")
+    return within
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="A.R.I.S.E. startup budget self-check")
+    parser.add_argument('--budget', type=float, default=DEFAULT_BUDGET_SECONDS,
+                        help="Maximum seconds from process start to engines_ready")
+    parser.add_argument('--json', dest='json_path', help="Also write the report to this file")
+    args = parser.parse_args()
+    sys.exit(0 if self_check(args.budget, args.json_path) else 1)
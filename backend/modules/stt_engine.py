@@ -7,6 +7,7 @@ Returns text responses only. No TTS or other engine dependencies.
 
 import speech_recognition as sr
 import logging
+import threading
 from typing import Optional
 
 # Suppress verbose logging
@@ -21,6 +22,7 @@ class STTEngine:
         self.recognizer = sr.Recognizer()
         self.microphone = sr.Microphone(sample_rate=sample_rate)
         self.last_audio = None  # Store last recorded audio for voice verification
+        self._mic_lock = threading.RLock()  # Microphone can only be opened by one caller at a time
         
         # Calibrate microphone for ambient noise
         print("STT engine initialized - Calibrating microphone...")
@@ -41,22 +43,56 @@ class STTEngine:
             
         Time: O(n) where n is audio duration, Space: O(1)
         """
+        audio = self.capture(timeout=timeout)
+        if audio is None:
+            return None
+        return self.recognize(audio)
+    
+    def capture(self, timeout: int = 15, phrase_time_limit: int = 10, quiet: bool = False) -> Optional[sr.AudioData]:
+        """
+        Capture one utterance from the microphone without recognizing it.
+        
+        Args:
+            timeout: Max seconds to wait for speech to start
+            phrase_time_limit: Max seconds of speech to record
+            quiet: Skip progress logs (for continuous capture loops)
+            
+        Returns:
+            Captured AudioData or None if nothing was heard
+        """
         try:
-            with self.microphone as source:
-                print("Listening... (speak now, I'll wait for you to finish)")
+            with self._mic_lock, self.microphone as source:
+                if not quiet:
+                    print("Listening... (speak now, I'll wait for you to finish)")
                 # Longer phrase_time_limit allows complete sentences
-                audio = self.recognizer.listen(source, timeout=timeout, phrase_time_limit=10)
+                audio = self.recognizer.listen(source, timeout=timeout, phrase_time_limit=phrase_time_limit)
             
             # Store the audio for potential voice verification
             self.last_audio = audio
-            
-            print("Processing speech...")
-            text = self.recognizer.recognize_google(audio)
-            return text
+            return audio
             
         except sr.WaitTimeoutError:
-            print("No speech detected in time limit")
+            if not quiet:
+                print("No speech detected in time limit")
+            return None
+        except Exception as e:
+            print(f"STT error: {e}")
             return None
+    
+    def recognize(self, audio: sr.AudioData) -> Optional[str]:
+        """
+        Convert captured audio to text with Google Speech Recognition.
+        
+        Args:
+            audio: AudioData returned by capture()
+            
+        Returns:
+            Recognized text or None if failed
+        """
+        try:
+            print("Processing speech...")
+            return self.recognizer.recognize_google(audio)
+            
         except sr.UnknownValueError:
             print("Could not understand audio - try speaking more clearly")
             return None
@@ -74,23 +110,36 @@ class STTEngine:
         Returns:
             Path to saved audio file or None if failed
         """
-        import tempfile
-        import os
-        from datetime import datetime
-        
         if self.last_audio is None:
             print("No audio available to save")
             return None
         
+        return self.save_audio_to_file(self.last_audio, filename)
+    
+    def save_audio_to_file(self, audio: sr.AudioData, filename: str = None) -> Optional[str]:
+        """
+        Save a specific captured utterance to a WAV file.
+        
+        Args:
+            audio: AudioData returned by capture()
+            filename: Output filename (auto-generated if None)
+            
+        Returns:
+            Path to saved audio file or None if failed
+        """
+        import tempfile
+        import os
+        from datetime import datetime
+        
         try:
             if filename is None:
                 # Generate unique filename
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
                 filename = os.path.join(tempfile.gettempdir(), f"arise_voice_{timestamp}.wav")
             
             # Save audio to WAV file
             with open(filename, "wb") as f:
-                f.write(self.last_audio.get_wav_data())
+                f.write(audio.get_wav_data())
             
             print(f"Last audio saved successfully: {filename}")
             return filename
@@ -123,7 +172,7 @@ class STTEngine:
             
             print(f"Recording audio for {duration} seconds...")
             
-            with self.microphone as source:
+            with self._mic_lock, self.microphone as source:
                 # Record audio with specified duration
                 audio = self.recognizer.listen(source, timeout=1, phrase_time_limit=duration)
             
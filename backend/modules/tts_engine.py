@@ -2,171 +2,304 @@
 A.R.I.S.E. AI - Text-to-Speech Engine
 
 Simple, reliable TTS engine for voice output.
+A single long-lived worker thread owns one warmed-up pyttsx3 driver and
+speaks queued utterances, so callers only pay synthesis time per reply.
+Completion is tracked with the driver's started/finished-utterance callbacks,
+so callers are released the moment playback ends instead of after a guessed sleep.
 """
 
 import logging
+import queue
+import sys
+import threading
+import time
+from typing import Optional
 
 # Suppress pyttsx3 and comtypes logging
 logging.getLogger('comtypes').setLevel(logging.WARNING)
 logging.getLogger('pyttsx3').setLevel(logging.WARNING)
 
 
+class Utterance:
+    """A queued piece of text plus its completion event."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.success = False
+        self.done = threading.Event()
+        self.queued_at = time.perf_counter()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.returned_at: Optional[float] = None  # When runAndWait() handed control back
+
+    @property
+    def duration(self) -> Optional[float]:
+        """Measured playback time from start to finish callback, in seconds."""
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+    @property
+    def overrun(self) -> Optional[float]:
+        """Driver time spent after playback finished, in seconds."""
+        if self.finished_at is None or self.returned_at is None:
+            return None
+        return max(0.0, self.returned_at - self.finished_at)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the utterance has been spoken. Returns True if it played."""
+        self.done.wait(timeout)
+        return self.success
+
+
 class TTSEngine:
-    """Simple TTS engine for A.R.I.S.E. AI."""
-    
-    def __init__(self):
-        """Initialize the TTS engine."""
+    """Simple TTS engine for A.R.I.S.E. AI backed by a persistent worker thread."""
+
+    def __init__(self, rate: int = 180, volume: float = 1.0):
+        """Start the TTS worker and wait for its driver to warm up."""
         self.engine = None
         self.initialized = False
-        
+        self.rate = rate
+        self.volume = volume
+
+        self._queue: "queue.Queue[Optional[Utterance]]" = queue.Queue()
+        self._current: Optional[Utterance] = None
+        self._last: Optional[Utterance] = None
+        self.first_audio_at: Optional[float] = None  # perf_counter() when audio first started playing
+        self._stats_lock = threading.Lock()
+        self.stats = {
+            "utterances": 0,
+            "failures": 0,
+            "audio_seconds": 0.0,
+            "overrun_seconds": 0.0,
+            "max_overrun": 0.0,
+            "callback_misses": 0,  # Driver never reported finished-utterance
+            "interrupted": 0,
+        }
+        self._ready = threading.Event()
+        self._worker = threading.Thread(target=self._run, name="arise-tts", daemon=True)
+        self._worker.start()
+        self._ready.wait(timeout=10)
+
+    def _init_driver(self) -> bool:
+        """Create the pyttsx3 driver. Must run on the worker thread."""
         try:
             import pyttsx3
-            self.engine = pyttsx3.init()
-            self.engine.setProperty('rate', 150)  # Normal speed
-            self.engine.setProperty('volume', 1.0)  # Full volume (0.0 to 1.0)
+
+            try:
+                # Explicitly use Windows SAPI where available
+                driver = 'sapi5' if sys.platform == 'win32' else None
+                self.engine = pyttsx3.init(driverName=driver)
+            except Exception:
+                self.engine = pyttsx3.init()
+
+            voices = self.engine.getProperty('voices')
+            if voices and len(voices) > 0:
+                self.engine.setProperty('voice', voices[0].id)
+
+            self.engine.setProperty('rate', self.rate)  # Natural human speech rate
+            self.engine.setProperty('volume', self.volume)  # Full volume (0.0 to 1.0)
+            self.engine.connect('started-utterance', self._on_started)
+            self.engine.connect('finished-utterance', self._on_finished)
             self.initialized = True
         except Exception as e:
             print(f"TTS error: {e}")
-    
-    def speak(self, text):
+            self.engine = None
+            self.initialized = False
+        return self.initialized
+
+    def _close_driver(self):
+        """Stop and release the current driver."""
+        try:
+            if self.engine:
+                self.engine.stop()
+        except Exception:
+            pass
+        self.engine = None
+        self.initialized = False
+
+    def _run(self):
+        """Worker loop: own the driver and speak utterances in order."""
+        if sys.platform == 'win32':
+            try:
+                # SAPI is COM based and every thread needs its own apartment
+                import comtypes
+                comtypes.CoInitialize()
+            except Exception:
+                pass
+
+        self._init_driver()
+        self._ready.set()
+
+        while True:
+            utterance = self._queue.get()
+            if utterance is None:
+                break
+
+            try:
+                utterance.success = self._render(utterance)
+            except Exception as e:
+                print(f"TTS worker error: {e}")
+                utterance.success = False
+            finally:
+                utterance.done.set()
+
+        self._close_driver()
+
+    def _on_started(self, name):
+        """Driver callback: audio for the current utterance began."""
+        if self._current is not None:
+            self._current.started_at = time.perf_counter()
+            if self.first_audio_at is None:
+                self.first_audio_at = self._current.started_at
+
+    def _on_finished(self, name, completed):
+        """Driver callback: playback ended, release waiters immediately."""
+        utterance = self._current
+        if utterance is not None:
+            utterance.finished_at = time.perf_counter()
+            utterance.success = bool(completed)
+            utterance.done.set()
+
+    def _render(self, utterance: Utterance) -> bool:
+        """Speak one utterance, rebuilding the driver once if it has died."""
+        for attempt in range(2):
+            if not self.initialized and not self._init_driver():
+                return False
+
+            if attempt:
+                # Timings from the failed attempt must not leak into the retry
+                utterance.started_at = utterance.finished_at = utterance.returned_at = None
+                utterance.success = False
+
+            try:
+                self._current = utterance
+                self.engine.say(utterance.text)
+                self.engine.runAndWait()
+                utterance.returned_at = time.perf_counter()
+
+                if utterance.finished_at is None:
+                    # Driver gave no callbacks - runAndWait() return is the best signal
+                    utterance.started_at = utterance.started_at or utterance.queued_at
+                    if self.first_audio_at is None:
+                        self.first_audio_at = utterance.started_at
+                    utterance.finished_at = utterance.returned_at
+                    utterance.success = True
+                    self._record(utterance, callback_missed=True)
+                else:
+                    self._record(utterance)
+
+                duration = utterance.duration  # None if finished fired without started (some drivers after stop())
+                print(f"✅ TTS completed in {duration:.1f}s" if duration is not None else "✅ TTS completed")
+                return utterance.success
+
+            except Exception as e:
+                print(f"TTS driver failed (attempt {attempt + 1}): {e}")
+                self._close_driver()
+            finally:
+                self._current = None
+
+        with self._stats_lock:
+            self.stats["failures"] += 1
+        return False
+
+    def _record(self, utterance: Utterance, callback_missed: bool = False):
+        """Add one utterance to the running duration/overrun stats."""
+        with self._stats_lock:
+            self.stats["utterances"] += 1
+            if callback_missed:
+                self.stats["callback_misses"] += 1
+                return
+            self.stats["audio_seconds"] += utterance.duration or 0.0
+            overrun = utterance.overrun or 0.0
+            self.stats["overrun_seconds"] += overrun
+            self.stats["max_overrun"] = max(self.stats["max_overrun"], overrun)
+
+    def get_stats(self) -> dict:
+        """Snapshot of measured playback stats across all utterances."""
+        with self._stats_lock:
+            return dict(self.stats)
+
+    def say(self, text: str) -> Optional[Utterance]:
         """
-        Speak the given text with maximum reliability.
-        
+        Queue text for speech without waiting.
+
         Args:
             text (str): Text to speak
-            
+
         Returns:
-            bool: True if successful, False otherwise
+            Utterance handle to wait on, or None for empty text
         """
-        if not text.strip():
-            return False
-        
-        try:
-            import pyttsx3
-            import time
-            
-            # Calculate expected speech duration for natural speech rate (~180 WPM)
-            word_count = len(text.split())
-            char_count = len(text)
-            # Natural speech: ~3 words per second + shorter pause time
-            estimated_duration = max(1.5, (word_count / 3.0) + 0.5)
-            
-            print(f"TTS: Speaking {word_count} words, estimated {estimated_duration:.1f}s")
-            
-            # Method 1: Complete engine recreation for maximum reliability
-            try:
-                # Force complete cleanup of any existing engine
-                try:
-                    if hasattr(self, 'engine') and self.engine:
-                        self.engine.stop()
-                        del self.engine
-                except:
-                    pass
-                
-                # Create completely fresh engine instance
-                engine = pyttsx3.init(driverName='sapi5')  # Explicitly use Windows SAPI
-                
-                # Set properties
-                voices = engine.getProperty('voices')
-                if voices and len(voices) > 0:
-                    engine.setProperty('voice', voices[0].id)
-                
-                engine.setProperty('rate', 180)  # Natural human speech rate
-                engine.setProperty('volume', 1.0)  # Full volume
-                
-                print(f"TTS: Using voice engine, speaking now...")
-                
-                start_time = time.time()
-                engine.say(text)
-                engine.runAndWait()
-                actual_duration = time.time() - start_time
-                
-                # Force minimum wait time if completed too quickly (indicates audio didn't play)
-                if actual_duration < (estimated_duration * 0.2):  # More lenient for faster speech
-                    remaining_wait = estimated_duration * 0.3  # Shorter wait for faster speech
-                    print(f"TTS: Audio likely didn't play, forcing wait of {remaining_wait:.1f}s...")
-                    time.sleep(remaining_wait)
-                    actual_duration += remaining_wait
-                
-                # Complete cleanup
-                engine.stop()
-                del engine
-                
-                print(f"✅ TTS completed in {actual_duration:.1f}s")
-                return True
-                
-            except Exception as method1_error:
-                print(f"Method 1 failed: {method1_error}")
-            
-            # Method 2: Try alternative driver
+        if not text or not text.strip():
+            return None
+
+        utterance = Utterance(text)
+        self._last = utterance
+        self._queue.put(utterance)
+        return utterance
+
+    def is_speaking(self) -> bool:
+        """True while an utterance is playing or waiting in the queue."""
+        return self._last is not None and not self._last.done.is_set()
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything queued so far has finished playing."""
+        last = self._last
+        return last is None or last.done.wait(timeout)
+
+    def interrupt(self) -> int:
+        """
+        Barge-in: drop queued utterances and cut off the one playing.
+
+        Returns:
+            Number of utterances that were cancelled
+        """
+        cancelled = 0
+        requeue_sentinel = False
+        while True:
             try:
-                print("TTS: Trying alternative method...")
-                
-                # Try different initialization
-                engine2 = pyttsx3.init()
-                
-                # Reset all properties
-                voices = engine2.getProperty('voices')
-                if voices and len(voices) > 1:  # Try second voice if available
-                    engine2.setProperty('voice', voices[1].id)
-                elif voices:
-                    engine2.setProperty('voice', voices[0].id)
-                
-                engine2.setProperty('rate', 160)  # Still natural but slightly slower
-                engine2.setProperty('volume', 1.0)
-                
-                engine2.say(text)
-                engine2.runAndWait()
-                
-                # Shorter wait for faster speech
-                wait_time = max(1.0, estimated_duration * 0.4)
-                print(f"TTS: Waiting {wait_time:.1f}s for audio completion...")
-                time.sleep(wait_time)
-                
-                engine2.stop()
-                del engine2
-                
-                print("✅ Alternative TTS method completed")
-                return True
-                
-            except Exception as method2_error:
-                print(f"Method 2 failed: {method2_error}")
-            
-            # Method 3: Desperate fallback with system restart
+                pending = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if pending is None:
+                requeue_sentinel = True
+                continue
+            pending.success = False
+            pending.done.set()
+            cancelled += 1
+        if requeue_sentinel:
+            self._queue.put(None)
+
+        current = self._current
+        if current is not None and self.engine is not None:
             try:
-                print("TTS: Final fallback method...")
-                
-                # Small delay to let system settle
-                time.sleep(0.5)
-                
-                engine3 = pyttsx3.init(driverName='sapi5')
-                engine3.setProperty('rate', 170)  # Natural speech rate
-                engine3.setProperty('volume', 1.0)
-                
-                # Try to ensure audio system is ready
-                engine3.say(".")  # Tiny test sound
-                engine3.runAndWait()
-                time.sleep(0.1)  # Shorter delay
-                
-                # Now speak the actual text
-                engine3.say(text)
-                engine3.runAndWait()
-                
-                # Shorter forced wait for natural speech
-                forced_wait = max(1.0, word_count * 0.25)  # Faster calculation
-                print(f"TTS: Forced wait {forced_wait:.1f}s...")
-                time.sleep(forced_wait)
-                
-                engine3.stop()
-                del engine3
-                
-                print("✅ Fallback TTS completed")
-                return True
-                
-            except Exception as method3_error:
-                print(f"All TTS methods failed: {method3_error}")
-                return False
-            
-        except Exception as e:
-            print(f"TTS system error: {e}")
+                self.engine.stop()
+                cancelled += 1
+            except Exception as e:
+                print(f"TTS interrupt error: {e}")
+
+        if cancelled:
+            with self._stats_lock:
+                self.stats["interrupted"] += cancelled
+        return cancelled
+
+    def speak(self, text):
+        """
+        Speak the given text and wait until it has finished.
+
+        Args:
+            text (str): Text to speak
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        utterance = self.say(text)
+        if utterance is None:
             return False
+        return utterance.wait()
+
+    def shutdown(self, timeout: float = 5.0):
+        """Finish queued speech and stop the worker thread."""
+        if self._worker.is_alive():
+            self._queue.put(None)
+            self._worker.join(timeout)
@@ -3,22 +3,42 @@ A.R.I.S.E. AI - Voice Recognition Module
 
 Handles user voice enrollment and verification using SpeechBrain.
 Primary verification using SpeechBrain pre-trained models with librosa feature extraction.
+Audio can be passed as a file path, WAV bytes, or a NumPy PCM buffer with its
+sample rate; it is decoded and resampled to 16kHz once and shared by both paths.
+With background_load=True, torch/SpeechBrain/librosa load on a background thread
+and only calls that actually need the model wait for it.
 """
 
+import io
 import os
 import json
+import threading
+import time
+from concurrent.futures import Future
 import numpy as np
-from typing import Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Union
 from datetime import datetime
 import uuid
 
+from speaker_index import RunningCentroid, SpeakerIndex
+
 # Configuration constants
 VERIFICATION_THRESHOLD = 0.40  # SpeechBrain verification threshold (lowered for better recognition)
 FEATURE_THRESHOLD = 0.45       # Audio feature similarity threshold
 COMBINED_THRESHOLD = 0.55      # Combined score threshold for verification
+TARGET_SAMPLE_RATE = 16000     # SpeechBrain and librosa features both run at 16kHz
+FEATURE_SECONDS = 10.0         # Feature extraction only looks at the first 10 seconds
 DATA_DIR = "data"
 USERS_FILE = os.path.join(DATA_DIR, "users.json")
 FEATURES_DIR = os.path.join(DATA_DIR, "voice_features")
+INDEX_FILE = os.path.join(DATA_DIR, "speaker_index.npz")  # Embedding matrix for identification
+IDENTIFICATION_THRESHOLD = 0.55  # Embedding-only score needed to identify a non-master speaker
+ADAPTATION_THRESHOLD = 0.70      # SpeechBrain score confident enough to fold a turn into the voiceprint
+ADAPTATION_WINDOW = 50           # Effective sample cap so the voiceprint keeps tracking the speaker
+ADAPTATION_SAVE_DELAY = 30.0     # Seconds adapted voiceprints wait so many turns become one write
+
+# Permission levels, highest first. Exactly one enrolled user holds "master".
+ROLES = ("master", "member", "guest")
 
 # Security responses for unauthorized users
 SECURITY_RESPONSES = [
@@ -30,16 +50,83 @@ SECURITY_RESPONSES = [
 ]
 
 
+AudioInput = Union[str, bytes, np.ndarray]
+
+
+def audio_data_to_array(audio_data) -> Tuple[np.ndarray, int]:
+    """
+    View a speech_recognition.AudioData as a NumPy PCM buffer without copying.
+    
+    Args:
+        audio_data: AudioData captured by STTEngine
+        
+    Returns:
+        Tuple of (integer PCM samples, sample rate)
+        
+    Time: O(1) - np.frombuffer shares the raw frame bytes, Space: O(1)
+    """
+    dtype = {1: np.uint8, 2: np.int16, 4: np.int32}.get(audio_data.sample_width, np.int16)
+    samples = np.frombuffer(audio_data.get_raw_data(), dtype=dtype)
+    return samples, audio_data.sample_rate
+
+
 class VoiceRecognition:
     """Voice enrollment and verification system using SpeechBrain."""
     
-    def __init__(self):
-        """Initialize voice recognition with SpeechBrain model."""
+    def __init__(self, background_load: bool = False):
+        """
+        Initialize voice recognition with SpeechBrain model.
+        
+        Args:
+            background_load: Load heavyweight models on a background thread
+                instead of blocking startup; users and the speaker index are
+                still available immediately
+        """
         self.speechbrain_model = None
+        self.model_load_seconds = None
+        self.models_ready_at = None  # perf_counter() when loading finished
+        self._models_ready = Future()
         self.users_data = {}
-        self._init_models()
+        self._master_cache = None  # Resident master features + ECAPA embedding, cleared on re-enrollment
+        self._master_id = None
+        self.speaker_index = SpeakerIndex()
+        self.last_speaker = None  # User matched by the most recent successful verification
+        self._centroids: Dict[str, RunningCentroid] = {}  # Loaded on first adaptation per user
+        self._adapted = set()  # Users whose voiceprint changed since the last write
+        self._adapt_timer: Optional[threading.Timer] = None
+        self._adapt_lock = threading.RLock()
+        
+        if background_load:
+            threading.Thread(target=self._load_models, name="arise-voice-models", daemon=True).start()
+        else:
+            self._load_models()
+            self._models_ready.result()  # Re-raise load errors like before
         self._load_users()
         self._ensure_directories()
+        self._load_index()
+    
+    def _load_models(self):
+        """Load SpeechBrain (torch + ECAPA weights) and warm librosa, then resolve the readiness future."""
+        start = time.perf_counter()
+        try:
+            self._init_models()
+            import librosa
+            librosa.feature.mfcc  # Resolve librosa's lazily loaded submodules now, not mid-conversation
+            self.models_ready_at = time.perf_counter()
+            self.model_load_seconds = self.models_ready_at - start
+            self._models_ready.set_result(True)
+        except BaseException as e:
+            self._models_ready.set_exception(e)
+    
+    def is_ready(self) -> bool:
+        """True once models have finished loading successfully."""
+        return self._models_ready.done() and self._models_ready.exception() is None
+    
+    def wait_until_ready(self, timeout: Optional[float] = None):
+        """Block until models are loaded. Raises if loading failed."""
+        if not self._models_ready.done():
+            print("⏳ Waiting for voice models to finish loading...")
+        self._models_ready.result(timeout)
     
     def _init_models(self):
         """Initialize SpeechBrain speaker verification model."""
@@ -73,22 +160,105 @@ class VoiceRecognition:
         except Exception as e:
             print(f"Error loading users data: {e}")
             self.users_data = {}
+        
+        # Users enrolled before roles existed keep their original meaning
+        for user_data in self.users_data.values():
+            user_data.setdefault("role", "master" if user_data.get("is_master", False) else "member")
+        self._master_id = next((uid for uid, user_data in self.users_data.items()
+                                if user_data.get("is_master", False)), None)
+    
+    def _load_index(self):
+        """Load the speaker index and sync it with users.json."""
+        try:
+            if os.path.exists(INDEX_FILE):
+                self.speaker_index = SpeakerIndex.load(INDEX_FILE)
+        except Exception as e:
+            print(f"Error loading speaker index: {e}")
+            self.speaker_index = SpeakerIndex()
+        
+        changed = False
+        for user_id in list(self.speaker_index.user_ids):
+            if user_id not in self.users_data:
+                self.speaker_index.remove(user_id)
+                changed = True
+        
+        for user_id, user_data in self.users_data.items():
+            centroid = self._get_centroid(user_id)
+            if user_id not in self.speaker_index and centroid is not None:
+                self.speaker_index.add(user_id, centroid.mean)
+                changed = True
+                continue
+            
+            embedding_file = user_data.get("embedding_file")
+            if user_id in self.speaker_index or not embedding_file:
+                continue
+            embedding_path = os.path.join(FEATURES_DIR, embedding_file)
+            if os.path.exists(embedding_path):
+                self.speaker_index.add(user_id, np.load(embedding_path))
+                changed = True
+        
+        if changed:
+            self._save_index()
+    
+    def _save_index(self):
+        """Persist the speaker index next to users.json."""
+        try:
+            self.speaker_index.save(INDEX_FILE)
+        except Exception as e:
+            print(f"Error saving speaker index: {e}")
     
     def _save_users(self):
-        """Save users data to JSON file."""
+        """Save users data to JSON file (atomic temp file + rename)."""
         try:
-            with open(USERS_FILE, 'w') as f:
+            tmp_path = f"{USERS_FILE}.tmp"
+            with open(tmp_path, 'w') as f:
                 json.dump(self.users_data, f, indent=2)
+            os.replace(tmp_path, USERS_FILE)
         except Exception as e:
             print(f"Error saving users data: {e}")
     
-    def _extract_features(self, audio_file_path: str) -> Optional[np.ndarray]:
+    def _prepare_audio(self, audio: AudioInput, sample_rate: Optional[int] = None) -> np.ndarray:
+        """
+        Decode and resample audio to 16kHz mono float32 exactly once.
+        
+        Args:
+            audio: File path, WAV bytes, or NumPy PCM/float buffer
+            sample_rate: Sample rate of a NumPy buffer (ignored for paths/bytes)
+            
+        Returns:
+            16kHz mono float32 samples shared by feature extraction and SpeechBrain
+        """
+        self.wait_until_ready()
+        import librosa
+        
+        if isinstance(audio, np.ndarray):
+            samples = audio
+            if samples.ndim > 1:
+                samples = samples.mean(axis=1)
+            if samples.dtype == np.uint8:
+                samples = (samples.astype(np.float32) - 128.0) / 128.0
+            elif np.issubdtype(samples.dtype, np.integer):
+                samples = samples.astype(np.float32) / float(np.iinfo(samples.dtype).max + 1)
+            else:
+                samples = samples.astype(np.float32, copy=False)
+            
+            if sample_rate and sample_rate != TARGET_SAMPLE_RATE:
+                samples = librosa.resample(samples, orig_sr=sample_rate, target_sr=TARGET_SAMPLE_RATE)
+            return samples
+        
+        # Paths and WAV bytes: one decode with the resample folded in
+        source = io.BytesIO(audio) if isinstance(audio, (bytes, bytearray)) else audio
+        samples, _ = librosa.load(source, sr=TARGET_SAMPLE_RATE, mono=True)
+        return samples
+    
+    def _extract_features(self, samples: np.ndarray) -> Optional[np.ndarray]:
         """Extract audio features using librosa for additional verification."""
         try:
             import librosa
             
-            # Load audio file
-            audio, sr = librosa.load(audio_file_path, sr=16000, duration=10.0)
+            # Features use the first 10 seconds of the prepared 16kHz audio
+            audio = samples[:int(FEATURE_SECONDS * TARGET_SAMPLE_RATE)]
+            sr = TARGET_SAMPLE_RATE
             
             # Extract MFCC features
             mfcc = librosa.feature.mfcc(y=audio, sr=sr, n_mfcc=13)
@@ -112,149 +282,339 @@ class VoiceRecognition:
             print(f"Error extracting features: {e}")
             return None
     
-    def enroll_user(self, name: str, audio_file_path: str) -> Tuple[bool, str]:
+    def _compute_embedding(self, samples: np.ndarray) -> np.ndarray:
+        """Run one ECAPA pass on prepared 16kHz audio and return the L2-normalized embedding."""
+        self.wait_until_ready()
+        import torch
+        
+        waveform = torch.from_numpy(np.ascontiguousarray(samples, dtype=np.float32)).unsqueeze(0)
+        embedding = self.speechbrain_model.encode_batch(waveform)
+        embedding = embedding.squeeze().detach().cpu().numpy().astype(np.float32)
+        norm = np.linalg.norm(embedding)
+        return embedding / norm if norm > 0 else embedding
+    
+    def _get_master_cache(self) -> Optional[dict]:
+        """
+        Return the master's features and embedding, loading them from disk once.
+        
+        Users enrolled before embeddings were persisted get theirs computed
+        from the stored enrollment WAV a single time and saved.
         """
-        Enroll a new user with voice sample.
+        master_user = self.get_master_user()
+        if not master_user:
+            return None
+        
+        if self._master_cache and self._master_cache["user_id"] == master_user["user_id"]:
+            return self._master_cache
+        
+        features = None
+        features_path = os.path.join(FEATURES_DIR, master_user["features_file"])
+        if os.path.exists(features_path):
+            features = np.load(features_path)
+        
+        embedding = self.speaker_index.get(master_user["user_id"])
+        try:
+            if embedding is None:
+                enrollment_audio_path = os.path.join(FEATURES_DIR, master_user["enrollment_audio"])
+                if os.path.exists(enrollment_audio_path):
+                    embedding = self._compute_embedding(self._prepare_audio(enrollment_audio_path))
+                    embedding_file = f"{master_user['user_id']}_embedding.npy"
+                    np.save(os.path.join(FEATURES_DIR, embedding_file), embedding)
+                    master_user["embedding_file"] = embedding_file
+                    self._save_users()
+                    self.speaker_index.add(master_user["user_id"], embedding)
+                    self._save_index()
+        except Exception as e:
+            print(f"SpeechBrain embedding load error: {e}")
+        
+        self._master_cache = {
+            "user_id": master_user["user_id"],
+            "user": master_user,
+            "features": features,
+            "features_norm": float(np.linalg.norm(features)) if features is not None else 0.0,
+            "embedding": embedding
+        }
+        return self._master_cache
+    
+    def enroll_user(self, name: str, audio_file_paths: Union[str, List[str]], role: str = "master") -> Tuple[bool, str]:
+        """
+        Enroll a new user from one or more voice samples.
+        
+        Each sample is embedded once and folded into a running centroid
+        (mean + variance), which is far less noisy than a single clip.
         
         Args:
             name: User's name
-            audio_file_path: Path to audio file for enrollment
+            audio_file_paths: Path, or list of paths, to enrollment audio files
+            role: Permission level - "master" (replaces the current master), "member" or "guest"
             
         Returns:
             Tuple of (success: bool, message: str)
         """
         try:
-            if not os.path.exists(audio_file_path):
-                return False, f"Audio file not found: {audio_file_path}"
+            if role not in ROLES:
+                return False, f"Unknown role '{role}'. Use one of: {', '.join(ROLES)}"
+            
+            if isinstance(audio_file_paths, str):
+                audio_file_paths = [audio_file_paths]
+            audio_file_paths = [path for path in audio_file_paths if path]
+            if not audio_file_paths:
+                return False, "No enrollment audio provided"
+            
+            for audio_file_path in audio_file_paths:
+                if not os.path.exists(audio_file_path):
+                    return False, f"Audio file not found: {audio_file_path}"
             
             # Generate unique user ID
             user_id = str(uuid.uuid4())
             
-            # Extract audio features
-            features = self._extract_features(audio_file_path)
-            if features is None:
-                return False, "Failed to extract voice features"
+            centroid = RunningCentroid(window=ADAPTATION_WINDOW)
+            feature_sum = None
+            for audio_file_path in audio_file_paths:
+                # Decode/resample once for both feature extraction and SpeechBrain
+                samples = self._prepare_audio(audio_file_path)
+                
+                # Extract audio features
+                features = self._extract_features(samples)
+                if features is None:
+                    return False, "Failed to extract voice features"
+                feature_sum = features if feature_sum is None else feature_sum + features
+                
+                # Compute the ECAPA embedding once so verification never re-encodes this sample
+                centroid.update(self._compute_embedding(samples))
             
-            # Save features to file
+            # Save averaged features to file
             features_filename = f"{user_id}_features.npy"
             features_path = os.path.join(FEATURES_DIR, features_filename)
-            np.save(features_path, features)
+            np.save(features_path, feature_sum / len(audio_file_paths))
             
-            # Store enrollment audio path for SpeechBrain comparison
+            # Keep the first enrollment clip so the voiceprint can be rebuilt if the model changes
             enrollment_audio_filename = f"{user_id}_enrollment.wav"
             enrollment_audio_path = os.path.join(FEATURES_DIR, enrollment_audio_filename)
             
             # Copy enrollment audio to features directory
             import shutil
-            shutil.copy2(audio_file_path, enrollment_audio_path)
+            shutil.copy2(audio_file_paths[0], enrollment_audio_path)
+            
+            embedding_filename = f"{user_id}_embedding.npy"
+            np.save(os.path.join(FEATURES_DIR, embedding_filename), centroid.mean)
+            centroid_filename = f"{user_id}_centroid.npz"
+            centroid.save(os.path.join(FEATURES_DIR, centroid_filename))
             
             # Store user metadata
             user_data = {
                 "user_id": user_id,
                 "name": name,
                 "features_file": features_filename,
+                "embedding_file": embedding_filename,
+                "centroid_file": centroid_filename,
                 "enrollment_audio": enrollment_audio_filename,
+                "samples": centroid.count,
                 "created_at": datetime.now().isoformat(),
-                "is_master": True  # First enrolled user is master
+                "role": role,
+                "is_master": role == "master"
             }
             
+            # Master re-enrollment replaces the previous master voice
+            if role == "master" and self._master_id:
+                self._remove_user(self._master_id)
+                self._master_cache = None
+            
             self.users_data[user_id] = user_data
+            if role == "master":
+                self._master_id = user_id
             self._save_users()
             
-            return True, f"User '{name}' enrolled successfully as master user"
+            self._centroids[user_id] = centroid
+            self.speaker_index.add(user_id, centroid.mean)
+            self._save_index()
+            
+            print(f"Voiceprint from {centroid.count} samples, spread {centroid.spread:.5f}")
+            return True, f"User '{name}' enrolled successfully as {role} user"
             
         except Exception as e:
             return False, f"Enrollment failed: {e}"
     
-    def verify_voice(self, audio_file_path: str) -> Tuple[bool, str, float]:
+    def _get_centroid(self, user_id: str) -> Optional[RunningCentroid]:
+        """Load a user's running centroid from disk once."""
+        if user_id in self._centroids:
+            return self._centroids[user_id]
+        
+        user_data = self.users_data.get(user_id, {})
+        centroid = None
+        try:
+            if user_data.get("centroid_file"):
+                centroid_path = os.path.join(FEATURES_DIR, user_data["centroid_file"])
+                if os.path.exists(centroid_path):
+                    centroid = RunningCentroid.load(centroid_path, window=ADAPTATION_WINDOW)
+            elif user_id in self.speaker_index:
+                # Single-sample enrollment from before centroids: start from that embedding
+                centroid = RunningCentroid(window=ADAPTATION_WINDOW)
+                centroid.update(self.speaker_index.get(user_id))
+        except Exception as e:
+            print(f"Error loading voiceprint: {e}")
+        
+        if centroid is not None:
+            self._centroids[user_id] = centroid
+        return centroid
+    
+    def adapt_user(self, user_id: str, embedding: np.ndarray) -> bool:
+        """
+        Fold a confidently verified turn into the user's voiceprint.
+        
+        O(d) incremental centroid update - no retraining or re-encoding. Nothing
+        is written here; changed voiceprints are saved ADAPTATION_SAVE_DELAY
+        later, or by flush_adaptations()/close().
+        
+        Returns:
+            True if the voiceprint was updated
+        """
+        user_data = self.users_data.get(user_id)
+        centroid = self._get_centroid(user_id)
+        if not user_data or centroid is None:
+            return False
+        
+        try:
+            with self._adapt_lock:
+                centroid.update(embedding)
+                self.speaker_index.add(user_id, centroid.mean)
+                self._adapted.add(user_id)
+                if self._adapt_timer is None:
+                    self._adapt_timer = threading.Timer(ADAPTATION_SAVE_DELAY, self.flush_adaptations)
+                    self._adapt_timer.daemon = True
+                    self._adapt_timer.start()
+            return True
+        except Exception as e:
+            print(f"Voiceprint adaptation error: {e}")
+            return False
+    
+    def flush_adaptations(self):
+        """Write adapted voiceprints now: one centroid file per changed user, then users.json and the index once."""
+        with self._adapt_lock:
+            if self._adapt_timer is not None:
+                self._adapt_timer.cancel()
+                self._adapt_timer = None
+            if not self._adapted:
+                return
+            try:
+                for user_id in self._adapted:
+                    user_data = self.users_data.get(user_id)
+                    centroid = self._centroids.get(user_id)
+                    if not user_data or centroid is None:
+                        continue  # Removed (e.g. master re-enrolled) since it adapted
+                    centroid_filename = user_data.get("centroid_file") or f"{user_id}_centroid.npz"
+                    centroid.save(os.path.join(FEATURES_DIR, centroid_filename))
+                    user_data["centroid_file"] = centroid_filename
+                    user_data["samples"] = centroid.count
+                self._save_users()
+                self._save_index()
+                self._adapted.clear()
+            except Exception as e:
+                print(f"Error saving adapted voiceprints: {e}")
+    
+    def close(self):
+        """Write any adapted voiceprints still waiting on the save timer."""
+        self.flush_adaptations()
+    
+    def _remove_user(self, user_id: str):
+        """Forget a user: metadata, index row and stored voice files."""
+        user_data = self.users_data.pop(user_id, None)
+        self.speaker_index.remove(user_id)
+        if not user_data:
+            return
+        self._centroids.pop(user_id, None)
+        for key in ("features_file", "embedding_file", "centroid_file", "enrollment_audio"):
+            if user_data.get(key):
+                try:
+                    os.remove(os.path.join(FEATURES_DIR, user_data[key]))
+                except OSError:
+                    pass
+    
+    def identify_speaker(self, audio: AudioInput, sample_rate: Optional[int] = None) -> Tuple[Optional[dict], float]:
+        """
+        Identify which enrolled user is speaking (embedding only, all users in one pass).
+        
+        Args:
+            audio: Path to audio file, WAV bytes, or NumPy PCM buffer
+            sample_rate: Sample rate of a NumPy buffer
+            
+        Returns:
+            Tuple of (user data or None if nobody matches, best score)
+            
+        Time: O(n*d) single matrix-vector product over n enrolled speakers
+        """
+        try:
+            if len(self.speaker_index) == 0:
+                return None, 0.0
+            embedding = self._compute_embedding(self._prepare_audio(audio, sample_rate))
+            user_id, score = self.speaker_index.identify(embedding)
+            if user_id and score >= IDENTIFICATION_THRESHOLD:
+                return self.users_data.get(user_id), score
+            return None, score
+        except Exception as e:
+            print(f"Speaker identification error: {e}")
+            return None, 0.0
+    
+    def verify_voice(self, audio: AudioInput, sample_rate: Optional[int] = None) -> Tuple[bool, str, float]:
         """
         Verify voice against enrolled master user using dual verification.
         
         Args:
-            audio_file_path: Path to audio file for verification
+            audio: Path to audio file, WAV bytes, or NumPy PCM buffer (no temp file needed)
+            sample_rate: Sample rate of a NumPy buffer (see audio_data_to_array)
             
         Returns:
             Tuple of (is_recognized: bool, message: str, confidence: float)
+            
+        Raises:
+            Exception: If background model loading failed (callers degrade gracefully)
         """
+        # Only verification waits on the models; a load failure propagates instead of denying
+        self.wait_until_ready()
+        
         try:
-            if not os.path.exists(audio_file_path):
+            if isinstance(audio, str) and not os.path.exists(audio):
                 return False, "Audio file not found", 0.0
             
             if not self.users_data:
                 return False, "No enrolled users found", 0.0
             
-            # Find master user
-            master_user = None
-            for user_data in self.users_data.values():
-                if user_data.get("is_master", False):
-                    master_user = user_data
-                    break
-            
-            if not master_user:
+            # Master features and embedding stay resident between verifications
+            master = self._get_master_cache()
+            if not master:
                 return False, "No master user found", 0.0
+            master_user = master["user"]
+            
+            # Single decode + resample shared by both verification paths
+            samples = self._prepare_audio(audio, sample_rate)
             
             # Feature-based verification
             feature_score = 0.0
-            current_features = self._extract_features(audio_file_path)
-            if current_features is not None:
-                features_path = os.path.join(FEATURES_DIR, master_user["features_file"])
-                if os.path.exists(features_path):
-                    master_features = np.load(features_path)
-                    
-                    # Calculate cosine similarity
-                    dot_product = np.dot(current_features, master_features)
-                    norm_current = np.linalg.norm(current_features)
-                    norm_master = np.linalg.norm(master_features)
-                    
-                    if norm_current > 0 and norm_master > 0:
-                        feature_score = dot_product / (norm_current * norm_master)
-                    
-                    # Ensure score is between 0 and 1
-                    feature_score = max(0.0, min(1.0, feature_score))
+            current_features = self._extract_features(samples)
+            master_features = master["features"]
+            if current_features is not None and master_features is not None:
+                # Calculate cosine similarity
+                dot_product = np.dot(current_features, master_features)
+                norm_current = np.linalg.norm(current_features)
+                norm_master = master["features_norm"]
+                
+                if norm_current > 0 and norm_master > 0:
+                    feature_score = dot_product / (norm_current * norm_master)
+                
+                # Ensure score is between 0 and 1
+                feature_score = max(0.0, min(1.0, feature_score))
             
-            # SpeechBrain verification
+            # SpeechBrain verification: one embedding pass plus a dot product
             speechbrain_score = 0.0
+            current_embedding = None
             try:
-                enrollment_audio_path = os.path.join(FEATURES_DIR, master_user["enrollment_audio"])
-                if os.path.exists(enrollment_audio_path):
-                    # Load and process audio files properly for SpeechBrain
-                    import torch
-                    import torchaudio
-                    
-                    # Load audio files using torchaudio (SpeechBrain's expected format)
-                    current_waveform, current_sr = torchaudio.load(audio_file_path)
-                    master_waveform, master_sr = torchaudio.load(enrollment_audio_path)
-                    
-                    # Resample to 16kHz if needed (SpeechBrain standard)
-                    if current_sr != 16000:
-                        resampler = torchaudio.transforms.Resample(current_sr, 16000)
-                        current_waveform = resampler(current_waveform)
-                    
-                    if master_sr != 16000:
-                        resampler = torchaudio.transforms.Resample(master_sr, 16000)
-                        master_waveform = resampler(master_waveform)
-                    
-                    # Ensure single channel (mono)
-                    if current_waveform.size(0) > 1:
-                        current_waveform = current_waveform.mean(dim=0, keepdim=True)
-                    if master_waveform.size(0) > 1:
-                        master_waveform = master_waveform.mean(dim=0, keepdim=True)
-                    
-                    # Get speaker embeddings using the waveforms directly
-                    current_embedding = self.speechbrain_model.encode_batch(current_waveform)
-                    master_embedding = self.speechbrain_model.encode_batch(master_waveform)
-                    
-                    # Calculate cosine similarity between embeddings
-                    current_emb = current_embedding.squeeze()
-                    master_emb = master_embedding.squeeze()
-                    
-                    # Compute cosine similarity manually
-                    dot_product = torch.dot(current_emb, master_emb)
-                    norm_current = torch.norm(current_emb)
-                    norm_master = torch.norm(master_emb)
-                    
-                    if norm_current > 0 and norm_master > 0:
-                        speechbrain_score = float(dot_product / (norm_current * norm_master))
+                current_embedding = self._compute_embedding(samples)
+                master_embedding = self.speaker_index.get(master_user["user_id"])
+                if master_embedding is None:
+                    master_embedding = master["embedding"]
+                if master_embedding is not None:
+                    # Both embeddings are L2-normalized, so the dot product is the cosine similarity
+                    speechbrain_score = float(np.dot(current_embedding, master_embedding))
                     
                     # Ensure score is between 0 and 1
                     speechbrain_score = max(0.0, min(1.0, speechbrain_score))
@@ -296,11 +656,27 @@ class VoiceRecognition:
             print(f"   Final result: {'✅ VERIFIED' if is_verified else '❌ DENIED'}")
             
             if is_verified:
+                self.last_speaker = master_user
+                # Confident turns refine the master voiceprint in O(1)
+                if current_embedding is not None and speechbrain_score >= ADAPTATION_THRESHOLD:
+                    self.adapt_user(master_user["user_id"], current_embedding)
                 message = f"Recognized as Master User ({master_user['name']})"
                 return True, message, combined_score
-            else:
-                message = "Different User Detected"
-                return False, message, combined_score
+            
+            # Not the master - score every other enrolled speaker in one matrix-vector product
+            if current_embedding is not None and len(self.speaker_index) > 1:
+                user_id, score = self.speaker_index.identify(current_embedding, exclude=master_user["user_id"])
+                if user_id and score >= IDENTIFICATION_THRESHOLD:
+                    speaker = self.users_data[user_id]
+                    self.last_speaker = speaker
+                    if score >= ADAPTATION_THRESHOLD:
+                        self.adapt_user(user_id, current_embedding)
+                    print(f"   Identified: {speaker['name']} ({speaker['role']}) score {score:.3f}")
+                    return True, f"Recognized as {speaker['name']} ({speaker['role']})", score
+            
+            self.last_speaker = None
+            message = "Different User Detected"
+            return False, message, combined_score
                 
         except Exception as e:
             return False, f"Verification failed: {e}", 0.0
@@ -311,18 +687,16 @@ class VoiceRecognition:
         return random.choice(SECURITY_RESPONSES)
     
     def is_master_enrolled(self) -> bool:
-        """Check if a master user is enrolled."""
-        for user_data in self.users_data.values():
-            if user_data.get("is_master", False):
-                return True
-        return False
+        """Check if a master user is enrolled. O(1)."""
+        return self._master_id is not None
     
     def get_master_user(self) -> Optional[dict]:
-        """Get master user data."""
-        for user_data in self.users_data.values():
-            if user_data.get("is_master", False):
-                return user_data
-        return None
+        """Get master user data. O(1)."""
+        return self.users_data.get(self._master_id) if self._master_id else None
+    
+    def get_users(self, role: Optional[str] = None) -> list:
+        """List enrolled users, optionally filtered by role."""
+        return [user for user in self.users_data.values() if role is None or user.get("role") == role]
 
 
 # Usage Example (in comments):
@@ -334,8 +708,8 @@ from modules.voice_recognition import VoiceRecognition
 # Initialize voice recognition
 vr = VoiceRecognition()
 
-# Enroll master user (one-time setup)
-success, message = vr.enroll_user("John Doe", "path/to/enrollment_audio.wav")
+# Enroll master user (one-time setup) - several short samples give a steadier voiceprint
+success, message = vr.enroll_user("John Doe", ["path/to/sample1.wav", "path/to/sample2.wav", "path/to/sample3.wav"])
 if success:
     print(f"Enrollment: {message}")
 else:
@@ -352,6 +726,17 @@ else:
     security_msg = vr.get_security_response()
     print(f"Security response: {security_msg}")
 
+# Enroll additional people with lower permission levels (shared office)
+vr.enroll_user("Alex", "path/to/alex.wav", role="member")
+vr.enroll_user("Visitor", "path/to/visitor.wav", role="guest")
+
+# Identify who is speaking - one matrix-vector product over all enrolled voices
+speaker, score = vr.identify_speaker("path/to/test_audio.wav")
+if speaker:
+    print(f"Speaker: {speaker['name']} ({speaker['role']}, score {score:.2f})")
+
+# Benchmark identification scoring: python modules/speaker_index.py
+
 # Check if master user exists
 if vr.is_master_enrolled():
     master = vr.get_master_user()
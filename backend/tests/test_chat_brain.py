@@ -0,0 +1,92 @@
+"""
+A.R.I.S.E. AI - Chat brain streaming tests
+
+A local fake model replays a canned reply in chunks (no network), so the
+tests can check that sentences come out while the reply is still being
+generated and that initialisms and titles do not split a sentence.
+"""
+
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.join(BACKEND_DIR, "modules"), os.path.join(BACKEND_DIR, "modules", "brain")]
+
+from startup_profiler import stubbed_heavy_dependencies  # noqa: E402
+
+with stubbed_heavy_dependencies():
+    from chat_brain import ChatBrain, split_sentences  # noqa: E402
+
+REPLY = ("Sure, I'm A.R.I.S.E. and I can help with that. The forecast looks clear today. "
+         "Dr. Smith's meeting is at 3.30 pm! Anything else?")
+
+
+class _FakeChunk:
+    """Minimal stand-in for a Gemini stream chunk."""
+
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeStreamingModel:
+    """Replays a reply in fixed-size chunks and records how many it has handed out."""
+
+    def __init__(self, reply, chunk_size=12, fail_after=None):
+        self.reply = reply
+        self.chunk_size = chunk_size
+        self.fail_after = fail_after
+        self.emitted = 0
+
+    @property
+    def total_chunks(self):
+        return -(-len(self.reply) // self.chunk_size)
+
+    def _chunks(self):
+        for i in range(0, len(self.reply), self.chunk_size):
+            if self.fail_after is not None and self.emitted == self.fail_after:
+                raise ConnectionError("stream dropped")
+            self.emitted += 1
+            yield _FakeChunk(self.reply[i:i + self.chunk_size])
+
+    def generate_content(self, prompt, stream=False):
+        return self._chunks() if stream else _FakeChunk(self.reply)
+
+
+@pytest.mark.parametrize("buffer, sentences, rest", [
+    ("Hello there. How are", ["Hello there."], "How are"),
+    ("I'm A.R.I.S.E. and I help. ", ["I'm A.R.I.S.E. and I help."], ""),
+    ("Ask Dr. Smith now! Then", ["Ask Dr. Smith now!"], "Then"),
+    ("It costs 3.50 today", [], "It costs 3.50 today"),
+    ('He said "go." Then left', ['He said "go."'], "Then left"),
+])
+def test_split_sentences(buffer, sentences, rest):
+    assert split_sentences(buffer) == (sentences, rest)
+
+
+def test_stream_yields_first_sentence_before_reply_is_complete():
+    model = FakeStreamingModel(REPLY)
+    stream = ChatBrain(model=model).stream_response("What's up?")
+
+    first = next(stream)
+    assert first == "Sure, I'm A.R.I.S.E. and I can help with that."
+    assert model.emitted < model.total_chunks
+
+    assert list(stream) == ["The forecast looks clear today.", "Dr. Smith's meeting is at 3.30 pm!", "Anything else?"]
+    assert model.emitted == model.total_chunks
+
+
+def test_stream_matches_full_response():
+    brain = ChatBrain(model=FakeStreamingModel(REPLY))
+    assert " ".join(brain.stream_response("What's up?")) == brain.get_response("What's up?")
+
+
+def test_stream_error_before_any_sentence_yields_apology():
+    brain = ChatBrain(model=FakeStreamingModel(REPLY, fail_after=0))
+    assert list(brain.stream_response("hi")) == ["Sorry, I'm having trouble processing that right now."]
+
+
+def test_stream_error_after_a_sentence_stops_without_apology():
+    brain = ChatBrain(model=FakeStreamingModel(REPLY, fail_after=5))
+    assert list(brain.stream_response("hi")) == ["Sure, I'm A.R.I.S.E. and I can help with that."]
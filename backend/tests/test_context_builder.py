@@ -0,0 +1,116 @@
+"""
+A.R.I.S.E. AI - Context builder tests
+
+The budget is a hard limit: whatever the facts, summary, related snippets
+and recent messages add up to, _fit trims them until the rendered context
+fits, dropping the least useful pieces first.
+"""
+
+import os
+import random
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "modules"))
+
+from context_builder import MIN_RECENT_MESSAGES, ContextBuilder, estimate_tokens  # noqa: E402
+from memory_manager import MemoryManager  # noqa: E402
+
+BUDGETS = [0, 1, 5, 12, 40, 100, 250, 600, 2000]
+
+
+def _words(rng, count):
+    return " ".join(rng.choice(["garden", "marathon", "launch", "novel", "toronto", "rain", "plan"])
+                    for _ in range(count))
+
+
+def _pieces(rng):
+    """Random facts, summary, related and recent lists, some items far larger than any budget."""
+    def text():
+        return _words(rng, rng.choice([1, 5, 30, 800]))
+
+    facts = [f"fact_{i}: {text()}" for i in range(rng.randint(0, 8))]
+    summary = [f"User: {text()}" for _ in range(rng.randint(0, 6))]
+    related = [(rng.random(), float(i), f"AI (2024-05-0{i % 9 + 1}): {text()}") for i in range(rng.randint(0, 5))]
+    recent = [f"User: {text()}" for _ in range(rng.randint(0, 12))]
+    return facts, summary, related, recent
+
+
+def _fit(budget, facts, summary, related, recent):
+    builder = ContextBuilder(None, token_budget=budget)
+    trimmed = builder._fit(facts, summary, related, recent)
+    return trimmed, estimate_tokens(builder._render(facts, summary, related, recent))
+
+
+@pytest.mark.parametrize("budget", BUDGETS)
+def test_fit_never_exceeds_the_budget(budget):
+    rng = random.Random(budget)
+    for _ in range(100):
+        pieces = _pieces(rng)
+        before = estimate_tokens(ContextBuilder._render(*pieces))
+        trimmed, tokens = _fit(budget, *pieces)
+        assert tokens <= budget
+        assert (trimmed > 0) == (before > budget)
+
+
+@pytest.mark.parametrize("budget", BUDGETS)
+def test_single_oversized_item_is_cut_to_fit(budget):
+    for pieces in (([], [], [], ["User: " + "lisbon " * 2000]),
+                   (["name: " + "Sam " * 2000], [], [], []),
+                   (["name: Sam"], [], [], ["User: " + "x" * 9000, "AI: " + "y" * 9000])):
+        trimmed, tokens = _fit(budget, *pieces)
+        assert tokens <= budget and trimmed > 0
+        facts, _, _, recent = pieces
+        assert all(len(item) < 9000 for item in facts + recent)
+
+
+def test_cut_keeps_as_much_of_the_message_as_fits():
+    recent = ["User: " + "lisbon " * 200]
+    _, tokens = _fit(50, [], [], [], recent)
+    assert recent[0].startswith("User: lisbon") and recent[0].endswith("...")
+    assert tokens == 50
+
+
+def test_least_useful_pieces_go_first():
+    facts = ["name: Sam", "location: London"]
+    summary = ["User: I started marathon training.", "AI: Good luck with the training."]
+    related = [(0.9, 2.0, "User (2024-05-02): strong match"), (0.1, 1.0, "User (2024-05-01): weak match")]
+    recent = [f"User: message {i}" for i in range(4)]
+    full = estimate_tokens(ContextBuilder._render(facts, summary, related, recent))
+    weak = estimate_tokens(" | User (2024-05-01): weak match")
+
+    _fit(full - weak, facts, summary, related, recent)
+    assert [text for _, _, text in related] == ["User (2024-05-02): strong match"]
+    assert len(summary) == 2 and len(recent) == 4 and len(facts) == 2
+
+    _fit(estimate_tokens(ContextBuilder._render(facts, [], [], recent)), facts, summary, related, recent)
+    assert related == [] and summary == [] and len(recent) == 4 and len(facts) == 2
+
+    _fit(estimate_tokens(ContextBuilder._render(facts[:1], [], [], recent[-MIN_RECENT_MESSAGES:])),
+         facts, summary, related, recent)
+    assert recent == ["User: message 2", "User: message 3"] and facts == ["name: Sam"]
+
+
+@pytest.mark.parametrize("budget", [60, 200, 600])
+def test_build_stays_within_budget_over_a_long_session(tmp_path, capsys, budget):
+    rng = random.Random(budget)
+    memory = MemoryManager(str(tmp_path / "data"))
+    try:
+        memory.update_facts({f"preference_{i}": f"likes detailed answers about {_words(rng, 8)}" for i in range(25)})
+        builder = ContextBuilder(memory, token_budget=budget)
+        for turn in range(60):
+            user_input = f"turn {turn}: {_words(rng, rng.randint(3, 60))}. What should I do next?"
+            memory.add_message("user", user_input)
+            context = builder.build(user_input)
+            assert estimate_tokens(context) <= budget
+            assert builder.turns[-1]["tokens"] <= budget
+            memory.add_message("assistant", "That sounds great. " * rng.randint(1, 40))
+
+        stats = builder.get_stats()
+        assert stats["turns"] == 60 and stats["max_tokens"] <= budget
+        assert stats["reused"] > 0  # Chunk summaries are not recomputed every turn
+    finally:
+        memory.close()
+    assert "🧮 Context:" in capsys.readouterr().out
@@ -0,0 +1,148 @@
+"""
+A.R.I.S.E. AI - Data engine tests
+
+Request routing to a data source, plus connection reuse: a local
+keep-alive HTTP server counts the TCP connections it accepts, so the
+tests can check that the pooled session reuses them where one-off
+requests.get calls open a new one per request. The pool tests need the
+real requests package.
+"""
+
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+try:
+    import requests
+except ImportError:
+    requests = None
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.join(BACKEND_DIR, "modules"), os.path.join(BACKEND_DIR, "modules", "brain")]
+
+from startup_profiler import stubbed_heavy_dependencies  # noqa: E402
+
+with stubbed_heavy_dependencies(keep=("requests",) if requests else ()):
+    import data_engine  # noqa: E402
+
+REQUESTS = 20
+
+
+@pytest.mark.parametrize("text, source", [
+    ("is it raining in paris", "weather"),
+    ("how hot is it in delhi", "weather"),
+    ("show me my photos", None),          # "hot" inside "photos"
+    ("the train is late", None),          # "rain" inside "train"
+    ("how are apple stocks doing", "stock"),
+    ("what's the temperature and the latest news", "weather"),  # Weather outranks news
+    ("any headlines today", "news"),
+])
+def test_data_source(text, source):
+    assert data_engine._data_source(text) == source
+
+
+def test_every_gazetteer_country_has_a_spoken_name(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    engine = data_engine.DataEngine(prefetch_budget=0)
+    try:
+        first_names = {}
+        for name, code in engine.entities.names("country").items():
+            first_names.setdefault(code, name.title())
+        assert first_names["us"] == "United States"
+        for code, name in first_names.items():
+            assert engine._get_country_name(code) == name
+        assert engine._get_country_name("zz") == "ZZ"
+    finally:
+        engine.close()
+
+
+class StubServer:
+    """Keep-alive JSON server on a free local port that records every accepted connection."""
+
+    def __init__(self):
+        self.connections = []
+        connections = self.connections
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep-alive, like the real APIs
+            wbufsize = 65536  # Headers and body in one write, as real servers send them
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                connections.append(self.client_address)
+
+            def do_GET(self):
+                body = json.dumps({"articles": []}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/api/v4/top-headlines"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def server():
+    if requests is None:
+        pytest.skip("requests is not installed")
+    stub = StubServer()
+    try:
+        yield stub
+    finally:
+        stub.close()
+
+
+def _fetch(get, url, count, threads=1):
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(lambda _: get(url, timeout=5).json(), range(count)))
+    assert results == [{"articles": []}] * count
+
+
+def test_one_off_requests_open_a_connection_each(server):
+    _fetch(requests.get, server.url, REQUESTS)
+    assert len(server.connections) == REQUESTS
+
+
+def test_pooled_session_reuses_one_connection(server):
+    session = data_engine.create_session()
+    try:
+        _fetch(session.get, server.url, REQUESTS)
+    finally:
+        session.close()
+    assert len(server.connections) == 1
+
+
+def test_pooled_session_shared_across_threads(server):
+    session = data_engine.create_session()
+    try:
+        _fetch(session.get, server.url, REQUESTS * 4, threads=4)
+    finally:
+        session.close()
+    assert len(server.connections) <= data_engine.POOL_MAXSIZE
+    assert len(server.connections) < REQUESTS * 4
+
+
+def test_data_engine_fetches_through_its_pool(server, monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    engine = data_engine.DataEngine(prefetch_budget=0)
+    try:
+        _fetch(engine.session.get, server.url, REQUESTS)
+    finally:
+        engine.close()
+    assert len(server.connections) == 1
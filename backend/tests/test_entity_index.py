@@ -0,0 +1,78 @@
+"""
+A.R.I.S.E. AI - Entity index tests
+
+Word-boundary and leftmost-longest matching over the bundled gazetteer
+and over small hand-built indexes.
+"""
+
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "modules", "brain"))
+
+from entity_index import Entity, EntityIndex  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def gazetteer():
+    return EntityIndex.from_file()
+
+
+def _index(*entries):
+    index = EntityIndex()
+    for name, entity_type, value in entries:
+        index.add(name, entity_type, value)
+    return index.build()
+
+
+@pytest.mark.parametrize("text", [
+    "explain amdahl's law",
+    "is it samd or amd64",
+    "the team at xamd",
+])
+def test_names_do_not_match_inside_words(gazetteer, text):
+    assert gazetteer.first(text, "company") is None
+
+
+@pytest.mark.parametrize("text, start", [
+    ("how is amd doing", 7),
+    ("AMD's earnings", 0),
+    ("price of (amd)", 10),
+])
+def test_names_match_on_word_boundaries(gazetteer, text, start):
+    assert gazetteer.first(text, "company") == Entity("company", "amd", "AMD", start, start + 3)
+
+
+def test_overlaps_resolve_leftmost_longest(gazetteer):
+    assert [entity.value for entity in gazetteer.find("weather in new delhi and delhi")] == ["New Delhi", "Delhi"]
+
+    index = _index(("new york", "city", "NY"), ("york", "city", "YK"), ("york city", "city", "YC"),
+                   ("new york city", "city", "NYC"))
+    assert [(e.value, e.start, e.end) for e in index.find("new york city")] == [("NYC", 0, 13)]
+    assert [e.value for e in index.find("old york city")] == ["YC"]
+    assert [e.value for e in index.find("new york, york")] == ["NY", "YK"]
+
+
+def test_leftmost_match_wins_over_a_longer_later_one():
+    index = _index(("a b", "x", "AB"), ("b c d", "x", "BCD"))
+    assert [e.value for e in index.find("a b c d")] == ["AB"]
+
+
+def test_spans_point_into_the_original_text(gazetteer):
+    text = "Compare Apple and AMD in New York"
+    assert [text[e.start:e.end] for e in gazetteer.find(text)] == ["Apple", "AMD", "New York"]
+    assert gazetteer.find("News from New York")[-1] == Entity("city", "new york", "New York", 10, 18)
+
+
+def test_name_under_several_types_yields_each(gazetteer):
+    types = {entity.type: entity.value for entity in gazetteer.find("news from singapore")}
+    assert types == {"city": "Singapore", "country": "sg"}
+
+
+def test_names_lists_every_entry_of_a_type(gazetteer):
+    countries = gazetteer.names("country")
+    assert countries["united states"] == "us" and countries["india"] == "in"
+    assert all(gazetteer.first(name, "country") is not None for name in countries)
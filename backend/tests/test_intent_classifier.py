@@ -0,0 +1,63 @@
+"""
+A.R.I.S.E. AI - Intent classifier tests
+
+intent_heldout.tsv measures generalization only while none of its
+utterances leak into the training file. Routing the model together with
+the keyword router must never do worse on it than the model alone.
+"""
+
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "modules"))
+
+from intent_classifier import (  # noqa: E402
+    DESTRUCTIVE_CONFIDENCE, HELD_OUT_FILE, IntentClassifier, evaluate_held_out, load_training_data,
+)
+from intent_router import REQUEST_ROUTER  # noqa: E402
+
+
+def _normalize(text):
+    return " ".join(text.lower().split())
+
+
+def test_held_out_utterances_are_not_training_data():
+    training = {_normalize(text) for text in load_training_data()[0]}
+    leaked = [text for text in load_training_data(HELD_OUT_FILE)[0] if _normalize(text) in training]
+    assert not leaked, f"held-out utterances found in the training file: {leaked}"
+
+
+@pytest.fixture(scope="module")
+def model():
+    return IntentClassifier.from_file()
+
+
+def test_routing_is_never_worse_than_the_model_alone_on_held_out(model):
+    results = evaluate_held_out(model)
+    assert results["routed_accuracy"] >= results["model_accuracy"], results["misses"]
+    assert results["routed_accuracy"] >= results["keyword_accuracy"], results["misses"]
+
+
+@pytest.mark.parametrize("text, intent", [
+    ("what's the price of happiness", "chat"),       # "price" is a data keyword
+    ("what's the price of tesla stock", "data"),
+    ("will it be chilly in berlin tonight", "data"),  # no keyword at all
+])
+def test_route(model, text, intent):
+    assert model.route(text, REQUEST_ROUTER.classify(text))[0] == intent
+
+
+@pytest.mark.parametrize("probabilities, keyword_intent, intent", [
+    ({"chat": 0.55, "data": 0.30, "automation": 0.15}, "data", "data"),  # Unsure, keywords agree enough
+    ({"chat": 0.55, "data": 0.10, "automation": 0.35}, "data", "chat"),  # Unsure, model rules keywords out
+    ({"chat": 0.75, "data": 0.25}, "data", "chat"),                      # Confident model wins
+    ({"memory_delete": 0.80, "chat": 0.20}, "chat", "chat"),             # Destructive needs a keyword...
+    ({"memory_delete": 0.80, "chat": 0.20}, "memory_delete", "memory_delete"),
+    ({"memory_delete": DESTRUCTIVE_CONFIDENCE, "chat": 0.05}, "chat", "memory_delete"),  # ...or certainty
+])
+def test_route_rules(model, monkeypatch, probabilities, keyword_intent, intent):
+    monkeypatch.setattr(model, "predict_proba", lambda text: probabilities)
+    assert model.route("anything", keyword_intent)[0] == intent
@@ -0,0 +1,92 @@
+"""
+A.R.I.S.E. AI - Intent router tests
+
+Pins the routing fixes over the old substring scans (word boundaries,
+priority, dotted wake word) and the claim the single non-overlapping
+regex pass relies on: no higher-priority keyword is hidden inside a
+lower-priority match.
+"""
+
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "modules"))
+
+from intent_router import (  # noqa: E402
+    EXIT_ROUTER, REQUEST_INTENTS, REQUEST_ROUTER, WAKE_ROUTER, _legacy_classify,
+)
+
+PRIORITY = {intent: priority for priority, (intent, _) in enumerate(REQUEST_INTENTS)}
+
+
+@pytest.mark.parametrize("text, intent, legacy", [
+    ("restart the conversation please", "chat", "automation"),  # "start" inside "restart"
+    ("i will attempt it tomorrow", "chat", "data"),             # "temp" inside "attempt"
+    ("go to sleep", "standby", "standby"),                      # not "go to" -> automation
+    ("please go to sleep now", "standby", "standby"),
+    ("go to youtube", "automation", "automation"),
+    ("is it raining in paris", "data", "data"),                 # inflections still match
+    ("show me apple stocks", "data", "data"),
+])
+def test_request_routing(text, intent, legacy):
+    assert REQUEST_ROUTER.classify(text) == intent
+    assert _legacy_classify(text) == legacy
+
+
+def test_match_returns_keyword_and_span():
+    text = "Could you Go To   Sleep for a bit"
+    found = REQUEST_ROUTER.match(text)
+    assert found.intent == "standby"
+    assert found.keyword == "go to   sleep"
+    assert text[found.span[0]:found.span[1]].lower() == "go to   sleep"
+
+
+def test_no_keyword_falls_back_to_default():
+    assert REQUEST_ROUTER.match("tell me a joke") is None
+    assert REQUEST_ROUTER.classify("tell me a joke") == "chat"
+
+
+@pytest.mark.parametrize("text, wakes", [
+    ("Hey A.R.I.S.E., are you there?", True),
+    ("A.R.I.S.E. wake up", True),
+    ("hey arise", True),
+    ("the sun will rise at six", False),
+    ("let me paraphrase that", False),
+])
+def test_wake_word(text, wakes):
+    assert WAKE_ROUTER.matches(text) is wakes
+
+
+@pytest.mark.parametrize("text, exits", [
+    ("okay bye", True),
+    ("see you later", True),
+    ("what are you doing this weekend", False),  # "end" inside "weekend"
+    ("don't stop the music", True),
+])
+def test_exit_phrases(text, exits):
+    assert EXIT_ROUTER.matches(text) is exits
+
+
+def test_every_keyword_routes_to_its_intent_or_higher():
+    for intent, keywords in REQUEST_INTENTS:
+        for keyword in keywords:
+            assert PRIORITY[REQUEST_ROUTER.classify(keyword)] <= PRIORITY[intent], keyword
+
+
+def test_higher_priority_keyword_never_hidden_inside_a_lower_one():
+    """
+    The scan is non-overlapping, so a higher-priority keyword that started inside
+    a lower-priority match would be skipped. Build every such overlap: the first
+    words of a lower-priority keyword followed by a higher-priority keyword.
+    """
+    for low, (_, low_keywords) in enumerate(REQUEST_INTENTS):
+        for high, (high_intent, high_keywords) in enumerate(REQUEST_INTENTS[:low]):
+            for lower_keyword in low_keywords:
+                words = lower_keyword.split()
+                for cut in range(1, len(words) + 1):
+                    for higher_keyword in high_keywords:
+                        text = " ".join(words[:cut] + [higher_keyword])
+                        assert PRIORITY[REQUEST_ROUTER.classify(text)] <= high, (text, high_intent)
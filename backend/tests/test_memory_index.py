@@ -0,0 +1,81 @@
+"""
+A.R.I.S.E. AI - Memory index tests
+
+Lazy row storage (INITIAL_ROWS doubling up to max_documents), ring-buffer
+eviction and retrieval over the rows in use.
+"""
+
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "modules"))
+
+from memory_index import INITIAL_ROWS, MAX_DOCUMENTS, MemoryIndex  # noqa: E402
+
+
+def _rows(index):
+    return index._vectors.shape[0]
+
+
+def test_storage_grows_from_initial_rows_to_the_cap():
+    index = MemoryIndex()
+    assert _rows(index) == INITIAL_ROWS == 256
+
+    seen = []
+    for i in range(MAX_DOCUMENTS + 50):
+        index.add(f"message {i} about topic{i % 97}", timestamp=float(i))
+        if not seen or seen[-1] != _rows(index):
+            seen.append(_rows(index))
+
+    assert seen == [256, 512, 1024, 2048, 4096, 8192, 10000]
+    assert len(index) == MAX_DOCUMENTS
+    assert len(index._times) == len(index._buckets) == len(index._meta) == MAX_DOCUMENTS
+
+
+def test_ring_buffer_evicts_the_oldest_message():
+    index = MemoryIndex(max_documents=5)
+    assert _rows(index) == 5
+    for i in range(8):
+        index.add(f"note{i} shared", timestamp=float(i))
+
+    assert len(index) == 5
+    assert {meta["timestamp"] for meta in index._meta} == {3.0, 4.0, 5.0, 6.0, 7.0}
+    assert index.search("note0") == [] and index.search("note2") == []  # Evicted, and their terms forgotten
+    assert index._df[index._terms("note0")[0]].sum() == 0
+    assert index.search("note3", min_score=0.0)[0][1]["timestamp"] == 3.0
+    assert index._df[index._terms("shared")[0]].sum() == 5
+
+
+def test_search_covers_only_rows_in_use():
+    index = MemoryIndex()
+    index.add("my sister priya is getting married in june", timestamp=1.0, role="user")
+    index.add("the garden tomatoes are ripening", timestamp=2.0, role="user")
+
+    hits = index.search("when is priya's wedding")
+    assert [(meta["text"], meta["role"]) for _, meta in hits] == [("my sister priya is getting married in june", "user")]
+    assert index.search("priya", before=1.0) == []
+    assert len(index.search("priya tomatoes", k=10, min_score=-1.0)) == 2  # Not the 254 empty rows
+
+
+def test_clear_shrinks_storage():
+    index = MemoryIndex(max_documents=1000)
+    for i in range(600):
+        index.add(f"message {i}", timestamp=float(i))
+    assert _rows(index) == 1000
+
+    index.clear()
+    assert _rows(index) == INITIAL_ROWS and len(index) == 0
+    assert index.search("message") == []
+    index.add("fresh start", timestamp=1.0)
+    assert index.search("fresh start")[0][1]["text"] == "fresh start"
+
+
+@pytest.mark.parametrize("max_documents", [1, 300])
+def test_small_caps_grow_no_further(max_documents):
+    index = MemoryIndex(max_documents=max_documents)
+    for i in range(max_documents * 3):
+        index.add(f"word{i}", timestamp=float(i))
+    assert _rows(index) == max_documents == len(index)
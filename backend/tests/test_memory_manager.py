@@ -0,0 +1,152 @@
+"""
+A.R.I.S.E. AI - Memory manager tests
+
+Session compaction on exit and the in-memory facts cache: lookups without
+file I/O, coalesced atomic writes, mtime reloads and the flush on close().
+"""
+
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES_DIR = os.path.join(BACKEND_DIR, "modules")
+sys.path.insert(0, MODULES_DIR)
+
+from memory_manager import MemoryManager  # noqa: E402
+from session_store import SessionStore  # noqa: E402
+
+
+def test_session_saved_before_exit_is_compacted_and_indexed(tmp_path):
+    """close() waits for compaction, so a normal exit leaves nothing for journal recovery."""
+    data_dir = tmp_path / "data"
+    script = textwrap.dedent(f"""
+        import sys, time
+        sys.path.insert(0, {MODULES_DIR!r})
+        from memory_manager import MemoryManager
+
+        memory = MemoryManager({str(data_dir)!r})
+        memory._wait_for_compactions()
+        ingest = memory.store.ingest
+
+        def slow_ingest(session_data):
+            time.sleep(0.5)  # A large session or a slow disk
+            ingest(session_data)
+
+        memory.store.ingest = slow_ingest
+        memory.add_message("user", "my sister lives in lisbon")
+        memory.save_session()
+        memory.close()
+    """)
+    subprocess.run([sys.executable, "-c", script], check=True, timeout=60)
+
+    assert len(list((data_dir / "sessions").glob("session_*.json"))) == 1
+    assert not list((data_dir / "sessions" / "journal").glob("*.jsonl"))
+    store = SessionStore(data_dir / "sessions.db")
+    try:
+        assert store.count_sessions() == 1
+        assert store.search("lisbon")[0]["content"] == "my sister lives in lisbon"
+    finally:
+        store.close()
+
+
+@pytest.fixture
+def memory(tmp_path):
+    manager = MemoryManager(str(tmp_path / "data"))
+    try:
+        yield manager
+    finally:
+        manager.close()
+
+
+@pytest.fixture
+def writes(memory, monkeypatch):
+    """Every facts.json write the manager makes."""
+    written = []
+    write = memory._write_json_atomic
+
+    def counting_write(file_path, data):
+        written.append(dict(data))
+        write(file_path, data)
+
+    monkeypatch.setattr(memory, "_write_json_atomic", counting_write)
+    return written
+
+
+def _edit_facts_externally(memory, facts):
+    memory._write_json(memory.facts_file, facts)
+    stat = os.stat(memory.facts_file)
+    os.utime(memory.facts_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))  # Coarse mtime clocks
+
+
+def test_lookups_never_touch_the_file(memory, monkeypatch):
+    memory.update_facts({"name": "Sam"})
+    monkeypatch.setattr(memory, "_read_json", lambda file_path: pytest.fail("facts.json re-read"))
+    for _ in range(1000):
+        assert memory.get_fact("name") == "Sam"
+    assert memory.load_facts() == {"name": "Sam"}
+
+
+def test_load_facts_returns_a_copy(memory):
+    memory.update_facts({"name": "Sam"})
+    memory.load_facts()["name"] = "Alex"
+    assert memory.get_fact("name") == "Sam"
+
+
+def test_burst_of_updates_becomes_one_atomic_write(memory, writes):
+    for i in range(50):
+        memory.update_facts({"counter": i, f"fact_{i % 3}": i})
+    assert writes == []
+
+    memory.flush_facts()
+    assert writes == [{"counter": 49, "fact_0": 48, "fact_1": 49, "fact_2": 47}]
+    assert memory._read_json(memory.facts_file) == writes[0]
+    assert not list(memory.data_dir.glob("*.tmp"))
+
+    memory.flush_facts()
+    assert len(writes) == 1  # Nothing pending, nothing written
+
+
+def test_debounce_timer_writes_once(memory, writes, monkeypatch):
+    import memory_manager
+
+    monkeypatch.setattr(memory_manager, "FACTS_WRITE_DELAY", 0.05)
+    memory.update_facts({"location": "Paris"})
+    memory.update_facts({"name": "Sam"})
+    timer = memory._facts_timer
+    timer.join(5)
+    assert writes == [{"location": "Paris", "name": "Sam"}]
+    assert memory._facts_timer is None
+
+
+def test_close_flushes_pending_facts(tmp_path):
+    manager = MemoryManager(str(tmp_path / "data"))
+    manager.update_facts({"location": "Paris"})
+    manager.close()
+    assert manager._facts_timer is None
+    assert MemoryManager(str(tmp_path / "data")).load_facts() == {"location": "Paris"}
+
+
+def test_external_edit_is_picked_up_by_mtime(memory):
+    memory.update_facts({"name": "Sam"})
+    memory.flush_facts()
+
+    _edit_facts_externally(memory, {"name": "Sam", "location": "Paris"})
+    memory._facts_checked = float("inf")  # Checked just now: within FACTS_CHECK_INTERVAL
+    assert memory.get_fact("location") is None
+
+    memory._facts_checked = float("-inf")
+    assert memory.get_fact("location") == "Paris"
+
+
+def test_external_edit_keeps_unwritten_updates(memory, writes):
+    _edit_facts_externally(memory, {"location": "Paris"})
+    memory.update_facts({"name": "Sam"})
+    memory._facts_checked = float("-inf")
+
+    assert memory.load_facts() == {"location": "Paris", "name": "Sam"}
+    memory.flush_facts()
+    assert writes == [{"location": "Paris", "name": "Sam"}]
@@ -0,0 +1,98 @@
+"""
+A.R.I.S.E. AI - Session store tests
+
+Spoken period parsing, stopword stripping, FTS5 recall after ingest and
+the trigger-maintained counts.
+"""
+
+import json
+import os
+import sys
+import time
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "modules"))
+
+from session_store import SessionStore, parse_period  # noqa: E402
+
+DAY = 86400
+NOW = time.mktime((2024, 5, 15, 12, 0, 0, 0, 0, -1))       # Local noon
+MIDNIGHT = time.mktime((2024, 5, 15, 0, 0, 0, 0, 0, -1))   # Start of that local day
+
+
+@pytest.fixture
+def store():
+    session_store = SessionStore(":memory:")
+    try:
+        yield session_store
+    finally:
+        session_store.close()
+
+
+def _session(session_id, *messages):
+    """Session in the session_<epoch>.json format from (role, content, days_ago) tuples."""
+    return {
+        "session_id": session_id,
+        "created_at": NOW,
+        "messages": [{"role": role, "content": content, "timestamp": NOW - days_ago * DAY}
+                     for role, content, days_ago in messages],
+    }
+
+
+@pytest.mark.parametrize("text, since, until, remaining", [
+    ("what did I say about lisbon last week", MIDNIGHT - 14 * DAY, MIDNIGHT - 7 * DAY, "what did I say about lisbon"),
+    ("Yesterday what did i say", MIDNIGHT - DAY, MIDNIGHT, "what did i say"),
+    ("anything about work today", MIDNIGHT, None, "anything about work"),
+    ("what did I tell you this month about work", MIDNIGHT - 30 * DAY, None, "what did I tell you about work"),
+])
+def test_parse_period(text, since, until, remaining):
+    assert parse_period(text, now=NOW) == (since, until, remaining)
+
+
+def test_parse_period_without_a_period():
+    assert parse_period("what did I say about lisbon", now=NOW) == (None, None, "what did I say about lisbon")
+    assert parse_period("my yesterdays", now=NOW)[0] is None  # Whole words only
+
+
+def test_search_ignores_stopwords_and_stems(store):
+    store.ingest(_session("session_1", ("user", "I went running along the river", 0)))
+
+    assert store.search("what did I say about") == []  # Nothing but stopwords
+    hits = store.search("what did I tell you about the river")
+    assert [hit["content"] for hit in hits] == ["I went running along the river"]
+    assert "[river]" in hits[0]["snippet"]
+    assert store.search("runs") and not store.search("river swimming")  # Every word must match
+
+
+def test_recall_after_ingest(store):
+    store.ingest(_session("session_1",
+                          ("user", "I booked flights to Lisbon", 10),
+                          ("assistant", "Lisbon is lovely in spring", 10)))
+    store.ingest(_session("session_2", ("user", "Lisbon was great", 0)))
+
+    hits = store.recall("what did I say about Lisbon last week", now=NOW)
+    assert [(hit["session_id"], hit["content"]) for hit in hits] == [("session_1", "I booked flights to Lisbon")]
+
+    assert {hit["content"] for hit in store.recall("what did I say about lisbon", now=NOW)} == {
+        "I booked flights to Lisbon", "Lisbon was great"}
+    assert store.recall("what did I say about lisbon yesterday", now=NOW) == []
+
+
+def test_counts_are_maintained(store, tmp_path):
+    assert store.count_sessions() == 0
+    assert store.ingest(_session("session_1", ("user", "hello", 0), ("assistant", "hi", 0)))
+    assert not store.ingest(_session("session_1", ("user", "hello", 0)))  # Already indexed
+
+    for session in (_session("session_1"), _session("session_2", ("user", "second", 1))):
+        with open(tmp_path / f"{session['session_id']}.json", "w") as f:
+            json.dump(session, f)
+    assert store.sync(tmp_path) == 1
+
+    assert store.count_sessions() == 2
+    assert store.get_stats() == {"sessions": 2, "messages": 3, "user_messages": 2}
+
+    store.delete_all()
+    assert store.get_stats() == {"sessions": 0, "messages": 0, "user_messages": 0}
+    assert store.search("hello") == []
@@ -0,0 +1,184 @@
+"""
+A.R.I.S.E. AI - Speaker index tests
+
+Covers the embedding matrix (add/replace/remove, persistence, identify),
+RunningCentroid updates, role lookup through VoiceRecognition with the
+speaker embedding model stubbed, and the 500-speaker scoring budget.
+"""
+
+import json
+import os
+import sys
+
+import numpy as np
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "modules"))
+
+from speaker_index import RunningCentroid, SpeakerIndex, benchmark  # noqa: E402
+from startup_profiler import stubbed_heavy_dependencies  # noqa: E402
+
+SCORING_BUDGET_MS = 1.0  # Per identify() over 500 enrolled speakers
+
+
+def _voices(count, dim=192, seed=0):
+    rng = np.random.default_rng(seed)
+    return {f"user_{i}": rng.standard_normal(dim).astype(np.float32) for i in range(count)}
+
+
+def test_identify_finds_each_enrolled_speaker():
+    voices = _voices(50)
+    index = SpeakerIndex()
+    for user_id, embedding in voices.items():
+        index.add(user_id, embedding)
+
+    assert len(index) == 50
+    assert np.allclose(np.linalg.norm(index.matrix, axis=1), 1.0)
+    for user_id, embedding in voices.items():
+        best, score = index.identify(embedding * 3.0)  # Scale must not matter
+        assert best == user_id
+        assert score == pytest.approx(1.0, abs=1e-5)
+
+
+def test_add_replaces_and_remove_compacts():
+    voices = _voices(3)
+    index = SpeakerIndex()
+    for user_id, embedding in voices.items():
+        index.add(user_id, embedding)
+
+    index.add("user_1", voices["user_0"])
+    assert len(index) == 3
+    assert np.allclose(index.get("user_1"), index.get("user_0"))
+
+    index.remove("user_0")
+    index.remove("missing")
+    assert index.user_ids == ["user_1", "user_2"]
+    assert "user_0" not in index and index.get("user_0") is None
+    assert index.matrix.shape == (2, 192) and index.matrix.flags["C_CONTIGUOUS"]
+    assert index.identify(voices["user_2"])[0] == "user_2"
+
+
+def test_identify_exclude_and_empty_index():
+    assert SpeakerIndex().identify(np.ones(192)) == (None, 0.0)
+
+    voices = _voices(2)
+    index = SpeakerIndex()
+    for user_id, embedding in voices.items():
+        index.add(user_id, embedding)
+    assert index.identify(voices["user_0"], exclude="user_0")[0] == "user_1"
+
+    index.remove("user_1")
+    assert index.identify(voices["user_0"], exclude="user_0") == (None, 0.0)
+
+
+def test_save_load_round_trip(tmp_path):
+    voices = _voices(20)
+    index = SpeakerIndex()
+    for user_id, embedding in voices.items():
+        index.add(user_id, embedding)
+
+    path = str(tmp_path / "speaker_index.npz")
+    index.save(path)
+    loaded = SpeakerIndex.load(path)
+
+    assert loaded.user_ids == index.user_ids
+    assert loaded.dim == 192
+    assert np.array_equal(loaded.matrix, index.matrix)
+    assert loaded.identify(voices["user_7"])[0] == "user_7"
+    assert os.listdir(tmp_path) == ["speaker_index.npz"]  # No temp file left behind
+
+
+def test_running_centroid_matches_batch_statistics(tmp_path):
+    samples = np.random.default_rng(1).standard_normal((10, 16))
+    normalized = samples / np.linalg.norm(samples, axis=1, keepdims=True)
+    centroid = RunningCentroid(dim=16)
+    for sample in samples:
+        centroid.update(sample)
+
+    assert centroid.count == 10
+    assert np.allclose(centroid.mean, normalized.mean(axis=0), atol=1e-6)
+    assert np.allclose(centroid.variance, normalized.var(axis=0, ddof=1), atol=1e-6)
+
+    path = str(tmp_path / "centroid.npz")
+    centroid.save(path)
+    loaded = RunningCentroid.load(path)
+    assert loaded.count == 10
+    assert np.array_equal(loaded.mean, centroid.mean) and np.array_equal(loaded.m2, centroid.m2)
+
+
+def test_running_centroid_window_tracks_drift():
+    old, new = np.eye(8)[0], np.eye(8)[1]
+    centroid = RunningCentroid(dim=8, window=5)
+    for _ in range(100):
+        centroid.update(old)
+    for _ in range(20):
+        centroid.update(new)
+
+    assert centroid.count == 5
+    assert centroid.mean[1] > centroid.mean[0]  # An unbounded mean would still sit at 100:20
+
+
+@pytest.fixture
+def voice_recognition(monkeypatch, tmp_path):
+    """VoiceRecognition in a scratch data dir, with users and an index written up front."""
+    monkeypatch.chdir(tmp_path)
+    with stubbed_heavy_dependencies():
+        import voice_recognition as vr_module
+
+        os.makedirs(vr_module.FEATURES_DIR)
+        voices = _voices(3)
+        users = {
+            "user_0": {"name": "Sam", "role": "master", "is_master": True},
+            "user_1": {"name": "Alex", "role": "member", "is_master": False},
+            "user_2": {"name": "Legacy", "is_master": False},  # Enrolled before roles existed
+        }
+        index = SpeakerIndex()
+        for user_id, embedding in voices.items():
+            index.add(user_id, embedding)
+        index.save(vr_module.INDEX_FILE)
+        with open(vr_module.USERS_FILE, "w") as f:
+            json.dump(users, f)
+
+        vr = vr_module.VoiceRecognition()
+        monkeypatch.setattr(vr, "_prepare_audio", lambda audio, sample_rate=None: audio)
+        monkeypatch.setattr(vr, "_compute_embedding", lambda samples: samples)
+        try:
+            yield vr, voices, vr_module
+        finally:
+            vr.close()
+
+
+def test_identify_speaker_returns_role(voice_recognition):
+    vr, voices, _ = voice_recognition
+    assert vr.is_master_enrolled() and vr.get_master_user()["name"] == "Sam"
+
+    expected = {"user_0": "master", "user_1": "member", "user_2": "member"}
+    for user_id, role in expected.items():
+        speaker, score = vr.identify_speaker(voices[user_id])
+        assert speaker["role"] == role and score > 0.99
+
+    stranger = np.random.default_rng(99).standard_normal(192)
+    assert vr.identify_speaker(stranger)[0] is None
+    assert [user["name"] for user in vr.get_users("member")] == ["Alex", "Legacy"]
+
+
+def test_adapted_voiceprint_is_written_once_on_close(voice_recognition):
+    vr, voices, vr_module = voice_recognition
+    for seed in range(5):
+        noisy = voices["user_1"] + 0.1 * np.random.default_rng(seed).standard_normal(192)
+        assert vr.adapt_user("user_1", noisy)
+
+    assert not os.path.exists(os.path.join(vr_module.FEATURES_DIR, "user_1_centroid.npz"))
+    vr.close()
+
+    centroid = RunningCentroid.load(os.path.join(vr_module.FEATURES_DIR, "user_1_centroid.npz"))
+    assert centroid.count == 6  # Enrollment embedding plus five adapted turns
+    reloaded = SpeakerIndex.load(vr_module.INDEX_FILE)
+    assert np.allclose(reloaded.get("user_1"), vr.speaker_index.get("user_1"))
+    assert vr._adapt_timer is None
+
+
+def test_scoring_500_speakers_within_budget():
+    mean_ms = benchmark(speakers=500, rounds=500)
+    assert mean_ms < SCORING_BUDGET_MS
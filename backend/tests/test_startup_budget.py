@@ -0,0 +1,69 @@
+"""
+A.R.I.S.E. AI - Startup budget regression test
+
+Builds ARISEMain with the heavy third-party dependencies stubbed (no
+microphone, network or model weights) and fails when startup to
+engines_ready exceeds the budget. Everything left is our own code.
+"""
+
+import builtins
+import os
+import sys
+import threading
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [BACKEND_DIR, os.path.join(BACKEND_DIR, "modules")]
+
+# Imported directly: the modules package __init__ needs winreg, which is only stubbed inside the fixture
+from startup_profiler import DEFAULT_BUDGET_SECONDS, close_engines, self_check, stubbed_heavy_dependencies  # noqa: E402
+
+BUDGET_SECONDS = float(os.environ.get("ARISE_STARTUP_BUDGET", DEFAULT_BUDGET_SECONDS))
+
+
+@pytest.fixture
+def arise(monkeypatch, tmp_path):
+    """ARISEMain built in a scratch directory; stubs and freshly imported modules are removed afterwards."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("GEMINI_API_KEY", "test")
+    original_import = builtins.__import__
+
+    with stubbed_heavy_dependencies():
+        import main as arise_main
+
+        try:
+            instance = arise_main.ARISEMain()
+            try:
+                yield instance
+            finally:
+                close_engines(instance)
+        finally:
+            builtins.__import__ = original_import
+
+
+def test_startup_within_budget(arise):
+    profiler = arise.profiler
+    assert "engines_ready" in profiler.milestones
+    assert profiler.check_budget(BUDGET_SECONDS), (
+        f"startup took {profiler.startup_seconds():.3f}s, budget {BUDGET_SECONDS:.3f}s: {profiler.report()}")
+
+
+def test_budget_uses_wall_clock_not_summed_engine_times(arise):
+    profiler = arise.profiler
+    assert profiler.startup_seconds() == profiler.milestones["engines_ready"]
+
+
+def test_import_hook_restored_after_startup(arise):
+    assert builtins.__import__ != arise.profiler._timed_import
+    assert arise.profiler._original_import is None
+
+
+def test_self_check_stops_background_threads_and_restores_import(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    original_import = builtins.__import__
+
+    assert self_check(budget_seconds=60.0)
+
+    assert builtins.__import__ is original_import
+    assert not [thread.name for thread in threading.enumerate() if thread.name == "arise-prefetch"]